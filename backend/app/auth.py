@@ -1,39 +1,112 @@
 from fastapi import APIRouter, Request, Depends, HTTPException, status
 from fastapi.responses import RedirectResponse
-from authlib.integrations.starlette_client import OAuth, OAuthError
 from starlette.config import Config
 from starlette.middleware.sessions import SessionMiddleware
 from motor.motor_asyncio import AsyncIOMotorDatabase
+from typing import Dict, Optional
 import os
+import time
 import logging
 
 from backend.utilities.models import UserCreate, UserResponse
 from backend.db.repository import UserRepository
 from backend.db.database import get_database
+from backend.db.loaders import request_user_loader
+from backend.utilities.oidc_cache import GOOGLE_METADATA_URL, ProviderMetadataCache
 
 # Set up logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Configuration
-config = Config('.env')
-oauth = OAuth(config)
-
-# Google OAuth setup
-oauth.register(
-    name='google',
-    server_metadata_url='https://accounts.google.com/.well-known/openid-configuration',
-    client_kwargs={
-        'scope': 'openid email profile',
-        'prompt': 'select_account',  # Always show account selector
-    },
-)
+# Discovery document and signing keys, kept warm by a background task
+google_metadata = ProviderMetadataCache(GOOGLE_METADATA_URL)
+
+class _LazyOAuth:
+    """
+    The OAuth registry, built on first use
+
+    authlib's starlette client pulls in httpx and friends, which is most of
+    the app's import time; only the login routes need it. The settings come
+    from the environment, which backend.db.database fills from .env.
+    """
+    _oauth = None
+
+    def __getattr__(self, name):
+        if self._oauth is None:
+            from authlib.integrations.starlette_client import OAuth
+
+            oauth = OAuth(Config())
+            # Google OAuth setup
+            oauth.register(
+                name='google',
+                server_metadata_url=GOOGLE_METADATA_URL,
+                client_kwargs={
+                    'scope': 'openid email profile',
+                    'prompt': 'select_account',  # Always show account selector
+                },
+            )
+            # authlib only fetches the metadata itself if the cache is still empty
+            google_metadata.attach(oauth.google)
+            self._oauth = oauth
+        return getattr(self._oauth, name)
+
+oauth = _LazyOAuth()
 
 router = APIRouter(
     prefix="/auth",
     tags=["authentication"],
 )
 
+# The session cookie is signed by SessionMiddleware, so the user claims stored
+# in it can be trusted without a database lookup. Claims are refreshed from
+# the database when they are older than SESSION_CLAIMS_MAX_AGE seconds, when
+# their format version changes, or when the user was revoked after they were
+# issued. The revocation table is per process; other workers pick up a change
+# once the claims reach their max age.
+SESSION_CLAIMS_VERSION = 1
+SESSION_CLAIMS_MAX_AGE = int(os.getenv("SESSION_CLAIMS_MAX_AGE", "300"))
+_revoked_before: Dict[str, float] = {}
+
+# Comma-separated emails allowed on the /admin routes
+ADMIN_EMAILS = {email.strip().lower() for email in os.getenv("ADMIN_EMAILS", "").split(",") if email.strip()}
+
+def session_claims(user) -> dict:
+    """
+    Build the session payload for a user, stamped with issue time and format version
+    """
+    return {
+        'id': user.id,
+        'email': user.email,
+        'name': user.name,
+        'phone': user.phone,
+        'iat': time.time(),
+        'v': SESSION_CLAIMS_VERSION,
+    }
+
+def revoke_session_claims(user_id: str):
+    """
+    Force sessions of this user to be refreshed from the database, e.g. after a profile change
+    """
+    now = time.time()
+    # Entries older than the max age no longer matter, claims that old are refreshed anyway
+    for stale_id in [uid for uid, revoked_at in _revoked_before.items() if now - revoked_at > SESSION_CLAIMS_MAX_AGE]:
+        del _revoked_before[stale_id]
+    _revoked_before[user_id] = now
+
+def _user_from_claims(claims: dict) -> Optional[UserResponse]:
+    if claims.get('v') != SESSION_CLAIMS_VERSION:
+        return None
+    issued_at = claims.get('iat', 0)
+    if time.time() - issued_at > SESSION_CLAIMS_MAX_AGE:
+        return None
+    if issued_at < _revoked_before.get(claims['id'], 0):
+        return None
+    return UserResponse(
+        id=claims['id'],
+        email=claims['email'],
+        name=claims.get('name'),
+        phone=claims.get('phone'),
+    )
+
 @router.get("/login")
 async def login(request: Request):
     """
@@ -84,6 +157,8 @@ async def auth_callback(
     Returns:
         Redirect to frontend home page
     """
+    from authlib.integrations.starlette_client import OAuthError
+
     try:
         token = await oauth.google.authorize_access_token(request)
         user_info = token.get('userinfo')
@@ -99,24 +174,15 @@ async def auth_callback(
             logger.warning(f"Rejected non-NYU email: {email}")
             return RedirectResponse(url="http://localhost:3000/?error=invalid_email")
             
-        # Get or create user
+        # Get or create user, in one upsert
         user_repo = UserRepository(db)
-        user = await user_repo.get_user_by_email(email)
+        user = await user_repo.get_or_create_user(UserCreate(
+            email=email,
+            name=user_info.get('name', '')
+        ))
         
-        if not user:
-            # Create new user
-            new_user = UserCreate(
-                email=email,
-                name=user_info.get('name', '')
-            )
-            user = await user_repo.create_user(new_user)
-        
-        # Store user in session
-        request.session['user'] = {
-            'id': user.id,
-            'email': user.email,
-            'name': user.name
-        }
+        # Store user claims in session
+        request.session['user'] = session_claims(user)
         
         # Redirect to frontend auth callback page so phone check can occur
         frontend_url = "http://localhost:3000/auth/callback"
@@ -175,13 +241,38 @@ async def get_current_user(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Not authenticated"
         )
+
+    # Fresh signed claims are enough, no database round trip
+    claims_user = _user_from_claims(user)
+    if claims_user:
+        return claims_user
     
-    user_repo = UserRepository(db)
-    db_user = await user_repo.get_user_by_id(user['id'])
+    # Share the request's loader so later lookups of this user are free
+    users = request_user_loader(request, UserRepository(db))
+    db_user = await users.load(user['id'])
     if not db_user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="User not found"
         )
+
+    # Re-sign stale claims. Sessions from before claims existed keep this
+    # path until the next login.
+    if 'v' in user:
+        request.session['user'] = session_claims(db_user)
     
-    return db_user
\ No newline at end of file
+    return db_user
+
+async def get_admin_user(current_user = Depends(get_current_user)):
+    """
+    Current user, if their email is listed in ADMIN_EMAILS
+
+    Raises:
+        HTTPException: 403 for everyone else
+    """
+    if current_user.email.lower() not in ADMIN_EMAILS:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin access required"
+        )
+    return current_user
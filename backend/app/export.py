@@ -0,0 +1,59 @@
+# backend/app/export.py
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from typing import Optional
+
+from backend.db.database import get_database
+from backend.db.export import EXPORT_FORMATS, export_filter, export_listings
+from backend.app.auth import get_admin_user
+
+router = APIRouter(
+    prefix="/admin/export",
+    tags=["admin"],
+)
+
+@router.get("/listings")
+async def export_listing_catalog(
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$", description="ndjson or csv"),
+    seller_id: Optional[str] = Query(None, description="Only this seller's listings"),
+    status: Optional[str] = Query(None, description="Filter by status"),
+    category: Optional[str] = Query(None, description="Filter by category"),
+    after: Optional[str] = Query(None, description="Resume after this listing id, the last one received"),
+    db: AsyncIOMotorDatabase = Depends(get_database),
+    admin = Depends(get_admin_user)
+):
+    """
+    Stream the listing catalog (admins only)
+
+    Listings come in id order and are read in batches while the response is
+    sent, so memory does not grow with the catalog. An interrupted download
+    resumes with ``after`` set to the last id received; the CSV header is
+    only sent on the first request.
+
+    Args:
+        format: Output format
+        seller_id: Seller filter
+        status: Status filter
+        category: Category filter
+        after: Id checkpoint
+        db: Database connection
+        admin: Admin user
+
+    Returns:
+        The listings as a streamed NDJSON or CSV attachment
+    """
+    try:
+        query = export_filter(seller_id, status, category, after)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    async def body():
+        async for chunk, _ in export_listings(db, format, query, header=after is None):
+            yield chunk
+
+    return StreamingResponse(
+        body(),
+        media_type=EXPORT_FORMATS[format],
+        headers={"Content-Disposition": f'attachment; filename="listings.{format}"'}
+    )
@@ -0,0 +1,67 @@
+# backend/app/health.py
+from fastapi import APIRouter, Depends, Request
+from fastapi.responses import JSONResponse
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo.errors import PyMongoError
+import asyncio
+import os
+
+from backend.db.cache import user_cache
+from backend.db.database import MONGO_MAX_POOL_SIZE, get_database, ping, pool_monitor
+from backend.utilities.response_cache import response_store
+
+HEALTH_PING_TIMEOUT = float(os.getenv("HEALTH_PING_TIMEOUT", "2"))
+
+router = APIRouter(
+    prefix="/health",
+    tags=["health"],
+)
+
+@router.get("/live")
+async def liveness():
+    """
+    The process is up and serving requests
+    """
+    return {"status": "ok"}
+
+@router.get("/ready")
+async def readiness(db: AsyncIOMotorDatabase = Depends(get_database)):
+    """
+    Readiness for traffic: database ping latency and connection pool usage
+
+    ``waiting`` above zero or a high ``avg_wait_ms`` means requests queue
+    for connections (pool-starved). A slow ping with short waits means
+    Mongo itself is slow.
+
+    Returns:
+        200 with the measurements, or 503 if the database does not answer
+    """
+    pools = pool_monitor.snapshot()
+    try:
+        latency = await asyncio.wait_for(ping(db), HEALTH_PING_TIMEOUT)
+    except (PyMongoError, asyncio.TimeoutError) as e:
+        return JSONResponse(
+            status_code=503,
+            content={"status": "unavailable", "error": str(e) or type(e).__name__, "pools": pools}
+        )
+    return {
+        "status": "ready",
+        "ping_ms": round(latency, 3),
+        "max_pool_size": MONGO_MAX_POOL_SIZE,
+        "pool_starved": any(pool["waiting"] > 0 for pool in pools.values()),
+        "pools": pools,
+    }
+
+@router.get("/stats")
+async def stats(request: Request):
+    """
+    Counters for this worker's background tasks and in-process caches
+
+    Each worker runs its own tasks and keeps its own caches, so the numbers
+    are per process; a task run by another worker (leader lock) shows up
+    here as ``skipped``.
+    """
+    return {
+        "tasks": {task.name: task.stats() for task in getattr(request.app.state, "background_tasks", [])},
+        "caches": {"users": user_cache.stats(), "responses": response_store.stats()},
+    }
@@ -1,10 +1,14 @@
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, HTTPException, Response
 from typing import List, Optional
 from motor.motor_asyncio import AsyncIOMotorDatabase
 
-from backend.utilities.models import ItemResponse, ItemCategory
-from backend.db.repository import ItemRepository
+from backend.utilities.models import ItemResponse, ItemCategory, MarketplaceStatsResponse
+from backend.db.repository import ItemRepository, item_projection
+from backend.db.stats import MarketplaceStats
+from backend.db.featured import FEATURED_PER_CATEGORY, featured
 from backend.db.database import get_database
+from backend.utilities.pagination import NEXT_CURSOR_HEADER
+from backend.utilities.serialization import ItemJSONResponse, item_encoder, parse_fields
 
 
 router = APIRouter(
@@ -19,6 +23,9 @@ def get_item_repository(db = Depends(get_database)) -> ItemRepository:
 async def get_recent_listings(
     limit: int = 10,
     category: Optional[ItemCategory] = None,
+    cursor: Optional[str] = Query(None, description="Continuation token from the X-Next-Cursor header"),
+    fields: Optional[str] = Query(None, description="Comma-separated listing fields to return; id is always included"),
+    images_limit: Optional[int] = Query(None, ge=0, description="Return at most this many images per listing"),
     db: AsyncIOMotorDatabase = Depends(get_database),
     repo: ItemRepository = Depends(get_item_repository)
 ):
@@ -31,44 +38,60 @@ async def get_recent_listings(
     Args:
         limit: Maximum number of items
         category: Filter by category
+        cursor: Continuation token for the next page
+        fields: Sparse fieldset, e.g. "title,price,images,status"
+        images_limit: Maximum number of images per listing
         db: Database connection
         
     Returns:
-        List of recent items
+        List of recent items, with the next page's cursor in the
+        X-Next-Cursor header when there is one
     """
-    # Implementation placeholder
-    return await repo.get_recent(limit, category)
+    try:
+        selected = parse_fields(ItemResponse, fields)
+        docs, next_cursor = await repo.find_recent_page(
+            limit, category, cursor, projection=item_projection(selected, images_limit)
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    headers = {NEXT_CURSOR_HEADER: next_cursor} if next_cursor else None
+    return ItemJSONResponse(docs, headers=headers, encoder=item_encoder.select(selected))
 
 @router.get("/featured", response_model=List[ItemResponse])
 async def get_featured_listings(
-    limit: int = 5,
-    db: AsyncIOMotorDatabase = Depends(get_database)
+    limit: int = Query(5, ge=1, le=FEATURED_PER_CATEGORY),
+    category: Optional[ItemCategory] = None
 ):
     """
     Get featured listings for home page
     
+    Served from the in-memory ranking refreshed in the background, no
+    database query is made.
+    
     Args:
         limit: Maximum number of items
-        db: Database connection
+        category: Only feature listings of this category
         
     Returns:
-        List of featured items
+        List of featured items, best first
     """
-    # Implementation placeholder
-    pass
+    return featured.current.get(category.value if category else None, limit)
 
-@router.get("/stats")
+@router.get("/stats", response_model=MarketplaceStatsResponse)
 async def get_marketplace_stats(
     db: AsyncIOMotorDatabase = Depends(get_database)
 ):
     """
     Get marketplace statistics
     
+    Counters are maintained on every write and reconciled periodically,
+    so this reads a single document.
+    
     Args:
         db: Database connection
         
     Returns:
-        Statistics about the marketplace
+        Listing counts by status and category, active sellers and
+        reservation counts by status
     """
-    # Implementation placeholder
-    pass
\ No newline at end of file
+    return await MarketplaceStats(db).get()
\ No newline at end of file
@@ -1,14 +1,26 @@
 # backend/app/listing.py
+import asyncio
+import json
+import os
+
 from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form, Query, Request
 from typing import List, Optional
 from motor.motor_asyncio import AsyncIOMotorDatabase
 
 from ..utilities.models import ItemCreate, ItemResponse, ItemUpdate, ListingStatus
-from ..utilities.models import ReservationCreate, ReservationConfirmation, ReservationInfo
+from ..utilities.models import BulkResponse, BulkRowResult, ListingBulkUpdate
+from ..utilities.models import ReservationCreate, ReservationConfirmation, ReservationInfo, ReservationOutcome
 from fastapi import HTTPException
 from ..db.repository import ItemRepository, UserRepository
 from ..db.database import get_database
+from ..db.loaders import UserLoader, get_user_loader
+from ..utilities.serialization import ItemJSONResponse
 from .auth import get_current_user
+from pydantic import ValidationError
+
+# Bulk requests: rows per request, and rows validated and written per round trip
+BULK_MAX_ROWS = int(os.getenv("BULK_MAX_ROWS", "5000"))
+BULK_CHUNK_SIZE = int(os.getenv("BULK_CHUNK_SIZE", "500"))
 
 router = APIRouter(
     prefix="/listings",
@@ -24,7 +36,7 @@ def get_user_repository(db = Depends(get_database)) -> UserRepository:
 
 @router.post("/", response_model=ItemResponse, status_code=status.HTTP_201_CREATED)
 async def create_listing(
-    request: Request,
+    item: ItemCreate,
     repo: ItemRepository = Depends(get_item_repository),
     current_user = Depends(get_current_user)
 ):
@@ -47,26 +59,128 @@ async def create_listing(
     Returns:
         Created item with ID and timestamps
     """
+    return await repo.create_item(item, seller_id=current_user.id)
+
+@router.post("/bulk", response_model=BulkResponse)
+async def create_listings_bulk(
+    request: Request,
+    repo: ItemRepository = Depends(get_item_repository),
+    current_user = Depends(get_current_user)
+):
+    """
+    Create many listings in one request
+
+    The body is a JSON array of listings, or NDJSON (one listing per line)
+    with Content-Type application/x-ndjson. Rows are validated in chunks of
+    BULK_CHUNK_SIZE off the event loop and each chunk is written with one
+    unordered insert; an invalid or failed row does not stop the others.
+
+    Args:
+        request: HTTP request carrying the rows
+        repo: Item repository
+        current_user: The seller of every listing
+
+    Returns:
+        Counts and a result per row, by position: the new id or the error
+    """
+    loop = asyncio.get_running_loop()
+    body = await request.body()
+    ndjson = request.headers.get("content-type", "").startswith("application/x-ndjson")
     try:
-        # Log raw request data
-        body = await request.body()
-        print(f"Raw request body: {body}")
-        
-        # Parse JSON data from request
-        json_data = await request.json()
-        print(f"JSON data: {json_data}")
-        
-        # Create ItemCreate model from JSON data
-        item = ItemCreate(**json_data)
-        print(f"Pydantic model: {item}")
-        
-        result = await repo.create_item(item, seller_id=current_user.id)
-        return result
-    except Exception as e:
-        print(f"Error creating listing: {str(e)}")
-        import traceback
-        traceback.print_exc()
-        raise
+        rows = await loop.run_in_executor(None, _parse_rows, body, ndjson)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if len(rows) > BULK_MAX_ROWS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"At most {BULK_MAX_ROWS} listings per request"
+        )
+
+    results = []
+    for offset in range(0, len(rows), BULK_CHUNK_SIZE):
+        chunk = rows[offset:offset + BULK_CHUNK_SIZE]
+        validated = await loop.run_in_executor(None, _validate_rows, chunk)
+        valid = [(offset + i, item) for i, item in enumerate(validated) if isinstance(item, ItemCreate)]
+        created = iter(await repo.create_items([item for _, item in valid], seller_id=current_user.id))
+        for i, item in enumerate(validated):
+            if isinstance(item, ItemCreate):
+                listing_id, error = next(created)
+                results.append(BulkRowResult(index=offset + i, id=None if error else listing_id, error=error))
+            else:
+                results.append(BulkRowResult(index=offset + i, error=item))
+
+    failed = sum(1 for result in results if result.error)
+    return BulkResponse(succeeded=len(results) - failed, failed=failed, results=results)
+
+@router.patch("/bulk", response_model=BulkResponse)
+async def update_listings_bulk(
+    updates: List[ListingBulkUpdate],
+    repo: ItemRepository = Depends(get_item_repository),
+    current_user = Depends(get_current_user)
+):
+    """
+    Change the status and/or price of many of the current user's listings
+
+    Args:
+        updates: One row per listing: id plus the fields to change
+        repo: Item repository
+        current_user: Owner of the listings
+
+    Returns:
+        Counts and a result per row, by position
+    """
+    if len(updates) > BULK_MAX_ROWS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"At most {BULK_MAX_ROWS} updates per request"
+        )
+    errors = await repo.update_items(updates, seller_id=current_user.id)
+    results = [BulkRowResult(index=i, id=update.id, error=error) for i, (update, error) in enumerate(zip(updates, errors))]
+    failed = sum(1 for error in errors if error)
+    return BulkResponse(succeeded=len(results) - failed, failed=failed, results=results)
+
+def _parse_rows(body: bytes, ndjson: bool) -> list:
+    """
+    Decode a bulk body; a malformed NDJSON line becomes its row's error
+
+    Raises:
+        ValueError: If a JSON body is not an array
+    """
+    if ndjson:
+        rows = []
+        for line in body.decode("utf-8").splitlines():
+            if not line.strip():
+                continue
+            try:
+                rows.append(json.loads(line))
+            except ValueError as e:
+                rows.append(e)
+        return rows
+
+    try:
+        rows = json.loads(body)
+    except ValueError:
+        raise ValueError("Body must be a JSON array or NDJSON")
+    if not isinstance(rows, list):
+        raise ValueError("Body must be a JSON array or NDJSON")
+    return rows
+
+def _validate_rows(rows: list) -> list:
+    """
+    Validate rows as ItemCreate; each failure is replaced by its error message
+    """
+    validated = []
+    for row in rows:
+        if isinstance(row, ValueError):
+            validated.append(f"Invalid JSON: {row}")
+            continue
+        try:
+            validated.append(ItemCreate.model_validate(row))
+        except ValidationError as e:
+            validated.append("; ".join(
+                f"{'.'.join(map(str, error['loc'])) or 'row'}: {error['msg']}" for error in e.errors()
+            ))
+    return validated
 
 @router.get("/{item_id}", response_model=ItemResponse)
 async def get_listing(
@@ -77,13 +191,13 @@ async def get_listing(
     Get details for a specific listing.
     Returns 404 if no such item exists.
     """
-    item = await repo.get_item(item_id)
+    item = await repo.find_item(item_id)
     if not item:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Listing with id={item_id} not found"
         )
-    return item
+    return ItemJSONResponse(item)
 
 @router.put("/{item_id}", response_model=ItemResponse)
 async def update_listing(
@@ -174,8 +288,12 @@ async def request_reservation(
     """
     Request to reserve an item.
     """
-    success = await repo.add_reservation_request(item_id, user_id)
-    if not success:
+    outcome = await repo.add_reservation_request(item_id, user_id)
+    if outcome == ReservationOutcome.CONFLICT:
+        raise HTTPException(status_code=409, detail="Listing is no longer available")
+    if outcome == ReservationOutcome.DUPLICATE:
+        raise HTTPException(status_code=404, detail="Reservation request already exists")
+    if outcome != ReservationOutcome.CREATED:
         raise HTTPException(status_code=404, detail="Listing not found or reservation failed")
     return {"message": "Reservation request submitted successfully."}
 
@@ -189,8 +307,10 @@ async def confirm_reservation(
     """
     Confirm a reservation request for a listing.
     """
-    success = await repo.confirm_reservation(item_id, confirmation.buyer_id)
-    if not success:
+    outcome = await repo.confirm_reservation(item_id, confirmation.buyer_id)
+    if outcome == ReservationOutcome.CONFLICT:
+        raise HTTPException(status_code=409, detail="Listing is already reserved or sold")
+    if outcome != ReservationOutcome.CONFIRMED:
         raise HTTPException(status_code=404, detail="Listing not found or confirmation failed")
     return {"message": "Reservation confirmed successfully."}
 
@@ -198,12 +318,12 @@ async def confirm_reservation(
 async def get_reservations(
     item_id: str,
     repo: ItemRepository = Depends(get_item_repository),
-    user_repo: ItemRepository = Depends(get_user_repository)
+    users: UserLoader = Depends(get_user_loader)
 ):
     """
     Get all reservation requests for a listing.
     """
-    reservations = await repo.get_reservations(item_id, user_repo)
+    reservations = await repo.get_reservations(item_id, users)
     if reservations is None:
         raise HTTPException(status_code=404, detail="Listing not found")
     return reservations
@@ -214,8 +334,8 @@ async def cancel_reservation_request(
     buyer_id: str,
     repo: ItemRepository = Depends(get_item_repository)
 ):
-    success = await repo.cancel_reservation(item_id, buyer_id)
-    if not success:
+    outcome = await repo.cancel_reservation(item_id, buyer_id)
+    if outcome != ReservationOutcome.CANCELLED:
         raise HTTPException(status_code=404, detail="Reservation not found or listing not found")
     return {"message": "Reservation request cancelled successfully."}
 
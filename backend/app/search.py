@@ -1,18 +1,22 @@
 # backend/app/search.py
-from fastapi import APIRouter, Depends, Query, HTTPException
-from typing import List, Optional
+from fastapi import APIRouter, Depends, Query, HTTPException, Request, Response
+from typing import List, Literal, Optional
 from motor.motor_asyncio import AsyncIOMotorDatabase
 from fastapi.responses import RedirectResponse
 from datetime import datetime, timedelta
 import logging
 import re
 
-from backend.utilities.models import ItemResponse, SearchFilters, ItemCategory, ItemCondition, ListingStatus
-from backend.db.repository import ItemRepository
+from backend.utilities.models import FacetsResponse, ItemResponse, SearchFilters, ItemCategory, ItemCondition, ListingStatus, SortOrder
+from backend.db.repository import ItemRepository, item_projection
 from backend.db.database import get_database
+from backend.db.text_search import MAX_CANDIDATES, search_listing_ids, sync_state
+from backend.db.facets import facet_cache
+from backend.utilities.pagination import NEXT_CURSOR_HEADER, apply_cursor, encode_cursor, sort_spec
+from backend.utilities.serialization import ItemJSONResponse, item_encoder, parse_fields
+from backend.utilities.text_index import tokenize
 
 # Set up logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 router = APIRouter(
@@ -40,23 +44,44 @@ async def search_listings(
     status: Optional[str] = Query(None, description="Filter by status"),
     tags: Optional[List[str]] = Query(None, description="Filter by tags"),
     location: Optional[str] = Query(None, description="Filter by location"),
-    sort_by: Optional[str] = Query("created_at", description="Sort field"),
-    sort_order: Optional[int] = Query(-1, description="Sort order: 1 for ascending, -1 for descending"),
-    skip: int = Query(0, ge=0, description="Number of items to skip"),
+    sort_by: Literal["created_at", "price", "relevance"] = Query("created_at", description="Sort field, or 'relevance' to rank by the search query"),
+    sort_order: SortOrder = Query(SortOrder.DESCENDING, description="Sort order: 1 for ascending, -1 for descending"),
+    skip: int = Query(0, ge=0, description="Number of items to skip (ignored when a cursor is given)"),
     limit: int = Query(10, ge=1, le=100, description="Number of items per page"),
-    db: AsyncIOMotorDatabase = Depends(get_database)
+    cursor: Optional[str] = Query(None, description="Continuation token from the X-Next-Cursor header"),
+    fields: Optional[str] = Query(None, description="Comma-separated listing fields to return; id is always included"),
+    images_limit: Optional[int] = Query(None, ge=0, description="Return at most this many images per listing"),
+    repo: ItemRepository = Depends(get_item_repository)
 ):
+    # Sparse fieldset: narrows both the projection and the encoder
+    try:
+        selected = parse_fields(ItemResponse, fields)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    projection = item_projection(selected, images_limit)
+    encoder = item_encoder.select(selected)
+
     # Create a filter dictionary
     filter_dict = {}
     
-    logger.info(f"Search parameters - Query: {q}, Category: {category}, Status: {status}")
+    logger.debug(f"Search parameters - Query: {q}, Category: {category}, Status: {status}")
     
-    # Add search query filter (search in title and description)
+    # Keyword matching is answered by the in-process text index; Mongo only
+    # applies the structured filters to the matches it returns
+    ranked = None
     if q:
-        filter_dict["$or"] = [
-            {"title": {"$regex": q, "$options": "i"}},
-            {"description": {"$regex": q, "$options": "i"}}
-        ]
+        if sync_state.ready and tokenize(q):
+            ranked = search_listing_ids(q)
+            if not ranked:
+                return []
+        else:
+            # Index still loading, or nothing it can look up (only stopwords
+            # or punctuation): escaped substring match over title and description
+            pattern = re.escape(q)
+            filter_dict["$or"] = [
+                {"title": {"$regex": pattern, "$options": "i"}},
+                {"description": {"$regex": pattern, "$options": "i"}}
+            ]
     
     # Add other filters
     if category:
@@ -83,37 +108,152 @@ async def search_listings(
     if price_filter:
         filter_dict["price"] = price_filter
 
-    # Create sort dict - default to sorting by creation date, newest first
-    sort_dict = {sort_by: sort_order}
-    
-    logger.info(f"Search filter: {filter_dict}")
-    logger.info(f"Sort criteria: {sort_dict}")
+    if sort_by == "relevance":
+        if ranked is None:
+            raise HTTPException(status_code=400, detail="Sorting by relevance needs a search query")
+        if cursor:
+            raise HTTPException(status_code=400, detail="Relevance results are paged with skip, not a cursor")
+        docs = await _ranked_page(repo, filter_dict, ranked, skip, limit, projection)
+        return ItemJSONResponse(docs, encoder=encoder)
+
+    # A small match set goes to Mongo as an $in list. A large one would make
+    # that list huge, so the filtered listings are walked in sort order instead
+    match_ids = None
+    if ranked is not None:
+        if len(ranked) <= MAX_CANDIDATES:
+            filter_dict["_id"] = {"$in": [listing_id for listing_id, _ in ranked]}
+        else:
+            match_ids = {listing_id for listing_id, _ in ranked}
+
+    # Continue after the previous page instead of skipping over it
+    try:
+        filter_dict = apply_cursor(filter_dict, sort_by, sort_order, cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    # Sort by the requested field (default: creation date, newest first), _id breaks ties
+    sort_list = sort_spec(sort_by, sort_order)
     
-    # Query database
-    cursor = db.Listings.find(filter_dict).sort(list(sort_dict.items())).skip(skip).limit(limit)
+    logger.debug(f"Search filter: {filter_dict}")
+    logger.debug(f"Sort criteria: {sort_list}")
     
-    # Convert to list
-    results = []
-    async for doc in cursor:
-        doc["id"] = str(doc["_id"])
-        doc["seller_id"] = str(doc["seller_id"])
-        
-        # Convert buyerId to string if it exists and is an ObjectId
-        if "buyerId" in doc and doc["buyerId"] is not None:
-            doc["buyerId"] = str(doc["buyerId"])
-            
-        results.append(ItemResponse(**doc))
+    # Query database, one extra document tells us whether there is a next page.
+    # Only the response fields (and the sort key for the cursor) are read
+    if match_ids is not None:
+        docs = await _matching_page(repo, filter_dict, match_ids, sort_by, sort_list, 0 if cursor else skip, limit + 1, projection)
+    else:
+        db_cursor = repo.raw.find(filter_dict, {sort_by: 1, **projection}).sort(sort_list)
+        if not cursor and skip:
+            db_cursor = db_cursor.skip(skip)
+        docs = await db_cursor.limit(limit + 1).to_list(length=limit + 1)
+
+    headers = None
+    if len(docs) > limit:
+        docs = docs[:limit]
+        headers = {NEXT_CURSOR_HEADER: encode_cursor(sort_by, sort_order, docs[-1])}
     
-    logger.info(f"Found {len(results)} results")
+    logger.debug(f"Found {len(docs)} results")
     
-    return results
+    # Documents are encoded straight to JSON, response_model only documents the schema
+    return ItemJSONResponse(docs, headers=headers, encoder=encoder)
+
+async def _ranked_page(repo: ItemRepository, filter_dict: dict, ranked: list, skip: int, limit: int, projection: dict) -> list:
+    """
+    Page through text search matches in score order
+
+    Matches are checked against the filters MAX_CANDIDATES at a time, best
+    first, until the page is full. Only _id is read for the filtering pass,
+    full documents are fetched for the page alone.
+    """
+    page_ids = []
+    for start in range(0, len(ranked), MAX_CANDIDATES):
+        batch = [listing_id for listing_id, _ in ranked[start:start + MAX_CANDIDATES]]
+        query = {"$and": [filter_dict, {"_id": {"$in": batch}}]} if filter_dict else {"_id": {"$in": batch}}
+        matching = {doc["_id"] async for doc in repo.collection.find(query, {"_id": 1})}
+        page_ids.extend(listing_id for listing_id in batch if listing_id in matching)
+        if len(page_ids) >= skip + limit:
+            break
+    page_ids = page_ids[skip:skip + limit]
+    return await _fetch_in_order(repo, page_ids, projection)
+
+async def _matching_page(
+    repo: ItemRepository, filter_dict: dict, match_ids: set, sort_by: str, sort_list: list,
+    skip: int, count: int, projection: dict
+) -> list:
+    """
+    Sorted page of filtered listings that are among a large set of text matches
+
+    Walks the filtered listings in sort order reading only _id and the sort
+    key, keeps the matches, and fetches full documents for the page alone.
+    """
+    page_ids = []
+    db_cursor = repo.collection.find(filter_dict, {sort_by: 1}).sort(sort_list).batch_size(MAX_CANDIDATES)
+    async for doc in db_cursor:
+        if doc["_id"] not in match_ids:
+            continue
+        if skip:
+            skip -= 1
+            continue
+        page_ids.append(doc["_id"])
+        if len(page_ids) == count:
+            break
+    await db_cursor.close()
+    return await _fetch_in_order(repo, page_ids, {sort_by: 1, **projection})
+
+async def _fetch_in_order(repo: ItemRepository, ids: list, projection: dict) -> list:
+    if not ids:
+        return []
+    docs = {doc["_id"]: doc async for doc in repo.raw.find({"_id": {"$in": ids}}, projection)}
+    return [docs[listing_id] for listing_id in ids if listing_id in docs]
+
+def _not_modified(request: Request, response: Response, etag: str) -> Optional[Response]:
+    """
+    Set the validators on the response, or return a 304 if the client's copy is current
+    """
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    client_tags = {tag.strip().removeprefix("W/") for tag in request.headers.get("if-none-match", "").split(",")}
+    if etag in client_tags or "*" in client_tags:
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return None
 
 @router.get("/categories", response_model=List[str])
 async def get_categories(
-    db: AsyncIOMotorDatabase = Depends(get_database),
-    repo: ItemRepository = Depends(get_item_repository)
+    request: Request,
+    response: Response,
+    db: AsyncIOMotorDatabase = Depends(get_database)
 ):
     """
     Get all available categories
+    
+    Answered from the facet cache; clients may revalidate with If-None-Match.
     """
-    return await repo.get_categories()
+    facets = await facet_cache.get(db)
+    not_modified = _not_modified(request, response, facets.etag)
+    if not_modified:
+        return not_modified
+    return sorted(facets.counts["categories"])
+
+@router.get("/facets", response_model=FacetsResponse)
+async def get_facets(
+    request: Request,
+    response: Response,
+    db: AsyncIOMotorDatabase = Depends(get_database)
+):
+    """
+    Listing counts per category, condition and status
+    
+    Every enum value is present, with a count of 0 when no listing has it.
+    Clients may revalidate with If-None-Match.
+    """
+    facets = await facet_cache.get(db)
+    not_modified = _not_modified(request, response, facets.etag)
+    if not_modified:
+        return not_modified
+
+    counts = facets.counts
+    return FacetsResponse(
+        categories={**{c.value: 0 for c in ItemCategory}, **counts["categories"]},
+        conditions={**{c.value: 0 for c in ItemCondition}, **counts["conditions"]},
+        statuses={**{s.value: 0 for s in ListingStatus}, **counts["statuses"]},
+    )
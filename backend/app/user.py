@@ -1,6 +1,9 @@
 from ..utilities.models import ItemResponse, MyRequestsResponse, UserResponse
 from ..db.repository import ItemRepository, UserRepository
 from ..db.database import get_database
+from ..db.loaders import UserLoader, get_user_loader
+from ..utilities.serialization import ItemJSONResponse, MyRequestsJSONResponse
+from .auth import revoke_session_claims
 from motor.motor_asyncio import AsyncIOMotorDatabase
 from fastapi import APIRouter, Depends, Query, Request, HTTPException, status
 from typing import List
@@ -27,25 +30,25 @@ async def get_my_listings(
     user_id: str,
     repo: ItemRepository = Depends(get_item_repository)
 ):
-    return await repo.get_items_by_seller_id(user_id)
+    return ItemJSONResponse(await repo.find_items_by_seller_id(user_id))
 
 
 @router.get("/{user_id}/my_requests", response_model=List[MyRequestsResponse])
 async def get_my_requests(
     user_id: str,
     repo: ItemRepository = Depends(get_item_repository),
-    user_repo: UserRepository = Depends(get_user_repository)
+    users: UserLoader = Depends(get_user_loader)
 ):
-    return await repo.get_items_requested_by_user(user_id, user_repo)
+    return MyRequestsJSONResponse(await repo.find_items_requested_by_user(user_id, users))
 
 @router.get("/{user_id}/my_requests/{item_id}", response_model=List[MyRequestsResponse])
 async def get_my_requests(
     user_id: str,
     item_id: str,
     repo: ItemRepository = Depends(get_item_repository),
-    user_repo: UserRepository = Depends(get_user_repository)
+    users: UserLoader = Depends(get_user_loader)
 ):
-    return await repo.get_reservation_request(user_id, user_repo, item_id)
+    return MyRequestsJSONResponse(await repo.find_reservation_request(user_id, users, item_id))
 
 # Add the update-phone endpoint 
 @router.post("/update-phone")
@@ -79,6 +82,9 @@ async def update_phone(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="User not found or update failed"
         )
+
+    # Session claims carry the phone number, make them refresh
+    revoke_session_claims(user['id'])
     
     return {"message": "Phone number updated successfully"}
 
@@ -87,9 +93,9 @@ async def get_my_requests(
     user_id: str,
     item_id: str,
     repo: ItemRepository = Depends(get_item_repository),
-    user_repo: UserRepository = Depends(get_user_repository)
+    users: UserLoader = Depends(get_user_loader)
 ):
-    return await repo.get_reservation_request(user_id, user_repo, item_id)
+    return MyRequestsJSONResponse(await repo.find_reservation_request(user_id, users, item_id))
 
 @router.get("/{user_id}", response_model=UserResponse)
 async def get_user_by_id(
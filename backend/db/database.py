@@ -1,30 +1,203 @@
 # backend/db/database.py
-import certifi
-from motor.motor_asyncio import AsyncIOMotorClient
+import asyncio
+import logging
+import threading
+import time
+from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
+from pymongo import monitoring
+from pymongo.errors import PyMongoError
 from fastapi import Depends
-from typing import AsyncGenerator
+from typing import AsyncGenerator, Dict, Optional
 import os
 from dotenv import load_dotenv
 
 # Load .env file
 load_dotenv()
 
-ca = certifi.where()
+logger = logging.getLogger(__name__)
 
 # MongoDB connection settings
 MONGODB_URL = os.getenv("MONGO_DETAILS")
 DATABASE_NAME = os.getenv("DATABASE_NAME", "Bazaar")
 
+# Connection pool settings, per worker process
+MONGO_MAX_POOL_SIZE = int(os.getenv("MONGO_MAX_POOL_SIZE", "100"))
+MONGO_MIN_POOL_SIZE = int(os.getenv("MONGO_MIN_POOL_SIZE", "5"))
+MONGO_MAX_IDLE_TIME_MS = int(os.getenv("MONGO_MAX_IDLE_TIME_MS", "300000"))
+# How long a request waits for a free connection before failing
+MONGO_WAIT_QUEUE_TIMEOUT_MS = int(os.getenv("MONGO_WAIT_QUEUE_TIMEOUT_MS", "5000"))
+MONGO_CONNECT_TIMEOUT_MS = int(os.getenv("MONGO_CONNECT_TIMEOUT_MS", "5000"))
+MONGO_SERVER_SELECTION_TIMEOUT_MS = int(os.getenv("MONGO_SERVER_SELECTION_TIMEOUT_MS", "5000"))
+# Connections opened at startup, before the first request needs them
+MONGO_WARM_CONNECTIONS = int(os.getenv("MONGO_WARM_CONNECTIONS", str(MONGO_MIN_POOL_SIZE)))
+
+
+class PoolMonitor(monitoring.ConnectionPoolListener):
+    """
+    Connection pool counters per server, kept from pymongo's pool events
+
+    ``waiting`` counts requests queued for a connection and the checkout
+    wait times show how long they queued. Together with the ping latency
+    they separate a starved pool (long waits, Mongo fast) from a slow
+    server (short waits, slow ping).
+
+    Events arrive on pymongo's threads, hence the lock.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pools: Dict[str, dict] = {}
+
+    def _update(self, address, **deltas):
+        key = f"{address[0]}:{address[1]}"
+        with self._lock:
+            pool = self._pools.setdefault(key, {
+                "open": 0, "checked_out": 0, "waiting": 0, "checkouts": 0,
+                "checkout_failures": 0, "cleared": 0, "wait_ms_total": 0.0, "wait_ms_max": 0.0,
+            })
+            for field, delta in deltas.items():
+                if field == "wait_ms_max":
+                    pool[field] = max(pool[field], delta)
+                else:
+                    pool[field] += delta
+
+    def pool_created(self, event):
+        self._update(event.address)
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        self._update(event.address, cleared=1)
+
+    def pool_closed(self, event):
+        with self._lock:
+            self._pools.pop(f"{event.address[0]}:{event.address[1]}", None)
+
+    def connection_created(self, event):
+        self._update(event.address, open=1)
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        self._update(event.address, open=-1)
+
+    def connection_check_out_started(self, event):
+        self._update(event.address, waiting=1)
+
+    def connection_check_out_failed(self, event):
+        self._update(event.address, waiting=-1, checkout_failures=1)
+
+    def connection_checked_out(self, event):
+        wait_ms = (getattr(event, "duration", None) or 0) * 1000
+        self._update(event.address, waiting=-1, checked_out=1, checkouts=1, wait_ms_total=wait_ms, wait_ms_max=wait_ms)
+
+    def connection_checked_in(self, event):
+        self._update(event.address, checked_out=-1)
+
+    def snapshot(self) -> Dict[str, dict]:
+        """
+        Current counters per server address
+        """
+        with self._lock:
+            pools = {address: dict(pool) for address, pool in self._pools.items()}
+        for pool in pools.values():
+            pool["available"] = pool["open"] - pool["checked_out"]
+            pool["avg_wait_ms"] = round(pool.pop("wait_ms_total") / pool["checkouts"], 3) if pool["checkouts"] else 0.0
+            pool["wait_ms_max"] = round(pool["wait_ms_max"], 3)
+        return pools
+
+
+pool_monitor = PoolMonitor()
+
+
+def client_options() -> dict:
+    return {
+        "maxPoolSize": MONGO_MAX_POOL_SIZE,
+        "minPoolSize": MONGO_MIN_POOL_SIZE,
+        "maxIdleTimeMS": MONGO_MAX_IDLE_TIME_MS,
+        "waitQueueTimeoutMS": MONGO_WAIT_QUEUE_TIMEOUT_MS,
+        "connectTimeoutMS": MONGO_CONNECT_TIMEOUT_MS,
+        "serverSelectionTimeoutMS": MONGO_SERVER_SELECTION_TIMEOUT_MS,
+        "event_listeners": [pool_monitor],
+        # Connect on first use, in the worker: the client is created at import,
+        # which may happen in a preloading server's master before it forks
+        "connect": False,
+    }
+
+
+_client: Optional[AsyncIOMotorClient] = None
+
+
+def get_client() -> AsyncIOMotorClient:
+    """
+    The process-wide Mongo client, created on first use
+
+    Importing the app does not build it, so test collection and worker
+    boot skip that cost until something talks to the database.
+    """
+    global _client
+    if _client is None:
+        import certifi
+
+        _client = AsyncIOMotorClient(MONGODB_URL, tlsCAFile=certifi.where(), **client_options())
+    return _client
+
+
+def get_db() -> AsyncIOMotorDatabase:
+    return get_client()[DATABASE_NAME]
+
+
+def close_client():
+    global _client
+    if _client is not None:
+        _client.close()
+        _client = None
+
+
+def __getattr__(name: str):
+    # `from backend.db.database import client, db` keeps working, lazily
+    if name == "client":
+        return get_client()
+    if name == "db":
+        return get_db()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+async def ping(database: Optional[AsyncIOMotorDatabase] = None) -> float:
+    """
+    Round trip to the server, including the wait for a pooled connection
+
+    Returns:
+        Latency in milliseconds
+    """
+    database = database if database is not None else get_db()
+    start = time.perf_counter()
+    await database.command("ping")
+    return (time.perf_counter() - start) * 1000
+
+
+async def warm_pool(database: Optional[AsyncIOMotorDatabase] = None, connections: int = MONGO_WARM_CONNECTIONS):
+    """
+    Open pool connections ahead of traffic
+
+    Concurrent pings each check out their own connection. A failure is only
+    logged; the readiness check reports the database as down.
+    """
+    if connections <= 0:
+        return
+    database = database if database is not None else get_db()
+    try:
+        await asyncio.gather(*(database.command("ping") for _ in range(connections)))
+    except PyMongoError as e:
+        logger.warning(f"Connection pool warm-up failed: {e}")
 
-# Create MongoDB client
-client = AsyncIOMotorClient(MONGODB_URL, tlsCAFile=ca)
-db = client[DATABASE_NAME]
 
 async def get_database() -> AsyncGenerator[AsyncIOMotorClient, None]:
     """
     Dependency for getting MongoDB database instance.
     """
     try:
-        yield db
+        yield get_db()
     finally:
-        pass  # Connection is managed by the client 
\ No newline at end of file
+        pass  # Connection is managed by the client
@@ -0,0 +1,145 @@
+# backend/db/export.py
+"""
+Streaming export of the listing catalog as NDJSON or CSV.
+
+Listings are read in ``_id`` order, one bounded batch per query
+(``_id > last``), and each batch is formatted and handed to the caller
+before the next one is read. Memory stays at one batch whatever the
+catalog size, no server cursor is held open between batches, and an export
+can resume after the last ``_id`` it wrote.
+"""
+import csv
+import io
+import json
+import os
+from datetime import datetime
+from enum import Enum
+from typing import AsyncIterator, List, Optional, Tuple
+
+from bson import ObjectId
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+from backend.utilities.models import ItemResponse
+
+EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", "1000"))
+
+EXPORT_FORMATS = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+# ItemResponse plus the fields only analytics needs
+EXPORT_FIELDS: List[str] = [*ItemResponse.model_fields, "tags", "location"]
+
+
+def export_filter(
+    seller_id: Optional[str] = None,
+    status: Optional[str] = None,
+    category: Optional[str] = None,
+    after: Optional[str] = None
+) -> dict:
+    """
+    Build the server-side filter for an export
+
+    Args:
+        seller_id: Only this seller's listings
+        status: Only listings with this status
+        category: Only listings in this category
+        after: Resume after this listing id (the last one written)
+
+    Returns:
+        The Mongo filter
+
+    Raises:
+        ValueError: If an id is not a valid ObjectId
+    """
+    query = {}
+    try:
+        if seller_id:
+            query["seller_id"] = ObjectId(seller_id)
+        if after:
+            query["_id"] = {"$gt": ObjectId(after)}
+    except Exception:
+        raise ValueError("Invalid id")
+    if status:
+        query["status"] = status
+    if category:
+        query["category"] = category
+    return query
+
+
+def _plain(value):
+    if isinstance(value, ObjectId):
+        return str(value)
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, list):
+        return [_plain(v) for v in value]
+    return value
+
+
+def export_row(doc: dict) -> dict:
+    """
+    One listing as plain JSON values, in EXPORT_FIELDS order
+    """
+    doc = {**doc, "id": doc["_id"]}
+    return {field: _plain(doc.get(field)) for field in EXPORT_FIELDS}
+
+
+def _csv_chunk(rows: List[dict], header: bool) -> str:
+    out = io.StringIO()
+    writer = csv.writer(out)
+    if header:
+        writer.writerow(EXPORT_FIELDS)
+    for row in rows:
+        # Lists (tags, images) go in one cell
+        writer.writerow(["|".join(map(str, v)) if isinstance(v, list) else ("" if v is None else v) for v in row.values()])
+    return out.getvalue()
+
+
+def _ndjson_chunk(rows: List[dict]) -> str:
+    return "".join(json.dumps(row, ensure_ascii=False, separators=(",", ":")) + "\n" for row in rows)
+
+
+async def export_listings(
+    db: AsyncIOMotorDatabase,
+    fmt: str = "ndjson",
+    query: Optional[dict] = None,
+    batch_size: int = EXPORT_BATCH_SIZE,
+    header: bool = True
+) -> AsyncIterator[Tuple[str, ObjectId]]:
+    """
+    Stream matching listings in ``_id`` order, one formatted batch at a time
+
+    Args:
+        db: Database connection
+        fmt: "ndjson" or "csv"
+        query: Filter from export_filter
+        batch_size: Listings read per query
+        header: Write the CSV header row first
+
+    Returns:
+        An async iterator of (text chunk, last listing id in the chunk)
+
+    Raises:
+        ValueError: If the format is unknown
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format: {fmt}")
+
+    query = dict(query or {})
+    start = query.pop("_id", {}).get("$gt")
+    projection = {field: 1 for field in EXPORT_FIELDS if field != "id"}
+    if fmt == "csv" and header:
+        yield _csv_chunk([], header=True), start
+
+    last_id = start
+    while True:
+        batch_query = {**query, "_id": {"$gt": last_id}} if last_id else query
+        docs = await db.Listings.find(batch_query, projection).sort("_id", 1).limit(batch_size).to_list(length=batch_size)
+        if not docs:
+            return
+        last_id = docs[-1]["_id"]
+        rows = [export_row(doc) for doc in docs]
+        yield (_csv_chunk(rows, header=False) if fmt == "csv" else _ndjson_chunk(rows)), last_id
+        if len(docs) < batch_size:
+            return
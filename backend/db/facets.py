@@ -0,0 +1,79 @@
+# backend/db/facets.py
+"""
+In-process cache of the search facets: listing counts per category,
+condition and status.
+
+The counts come from one ``$facet`` aggregation and are kept for
+FACET_CACHE_TTL seconds, or until a listing write in this process
+invalidates them. Each build gets an ETag so clients can revalidate with
+If-None-Match instead of downloading the counts again.
+"""
+import asyncio
+import hashlib
+import json
+import os
+import time
+from typing import Dict, Optional
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+FACET_CACHE_TTL = float(os.getenv("FACET_CACHE_TTL", "60"))
+
+FACET_FIELDS = {"categories": "category", "conditions": "condition", "statuses": "status"}
+
+
+class Facets:
+    def __init__(self, counts: Dict[str, Dict[str, int]]):
+        self.counts = counts
+        digest = hashlib.sha1(json.dumps(counts, sort_keys=True).encode()).hexdigest()
+        self.etag = f'"{digest[:16]}"'
+
+
+class FacetCache:
+    def __init__(self, ttl: float = FACET_CACHE_TTL):
+        self.ttl = ttl
+        self._facets: Optional[Facets] = None
+        self._expires_at = 0.0
+        self._generation = 0
+        self._lock = asyncio.Lock()
+
+    def invalidate(self):
+        self._generation += 1
+        self._expires_at = 0.0
+
+    def clear(self):
+        self.invalidate()
+        self._facets = None
+
+    async def get(self, db: AsyncIOMotorDatabase) -> Facets:
+        if self._facets is not None and time.monotonic() < self._expires_at:
+            return self._facets
+
+        # One build at a time; requests queued behind it reuse its result
+        async with self._lock:
+            if self._facets is not None and time.monotonic() < self._expires_at:
+                return self._facets
+
+            generation = self._generation
+            facets = Facets(await self._aggregate(db))
+            self._facets = facets
+            # Invalidated while aggregating: serve it, but rebuild next time
+            if generation == self._generation:
+                self._expires_at = time.monotonic() + self.ttl
+            return facets
+
+    @staticmethod
+    async def _aggregate(db: AsyncIOMotorDatabase) -> Dict[str, Dict[str, int]]:
+        result = await db.Listings.aggregate([
+            {"$facet": {
+                name: [{"$group": {"_id": f"${field}", "count": {"$sum": 1}}}]
+                for name, field in FACET_FIELDS.items()
+            }}
+        ]).to_list(length=1)
+        return {
+            name: {str(group["_id"]): group["count"] for group in groups if group["_id"] is not None}
+            for name, groups in result[0].items()
+        }
+
+
+facet_cache = FacetCache()
@@ -0,0 +1,159 @@
+# backend/db/featured.py
+"""
+Precomputed featured listings for the home page.
+
+One worker (the leader) periodically scores every available listing and
+stores the ranked ids per category in the ``featured`` collection. Every
+worker loads that ranking into an in-memory snapshot, so /home/featured is
+served without touching the database. A refresh builds a complete new
+snapshot and swaps it in with a single assignment; readers always see
+either the old or the new ranking, never a mix.
+"""
+import heapq
+import logging
+import math
+import os
+import uuid
+from datetime import datetime, timezone
+from statistics import median
+from typing import Dict, List, Optional, Tuple
+
+from bson import ObjectId
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+from backend.utilities.dates import as_utc
+from backend.utilities.models import ItemResponse, ListingStatus
+from backend.utilities.serialization import model_projection
+
+logger = logging.getLogger(__name__)
+
+FEATURED_PER_CATEGORY = int(os.getenv("FEATURED_PER_CATEGORY", "20"))
+FEATURED_HALF_LIFE_DAYS = float(os.getenv("FEATURED_HALF_LIFE_DAYS", "7"))
+FEATURED_REFRESH_INTERVAL = float(os.getenv("FEATURED_REFRESH_INTERVAL", "300"))
+
+# Ranking across all categories
+ALL_CATEGORIES = "all"
+RANKING_ID = "ranking"
+
+_SCORING_FIELDS = {"category": 1, "price": 1, "created_at": 1, "reservation_count": 1}
+
+
+def score_listing(listing: dict, category_median_price: float, now: datetime) -> float:
+    """
+    Recency x demand x price band
+
+    Recency halves every FEATURED_HALF_LIFE_DAYS, each reservation request
+    adds demand with diminishing returns, and listings priced far from their
+    category's median are pushed down.
+    """
+    try:
+        age_days = max((now - as_utc(listing.get("created_at"))).total_seconds() / 86400, 0)
+    except (TypeError, ValueError):
+        age_days = FEATURED_HALF_LIFE_DAYS * 10
+    recency = 0.5 ** (age_days / FEATURED_HALF_LIFE_DAYS)
+    demand = 1 + math.log1p(listing.get("reservation_count") or 0)
+    price_distance = abs(math.log((listing.get("price") or 0) + 1) - math.log(category_median_price + 1))
+    price_band = 1 / (1 + price_distance)
+    return recency * demand * price_band
+
+
+class FeaturedSnapshot:
+    def __init__(self, generation: Optional[str] = None, by_category: Optional[Dict[str, List[ItemResponse]]] = None):
+        self.generation = generation
+        self.by_category = by_category or {}
+
+    def get(self, category: Optional[str], limit: int) -> List[ItemResponse]:
+        return self.by_category.get(category or ALL_CATEGORIES, [])[:limit]
+
+    def without(self, listing_id: str) -> "FeaturedSnapshot":
+        return FeaturedSnapshot(self.generation, {
+            category: [item for item in items if item.id != listing_id]
+            for category, items in self.by_category.items()
+        })
+
+
+class _Featured:
+    current = FeaturedSnapshot()
+
+
+featured = _Featured()
+
+
+def discard_featured(listing_id: str):
+    """
+    Drop a listing that stopped being available from this worker's snapshot
+    """
+    if any(item.id == listing_id for items in featured.current.by_category.values() for item in items):
+        featured.current = featured.current.without(listing_id)
+
+
+async def compute_featured(db: AsyncIOMotorDatabase, per_category: int = FEATURED_PER_CATEGORY) -> dict:
+    """
+    Score the available listings and store the ranked ids per category
+
+    Only the scoring fields are read, so memory stays at a few numbers per
+    listing plus one bounded heap per category.
+
+    Returns:
+        The ranking document
+    """
+    now = datetime.now(timezone.utc)
+    available = {"status": ListingStatus.AVAILABLE.value}
+
+    prices: Dict[str, List[float]] = {}
+    async for doc in db.Listings.find(available, {"category": 1, "price": 1}):
+        prices.setdefault(str(doc.get("category")), []).append(doc.get("price") or 0)
+    medians = {category: median(values) for category, values in prices.items()}
+
+    heaps: Dict[str, List[Tuple[float, str]]] = {ALL_CATEGORIES: []}
+    async for doc in db.Listings.find(available, _SCORING_FIELDS):
+        category = str(doc.get("category"))
+        entry = (score_listing(doc, medians.get(category, 0), now), str(doc["_id"]))
+        for key in (category, ALL_CATEGORIES):
+            heap = heaps.setdefault(key, [])
+            if len(heap) < per_category:
+                heapq.heappush(heap, entry)
+            else:
+                heapq.heappushpop(heap, entry)
+
+    ranking = {
+        "_id": RANKING_ID,
+        "generation": uuid.uuid4().hex,
+        "generated_at": now,
+        "categories": {
+            category: [listing_id for _, listing_id in sorted(heap, reverse=True)]
+            for category, heap in heaps.items()
+        },
+    }
+    await db.featured.replace_one({"_id": RANKING_ID}, ranking, upsert=True)
+    return ranking
+
+
+async def refresh_featured(db: AsyncIOMotorDatabase) -> bool:
+    """
+    Load the stored ranking into memory if it changed since the last load
+
+    Returns:
+        True if the snapshot was replaced
+    """
+    ranking = await db.featured.find_one({"_id": RANKING_ID})
+    if not ranking or ranking["generation"] == featured.current.generation:
+        return False
+
+    listing_ids = {listing_id for ids in ranking["categories"].values() for listing_id in ids}
+    items: Dict[str, ItemResponse] = {}
+    # Re-check availability; a listing may have been reserved since the ranking ran
+    query = {"_id": {"$in": [ObjectId(i) for i in listing_ids]}, "status": ListingStatus.AVAILABLE.value}
+    async for doc in db.Listings.find(query, model_projection(ItemResponse)):
+        doc["id"] = str(doc["_id"])
+        doc["seller_id"] = str(doc["seller_id"])
+        if doc.get("buyerId") is not None:
+            doc["buyerId"] = str(doc["buyerId"])
+        items[doc["id"]] = ItemResponse(**doc)
+
+    featured.current = FeaturedSnapshot(ranking["generation"], {
+        category: [items[listing_id] for listing_id in ids if listing_id in items]
+        for category, ids in ranking["categories"].items()
+    })
+    logger.info(f"Loaded featured listings generation {ranking['generation']}")
+    return True
@@ -0,0 +1,137 @@
+# backend/db/indexes.py
+"""
+Declarative index registry for the marketplace collections.
+
+Every query issued by the repositories and routers should be served by one of
+the indexes declared here. ``ensure_indexes`` builds whatever is missing and
+``index_drift`` compares the declared set with what the server actually has.
+"""
+import logging
+from typing import Dict, List
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ASCENDING, DESCENDING, IndexModel
+from pymongo.errors import OperationFailure
+
+from backend.utilities.models import ListingStatus
+
+logger = logging.getLogger(__name__)
+
+# Options that change index semantics and therefore count as drift
+_COMPARED_OPTIONS = ("unique", "sparse", "partialFilterExpression", "expireAfterSeconds")
+
+INDEXES: Dict[str, List[IndexModel]] = {
+    "Listings": [
+        # ItemRepository.get_items_by_seller_id
+        IndexModel([("seller_id", ASCENDING), ("created_at", DESCENDING)], name="seller_created"),
+        # ItemRepository.get_recent with a category, /search/ category filter.
+        # Keyset pages sort on (field, _id), so _id closes every sort index.
+        IndexModel([("category", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)], name="category_created"),
+        # ItemRepository.get_recent without a category, default /search/ sort
+        IndexModel([("created_at", DESCENDING), ("_id", DESCENDING)], name="created"),
+        # /search/ status filter combined with a price range or price sort
+        IndexModel([("status", ASCENDING), ("price", ASCENDING), ("_id", ASCENDING)], name="status_price"),
+        # /search/ price filters on the available catalog, which is most of the traffic
+        IndexModel(
+            [("price", ASCENDING)],
+            name="available_price",
+            partialFilterExpression={"status": ListingStatus.AVAILABLE.value},
+        ),
+        # text_search.sync_listing_index, listings edited since the last sync
+        IndexModel([("updated_at", ASCENDING)], name="updated", sparse=True),
+    ],
+    "reservations": [
+        # ReservationRepository.get/for_listing, one request per buyer and listing
+        IndexModel([("listing_id", ASCENDING), ("buyer_id", ASCENDING)], name="listing_buyer_unique", unique=True),
+        # ReservationRepository.for_buyer ("my requests")
+        IndexModel([("buyer_id", ASCENDING), ("requested_at", DESCENDING)], name="buyer_requested"),
+        # Finding expired pending requests
+        IndexModel([("status", ASCENDING), ("expires_at", ASCENDING)], name="status_expires"),
+    ],
+    "users": [
+        # UserRepository.get_user_by_email; unique so get_or_create_user's upsert
+        # cannot create a second account for an email
+        IndexModel([("email", ASCENDING)], name="email_unique", unique=True),
+    ],
+}
+
+
+def _normalize(spec: dict) -> dict:
+    """Reduce an index description to the parts that matter for comparison."""
+    key = spec["key"]
+    if hasattr(key, "items"):
+        key = key.items()
+    key = [(field, int(direction) if isinstance(direction, (int, float)) else direction)
+           for field, direction in key]
+    options = {name: spec[name] for name in _COMPARED_OPTIONS if name in spec}
+    return {"key": key, **options}
+
+
+async def index_drift(db: AsyncIOMotorDatabase) -> Dict[str, Dict[str, list]]:
+    """
+    Compare declared indexes with the indexes present on the server
+
+    Args:
+        db: Database to inspect
+
+    Returns:
+        Per collection: ``missing`` (declared, not built), ``extra`` (built,
+        not declared) and ``mismatched`` (same name, different definition)
+    """
+    report = {}
+    for collection_name, models in INDEXES.items():
+        actual = await db[collection_name].index_information()
+        actual.pop("_id_", None)
+
+        missing, mismatched = [], []
+        for model in models:
+            declared = model.document
+            name = declared["name"]
+            if name not in actual:
+                missing.append(name)
+            elif _normalize(declared) != _normalize(actual[name]):
+                mismatched.append(name)
+
+        declared_names = {model.document["name"] for model in models}
+        extra = sorted(name for name in actual if name not in declared_names)
+        report[collection_name] = {"missing": missing, "extra": extra, "mismatched": mismatched}
+    return report
+
+
+async def ensure_indexes(db: AsyncIOMotorDatabase) -> Dict[str, List[str]]:
+    """
+    Build every declared index that does not exist yet
+
+    Indexes are created one at a time so that a single failure (for example
+    duplicate emails blocking the unique index) does not stop the others.
+
+    Args:
+        db: Database to build indexes on
+
+    Returns:
+        Per collection, the names of the indexes that were created
+    """
+    drift = await index_drift(db)
+    created = {}
+    for collection_name, models in INDEXES.items():
+        missing = set(drift[collection_name]["missing"])
+        created[collection_name] = []
+        for model in models:
+            name = model.document["name"]
+            if name not in missing:
+                continue
+            options = {k: v for k, v in model.document.items() if k != "key"}
+            try:
+                await db[collection_name].create_index(
+                    list(model.document["key"].items()), background=True, **options
+                )
+                created[collection_name].append(name)
+            except OperationFailure as e:
+                logger.error(f"Failed to build index {collection_name}.{name}: {e}")
+
+        if drift[collection_name]["mismatched"]:
+            logger.warning(
+                f"Indexes on {collection_name} differ from their declaration: "
+                f"{drift[collection_name]['mismatched']}"
+            )
+    return created
@@ -0,0 +1,86 @@
+# backend/db/loaders.py
+"""
+Request-scoped batching loaders.
+
+A loader collects the ids requested during one event-loop tick, resolves them
+with a single query and memoizes the results for the rest of the request, so
+loops that look up one user per item cost one round trip instead of N.
+"""
+import asyncio
+from typing import Dict, Iterable, List, Optional
+
+from fastapi import Depends, Request
+
+from backend.db.database import get_database
+from backend.db.repository import UserRepository
+from backend.utilities.models import UserResponse
+
+
+class UserLoader:
+    def __init__(self, user_repo: UserRepository):
+        self.user_repo = user_repo
+        self._futures: Dict[str, asyncio.Future] = {}
+        self._pending: List[str] = []
+        # Held so the running batch is not garbage collected mid-query
+        self._pending_task: Optional[asyncio.Task] = None
+
+    async def load(self, user_id: str) -> Optional[UserResponse]:
+        """
+        Look a user up, batched with the other loads issued in this tick
+
+        Returns:
+            The user, or None if there is no such user
+
+        Raises:
+            Exception: Whatever the batch query raised, for every caller in the batch
+        """
+        user_id = str(user_id)
+        future = self._futures.get(user_id)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = loop.create_future()
+            self._futures[user_id] = future
+            self._pending.append(user_id)
+            if len(self._pending) == 1:
+                # Runs after everything already scheduled in this tick has had
+                # a chance to queue its ids
+                loop.call_soon(self._schedule_dispatch)
+        # Shielded: one caller giving up must not cancel the lookup for the others
+        return await asyncio.shield(future)
+
+    async def load_many(self, user_ids: Iterable[str]) -> List[Optional[UserResponse]]:
+        return list(await asyncio.gather(*(self.load(user_id) for user_id in user_ids)))
+
+    def _schedule_dispatch(self):
+        self._pending_task = asyncio.ensure_future(self._dispatch())
+
+    async def _dispatch(self):
+        batch, self._pending = self._pending, []
+        try:
+            if len(batch) == 1:
+                users = {batch[0]: await self.user_repo.get_user_by_id(batch[0])}
+            else:
+                users = await self.user_repo.get_users_by_ids(batch)
+        except Exception as e:
+            for user_id in batch:
+                # Forget failures so a later load can retry
+                self._futures.pop(user_id).set_exception(e)
+            return
+
+        for user_id in batch:
+            self._futures[user_id].set_result(users.get(user_id))
+
+
+def request_user_loader(request: Request, user_repo: UserRepository) -> UserLoader:
+    """
+    Return the loader attached to this request, creating it on first use
+    """
+    loader = getattr(request.state, "user_loader", None)
+    if loader is None:
+        loader = UserLoader(user_repo)
+        request.state.user_loader = loader
+    return loader
+
+
+def get_user_loader(request: Request, db = Depends(get_database)) -> UserLoader:
+    return request_user_loader(request, UserRepository(db))
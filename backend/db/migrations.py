@@ -0,0 +1,160 @@
+# backend/db/migrations.py
+"""
+Online data migrations.
+
+Each migration is idempotent and can be re-run while the application keeps
+serving traffic.
+"""
+import asyncio
+import logging
+from datetime import datetime, timezone
+
+from bson import ObjectId
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+
+from backend.utilities.dates import as_utc
+from backend.utilities.models import ReservationStatus
+
+logger = logging.getLogger(__name__)
+
+
+async def _flush_reservations(db: AsyncIOMotorDatabase, listings: list) -> int:
+    reservation_ops, listing_ops = [], []
+    for listing in listings:
+        for r in listing["reservation_requests"]:
+            reservation_ops.append(UpdateOne(
+                {"listing_id": listing["_id"], "buyer_id": ObjectId(str(r["buyer_id"]))},
+                {"$setOnInsert": {
+                    "requested_at": r.get("requested_at"),
+                    "expires_at": r.get("expires_at"),
+                    "status": r.get("status", ReservationStatus.PENDING)
+                }},
+                upsert=True
+            ))
+        # Only drop the embedded array if nobody appended to it meanwhile;
+        # a changed array is picked up again by the next run
+        listing_ops.append(UpdateOne(
+            {"_id": listing["_id"], "reservation_requests": listing["reservation_requests"]},
+            {"$unset": {"reservation_requests": ""}}
+        ))
+
+    if reservation_ops:
+        try:
+            await db.reservations.bulk_write(reservation_ops, ordered=False)
+        except BulkWriteError as e:
+            # A duplicate key means the application wrote the same request
+            # between our filter and the insert: it is already migrated
+            errors = e.details.get("writeErrors", [])
+            if any(error.get("code") != 11000 for error in errors):
+                raise
+            logger.info(f"{len(errors)} reservations were already written, skipping them")
+    result = await db.Listings.bulk_write(listing_ops, ordered=False)
+    return result.modified_count
+
+
+async def migrate_embedded_reservations(db: AsyncIOMotorDatabase, batch_size: int = 500) -> int:
+    """
+    Move embedded ``reservation_requests`` arrays into the reservations collection
+
+    Requests are upserted on (listing_id, buyer_id), so requests already
+    written by the new code path are never overwritten. Duplicate-key errors
+    from requests written concurrently are treated as already migrated; any
+    other write error stops the run before those listings are touched.
+
+    Args:
+        db: Database to migrate
+        batch_size: Number of listings written per bulk round trip
+
+    Returns:
+        Number of listings migrated
+    """
+    cursor = db.Listings.find(
+        {"reservation_requests": {"$exists": True}},
+        {"reservation_requests": 1}
+    ).batch_size(batch_size)
+
+    migrated = 0
+    batch = []
+    async for listing in cursor:
+        batch.append(listing)
+        if len(batch) >= batch_size:
+            migrated += await _flush_reservations(db, batch)
+            logger.info(f"Migrated reservations for {migrated} listings")
+            batch = []
+    if batch:
+        migrated += await _flush_reservations(db, batch)
+    return migrated
+
+
+async def migrate_reservation_timestamps(db: AsyncIOMotorDatabase, batch_size: int = 500, pause: float = 0.1) -> int:
+    """
+    Convert ISO string ``requested_at``/``expires_at`` on reservations to datetimes
+
+    Progress is checkpointed in the ``migrations`` collection after every
+    batch, so an interrupted run resumes where it stopped. Each update is
+    guarded on the old string value, a request rewritten by the application
+    in the meantime is left alone.
+
+    Args:
+        db: Database to migrate
+        batch_size: Number of reservations converted per bulk round trip
+        pause: Seconds to sleep between batches, to limit load on the primary
+
+    Returns:
+        Number of reservations converted
+    """
+    checkpoint_id = "reservation_timestamps"
+    checkpoint = await db.migrations.find_one({"_id": checkpoint_id}) or {}
+    last_id = checkpoint.get("last_id")
+    if last_id:
+        logger.info(f"Resuming reservation timestamp migration after {last_id}")
+
+    converted = 0
+    while True:
+        query = {"$or": [{"requested_at": {"$type": "string"}}, {"expires_at": {"$type": "string"}}]}
+        if last_id:
+            query["_id"] = {"$gt": last_id}
+        batch = await db.reservations.find(
+            query, {"requested_at": 1, "expires_at": 1}
+        ).sort("_id", 1).limit(batch_size).to_list(length=batch_size)
+        if not batch:
+            break
+
+        ops = []
+        for r in batch:
+            guard, update = {"_id": r["_id"]}, {}
+            for field in ("requested_at", "expires_at"):
+                if isinstance(r.get(field), str):
+                    try:
+                        update[field] = as_utc(r[field])
+                    except ValueError:
+                        logger.warning(f"Reservation {r['_id']} has an unparsable {field}: {r[field]!r}")
+                        continue
+                    guard[field] = r[field]
+            if update:
+                ops.append(UpdateOne(guard, {"$set": update}))
+
+        modified = 0
+        if ops:
+            result = await db.reservations.bulk_write(ops, ordered=False)
+            modified = result.modified_count
+        converted += modified
+        last_id = batch[-1]["_id"]
+        await db.migrations.update_one(
+            {"_id": checkpoint_id},
+            {"$set": {"last_id": last_id}, "$inc": {"converted": modified}},
+            upsert=True
+        )
+        logger.info(f"Converted timestamps on {converted} reservations")
+        if pause:
+            await asyncio.sleep(pause)
+
+    # A later run starts over, picking up anything written by old code meanwhile
+    await db.migrations.update_one(
+        {"_id": checkpoint_id},
+        {"$set": {"completed_at": datetime.now(timezone.utc)}, "$unset": {"last_id": ""}},
+        upsert=True
+    )
+    return converted
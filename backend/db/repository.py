@@ -1,18 +1,73 @@
+import asyncio
+import logging
 from motor.motor_asyncio import AsyncIOMotorDatabase
 from datetime import datetime, timezone, timedelta
-from typing import List, Optional
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence, Tuple
 from bson import ObjectId
-from pymongo import ASCENDING, DESCENDING
+from bson.raw_bson import RawBSONDocument
+from bson.errors import InvalidId
+from motor.motor_asyncio import AsyncIOMotorCollection
+from pymongo import ASCENDING, DESCENDING, ReturnDocument, UpdateOne
+from pymongo.errors import BulkWriteError, DuplicateKeyError
 
 from backend.utilities.models import (
-    UserCreate, UserResponse, ItemCreate, ItemResponse,
-    ReservationCreate, ReservationResponse, ListingStatus, SearchFilters, ItemCategory, ReservationStatus, MyRequestsResponse
+    UserCreate, UserResponse, ItemCreate, ItemResponse, ListingBulkUpdate,
+    ReservationCreate, ReservationResponse, ListingStatus, SearchFilters, ItemCategory, ReservationStatus, MyRequestsResponse,
+    ReservationOutcome
 )
+from backend.utilities.pagination import apply_cursor, encode_cursor, sort_spec
+from backend.utilities.dates import as_utc
+from backend.utilities.serialization import model_projection
+from backend.db.cache import MISSING, TTLCache, user_cache
+from backend.db.text_search import index_listing, unindex_listing
+from backend.db.stats import LISTING_STATS_FIELDS, MarketplaceStats
+from backend.db.featured import discard_featured
+from backend.db.facets import facet_cache
+
+if TYPE_CHECKING:
+    from backend.db.loaders import UserLoader
+
+logger = logging.getLogger(__name__)
+
+def item_projection(fields: Optional[Sequence[str]] = None, images_limit: Optional[int] = None) -> dict:
+    """
+    Projection for listings returned as ItemResponse
+
+    Args:
+        fields: Sparse fieldset from parse_fields, None for every ItemResponse field
+        images_limit: Return at most this many images per listing
+
+    Returns:
+        The Mongo projection
+    """
+    projection = model_projection(ItemResponse, fields)
+    if images_limit is not None and "images" in projection:
+        projection["images"] = {"$slice": images_limit}
+    return projection
+
+
+# Listing fields an ItemResponse is built from; tags, location and the rest stay on the server
+ITEM_PROJECTION = item_projection()
+
+
+def raw_documents(collection: AsyncIOMotorCollection) -> AsyncIOMotorCollection:
+    """
+    The same collection returning RawBSONDocument
+
+    Raw documents keep the BSON bytes and decode on first access, which
+    skips building a dict for every document of a page that is only
+    encoded to JSON. They are read-only.
+    """
+    return collection.with_options(
+        codec_options=collection.codec_options.with_options(document_class=RawBSONDocument)
+    )
 
 class UserRepository:
-    def __init__(self, db: AsyncIOMotorDatabase):
+    def __init__(self, db: AsyncIOMotorDatabase, cache: TTLCache = user_cache):
         self.db = db
         self.collection = db.users
+        # Shared across requests; see backend.db.cache
+        self.cache = cache
 
     async def create_user(self, user: UserCreate) -> UserResponse:
         user_dict = user.model_dump()
@@ -21,16 +76,77 @@ class UserRepository:
         
         result = await self.collection.insert_one(user_dict)
         user_dict["id"] = str(result.inserted_id)
-        return UserResponse(**user_dict)
+        created = UserResponse(**user_dict)
+        self.cache.set(("id", created.id), created)
+        self.cache.set(("email", created.email), created.id)
+        return created
+
+    async def get_or_create_user(self, user: UserCreate) -> UserResponse:
+        """
+        The user with this email, created from ``user`` if there is none
+
+        A single upsert: ``$setOnInsert`` only writes on creation, so an
+        existing account is returned unchanged. Concurrent logins for a new
+        email race on the unique email index; the loser gets a
+        DuplicateKeyError and its retry matches the winner's document.
+
+        Args:
+            user: Email and name for a new account
+
+        Returns:
+            The existing or new user
+        """
+        user_id = self.cache.get(("email", user.email))
+        if user_id is not MISSING:
+            cached = await self.get_user_by_id(user_id)
+            if cached is not None:
+                return cached
+
+        new_user = user.model_dump(exclude={"email"})
+        new_user["created_at"] = datetime.utcnow()
+        new_user["listings"] = []
+        for attempt in range(2):
+            try:
+                doc = await self.collection.find_one_and_update(
+                    {"email": user.email},
+                    {"$setOnInsert": new_user},
+                    upsert=True,
+                    return_document=ReturnDocument.AFTER
+                )
+                break
+            except DuplicateKeyError:
+                if attempt:
+                    raise
+
+        doc["id"] = str(doc["_id"])
+        doc.setdefault("phone", None)
+        doc.setdefault("listings", [])
+        response = UserResponse(**doc)
+        self.cache.set(("id", response.id), response)
+        self.cache.set(("email", response.email), response.id)
+        return response
 
     async def get_user_by_email(self, email: str) -> Optional[UserResponse]:
+        # Only hits are cached by email: a cached "no such user" could let a
+        # login on another worker create the same account twice
+        user_id = self.cache.get(("email", email))
+        if user_id is not MISSING:
+            return await self.get_user_by_id(user_id)
+
         user = await self.collection.find_one({"email": email})
         if user:
             user["id"] = str(user["_id"])
-            return UserResponse(**user)
+            response = UserResponse(**user)
+            self.cache.set(("id", response.id), response)
+            self.cache.set(("email", email), response.id)
+            return response
         return None
 
     async def get_user_by_id(self, user_id: str) -> Optional[UserResponse]:
+        cached = self.cache.get(("id", user_id))
+        if cached is not MISSING:
+            return cached
+
         try:
             user = await self.collection.find_one({"_id": ObjectId(user_id)})
             if user:
@@ -40,13 +156,50 @@ class UserRepository:
                     user["phone"] = None
                 if "listings" not in user:
                     user["listings"] = []
-                return UserResponse(**user)
-            return None
+                response = UserResponse(**user)
+            else:
+                response = None
         except Exception as e:
             # Handle invalid ObjectId or other database errors
-            print(f"Error getting user by ID: {str(e)}")
+            logger.warning(f"Error getting user by ID {user_id}: {e}")
             return None
 
+        # Unknown ids are cached too, with a shorter TTL
+        self.cache.set(("id", user_id), response)
+        return response
+
+    async def get_users_by_ids(self, user_ids: List[str]) -> Dict[str, UserResponse]:
+        """
+        Fetch several users in one query
+
+        Args:
+            user_ids: IDs of the users, invalid ones are ignored
+
+        Returns:
+            Users keyed by ID, unknown IDs are left out
+        """
+        users = {}
+        missing = []
+        for user_id in user_ids:
+            cached = self.cache.get(("id", user_id))
+            if cached is MISSING:
+                if ObjectId.is_valid(user_id):
+                    missing.append(user_id)
+            elif cached is not None:
+                users[user_id] = cached
+        if not missing:
+            return users
+
+        async for user in self.collection.find({"_id": {"$in": [ObjectId(user_id) for user_id in missing]}}):
+            user["id"] = str(user["_id"])
+            user.setdefault("phone", None)
+            user.setdefault("listings", [])
+            users[user["id"]] = UserResponse(**user)
+
+        for user_id in missing:
+            self.cache.set(("id", user_id), users.get(user_id))
+        return users
+
     async def update_phone(self, user_id: str, phone_number: str) -> bool:
         """
         Update user's phone number
@@ -63,15 +216,137 @@ class UserRepository:
                 {"_id": ObjectId(user_id)},
                 {"$set": {"phone": phone_number}}
             )
+            self.cache.invalidate(("id", user_id))
             return result.modified_count > 0
         except Exception as e:
-            print(f"Error updating phone number: {str(e)}")
+            logger.warning(f"Error updating phone number for {user_id}: {e}")
             return False
 
+class ReservationRepository:
+    """
+    Reservation requests, one document per (listing, buyer) pair.
+
+    Kept out of the listing documents so listing reads stay constant-size
+    and a buyer's requests are an indexed lookup.
+    """
+    def __init__(self, db: AsyncIOMotorDatabase):
+        self.db = db
+        self.collection = db.reservations
+
+    async def create(self, listing_id: ObjectId, buyer_id: ObjectId) -> bool:
+        """
+        Insert a pending request, False if the buyer already has one on the listing
+        """
+        now = datetime.now(timezone.utc)
+        try:
+            result = await self.collection.update_one(
+                {"listing_id": listing_id, "buyer_id": buyer_id},
+                {"$setOnInsert": {
+                    "requested_at": now,
+                    "expires_at": now + timedelta(days=7),
+                    "status": ReservationStatus.PENDING
+                }},
+                upsert=True
+            )
+        except DuplicateKeyError:
+            # Lost a race with a concurrent upsert for the same pair
+            return False
+        return result.upserted_id is not None
+
+    async def get(self, listing_id: ObjectId, buyer_id: ObjectId) -> Optional[dict]:
+        return await self.collection.find_one({"listing_id": listing_id, "buyer_id": buyer_id})
+
+    async def set_status(
+        self,
+        listing_id: ObjectId,
+        buyer_id: ObjectId,
+        new_status: ReservationStatus,
+        current_status: ReservationStatus
+    ) -> bool:
+        result = await self.collection.update_one(
+            {"listing_id": listing_id, "buyer_id": buyer_id, "status": current_status},
+            {"$set": {"status": new_status}}
+        )
+        return result.modified_count > 0
+
+    async def delete(self, listing_id: ObjectId, buyer_id: ObjectId) -> Optional[dict]:
+        return await self.collection.find_one_and_delete({"listing_id": listing_id, "buyer_id": buyer_id})
+
+    async def delete_many(self, listing_id: ObjectId, reservation_ids: Optional[List[ObjectId]] = None) -> int:
+        """
+        Delete the given requests on a listing, or all of them when no ids are given
+        """
+        query = {"listing_id": listing_id}
+        if reservation_ids is not None:
+            query["_id"] = {"$in": reservation_ids}
+        result = await self.collection.delete_many(query)
+        return result.deleted_count
+
+    async def extend_pending(self, listing_id: ObjectId, expires_at: datetime) -> int:
+        result = await self.collection.update_many(
+            {"listing_id": listing_id, "status": ReservationStatus.PENDING},
+            {"$set": {"expires_at": expires_at}}
+        )
+        return result.modified_count
+
+    async def for_listing(self, listing_id: ObjectId, live_at: Optional[datetime] = None) -> List[dict]:
+        """
+        Requests on a listing, oldest first
+
+        Args:
+            listing_id: Listing to look up
+            live_at: Only return requests that have not expired at this time
+        """
+        query = {"listing_id": listing_id}
+        if live_at is not None:
+            # Unmigrated ISO string timestamps can't be compared server-side,
+            # they are passed through for the caller to check
+            query["$or"] = [{"expires_at": {"$gt": live_at}}, {"expires_at": {"$type": "string"}}]
+        cursor = self.collection.find(query).sort("requested_at", ASCENDING)
+        return [doc async for doc in cursor]
+
+    async def find_expired(self, now: datetime, limit: int) -> List[dict]:
+        """
+        Oldest expired pending requests, served by the status_expires index
+        """
+        cursor = self.collection.find(
+            {"status": ReservationStatus.PENDING, "expires_at": {"$lte": now}},
+            {"listing_id": 1}
+        ).sort("expires_at", ASCENDING).limit(limit)
+        return [doc async for doc in cursor]
+
+    async def delete_expired(self, listing_id: ObjectId, reservation_ids: List[ObjectId], now: datetime) -> int:
+        """
+        Delete the given requests if they are still pending and expired
+
+        A request confirmed or extended since it was found is kept.
+        """
+        result = await self.collection.delete_many({
+            "_id": {"$in": reservation_ids},
+            "listing_id": listing_id,
+            "status": ReservationStatus.PENDING,
+            "expires_at": {"$lte": now}
+        })
+        return result.deleted_count
+
+    async def count_by_status(self, listing_id: ObjectId) -> Dict[str, int]:
+        cursor = self.collection.aggregate([
+            {"$match": {"listing_id": listing_id}},
+            {"$group": {"_id": "$status", "count": {"$sum": 1}}}
+        ])
+        return {group["_id"]: group["count"] async for group in cursor}
+
+    async def for_buyer(self, buyer_id: ObjectId) -> List[dict]:
+        cursor = self.collection.find({"buyer_id": buyer_id}).sort("requested_at", DESCENDING)
+        return [doc async for doc in cursor]
+
 class ItemRepository:
     def __init__(self, db: AsyncIOMotorDatabase):
         self.db = db
         self.collection = db.Listings
+        self.raw = raw_documents(db.Listings)
+        self.reservations = ReservationRepository(db)
+        self.stats = MarketplaceStats(db)
 
     async def create_item(self, item: ItemCreate, seller_id: str) -> ItemResponse:
         item_dict = item.model_dump()
@@ -79,16 +354,24 @@ class ItemRepository:
         item_dict["created_at"] = datetime.now(timezone.utc)
         item_dict["status"] = ListingStatus.AVAILABLE
         item_dict["reservation_count"] = 0
-        item_dict["reservation_requests"] = []  # Initialize empty array
         
         result = await self.collection.insert_one(item_dict)
+        index_listing(item_dict)
+        await self._listing_changed(None, item_dict)
         item_dict["id"] = str(result.inserted_id)
         item_dict["seller_id"] = str(item_dict["seller_id"])
         return ItemResponse(**item_dict)
 
+    async def find_item(self, item_id: str) -> Optional[RawBSONDocument]:
+        """
+        Get the ItemResponse fields of a listing as a raw document, for routes that encode it directly
+        """
+        return await self.raw.find_one({"_id": ObjectId(item_id)}, ITEM_PROJECTION)
+
     async def get_item(self, item_id: str) -> Optional[ItemResponse]:
-        item = await self.collection.find_one({"_id": ObjectId(item_id)})
-        if item:
+        raw = await self.find_item(item_id)
+        if raw:
+            item = dict(raw)
             item["id"] = str(item["_id"])
             item["seller_id"] = str(item["seller_id"])
             
@@ -101,12 +384,16 @@ class ItemRepository:
 
     async def update_item(self, item_id: str, item_update: dict) -> Optional[ItemResponse]:
         item_update["updated_at"] = datetime.now(timezone.utc)
-        result = await self.collection.find_one_and_update(
+        before = await self.collection.find_one_and_update(
             {"_id": ObjectId(item_id)},
             {"$set": item_update},
-            return_document=True
+            return_document=ReturnDocument.BEFORE
         )
-        if result:
+        if before:
+            # The stats need the old status and category, the rest is a plain $set
+            result = {**before, **item_update}
+            await self._listing_changed(before, result)
+            index_listing(result)
             result["id"] = str(result["_id"])
             result["seller_id"] = str(result["seller_id"])
             
@@ -118,12 +405,14 @@ class ItemRepository:
         return None
     
     async def update_status(self, item_id: str, new_status: ListingStatus) -> Optional[ItemResponse]:
-        result = await self.collection.find_one_and_update(
+        before = await self.collection.find_one_and_update(
             {"_id": ObjectId(item_id)},
             {"$set": {"status": new_status}},
-            return_document=True
+            return_document=ReturnDocument.BEFORE
         )
-        if result:
+        if before:
+            result = {**before, "status": new_status}
+            await self._listing_changed(before, result)
             result["id"] = str(result["_id"])
             result["seller_id"] = str(result["seller_id"])
             
@@ -135,14 +424,137 @@ class ItemRepository:
         return None
 
     async def delete_item(self, item_id: str) -> bool:
-        result = await self.collection.delete_one({"_id": ObjectId(item_id)})
-        return result.deleted_count > 0
+        deleted = await self.collection.find_one_and_delete(
+            {"_id": ObjectId(item_id)}, projection=LISTING_STATS_FIELDS
+        )
+        if deleted:
+            unindex_listing(item_id)
+            await self._listing_changed(deleted, None)
+            await self._delete_reservations(ObjectId(item_id))
+        return deleted is not None
+
+    async def _listing_changed(self, before: Optional[dict], after: Optional[dict]):
+        await self._listings_changed([(before, after)])
+
+    async def _listings_changed(self, changes: List[Tuple[Optional[dict], Optional[dict]]]):
+        await self.stats.listings_changed(changes)
+        facet_cache.invalidate()
+        for before, after in changes:
+            if before and (after is None or after.get("status") != ListingStatus.AVAILABLE):
+                discard_featured(str(before["_id"]))
+
+    async def create_items(self, items: List[ItemCreate], seller_id: str) -> List[Tuple[str, Optional[str]]]:
+        """
+        Insert many listings with one unordered insert_many
+
+        A failed document does not stop the others.
+
+        Args:
+            items: Validated listings
+            seller_id: The seller of all of them
+
+        Returns:
+            (listing id, error message or None) per item, in order
+        """
+        now = datetime.now(timezone.utc)
+        docs = []
+        for item in items:
+            item_dict = item.model_dump()
+            item_dict["_id"] = ObjectId()
+            item_dict["seller_id"] = ObjectId(seller_id)
+            item_dict["created_at"] = now
+            item_dict["status"] = ListingStatus.AVAILABLE
+            item_dict["reservation_count"] = 0
+            docs.append(item_dict)
+        if not docs:
+            return []
+
+        errors: Dict[int, str] = {}
+        try:
+            await self.collection.insert_many(docs, ordered=False)
+        except BulkWriteError as e:
+            errors = {error["index"]: error["errmsg"] for error in e.details.get("writeErrors", [])}
+
+        inserted = [doc for i, doc in enumerate(docs) if i not in errors]
+        for doc in inserted:
+            index_listing(doc)
+        await self._listings_changed([(None, doc) for doc in inserted])
+        return [(str(doc["_id"]), errors.get(i)) for i, doc in enumerate(docs)]
+
+    async def update_items(self, updates: List[ListingBulkUpdate], seller_id: str) -> List[Optional[str]]:
+        """
+        Apply status/price updates to a seller's listings with one unordered bulk_write
+
+        Args:
+            updates: One row per listing
+            seller_id: Only this seller's listings are updated
+
+        Returns:
+            An error message or None per row, in order
+        """
+        seller_oid = ObjectId(seller_id)
+        errors: List[Optional[str]] = [None] * len(updates)
+        changes: Dict[int, dict] = {}
+        for i, update in enumerate(updates):
+            fields = update.model_dump(exclude_unset=True, exclude={"id"})
+            if not fields:
+                errors[i] = "Nothing to update"
+            elif not ObjectId.is_valid(update.id):
+                errors[i] = "Invalid id"
+            else:
+                changes[i] = fields
+        if not changes:
+            return errors
+
+        # The stats need each listing's previous status
+        ids = {ObjectId(updates[i].id) for i in changes}
+        cursor = self.collection.find({"_id": {"$in": list(ids)}, "seller_id": seller_oid}, LISTING_STATS_FIELDS)
+        before = {doc["_id"]: doc async for doc in cursor}
+
+        now = datetime.now(timezone.utc)
+        ops, applied = [], []
+        for i, fields in changes.items():
+            oid = ObjectId(updates[i].id)
+            if oid not in before:
+                errors[i] = "Listing not found"
+                continue
+            fields["updated_at"] = now
+            ops.append(UpdateOne({"_id": oid, "seller_id": seller_oid}, {"$set": fields}))
+            applied.append(i)
+        if not ops:
+            return errors
+
+        try:
+            await self.collection.bulk_write(ops, ordered=False)
+        except BulkWriteError as e:
+            for error in e.details.get("writeErrors", []):
+                errors[applied[error["index"]]] = error["errmsg"]
+
+        # Text fields are untouched, so the search index needs no refresh
+        listing_changes = []
+        for i in applied:
+            if errors[i] is None:
+                previous = before[ObjectId(updates[i].id)]
+                # Later rows for the same listing start from this one's result
+                current = {**previous, **changes[i]}
+                before[previous["_id"]] = current
+                listing_changes.append((previous, current))
+        await self._listings_changed(listing_changes)
+        return errors
+
+    async def _delete_reservations(self, listing_oid: ObjectId):
+        counts = await self.reservations.count_by_status(listing_oid)
+        await self.reservations.delete_many(listing_oid)
+        await self.stats.reservations_changed({status: -count for status, count in counts.items()})
     
+    async def find_items_by_seller_id(self, seller_id: str) -> List[RawBSONDocument]:
+        cursor = self.raw.find({"seller_id": ObjectId(seller_id)}, ITEM_PROJECTION)
+        return [doc async for doc in cursor]
+
     async def get_items_by_seller_id(self, seller_id: str) -> List[ItemResponse]:
-        count = await self.db.Listings.count_documents({})
-        cursor = self.collection.find({"seller_id": ObjectId(seller_id)})
         listings = []
-        async for doc in cursor:
+        for raw in await self.find_items_by_seller_id(seller_id):
+            doc = dict(raw)
             doc["id"] = str(doc["_id"])
             doc["seller_id"] = str(doc["seller_id"])
             
@@ -154,20 +566,19 @@ class ItemRepository:
         return listings
     
     async def get_recent(self, limit: int = 10, category: Optional[ItemCategory] = None) -> List[ItemResponse]:
-        query = {}
-
-        if category:
-            query["category"] = category
-
-        cursor = (
-            self.collection
-            .find(query)
-            .sort("created_at", -1)  # descending order
-            .limit(limit)
-        )
+        listings, _ = await self.get_recent_page(limit, category)
+        return listings
 
+    async def get_recent_page(
+        self,
+        limit: int = 10,
+        category: Optional[ItemCategory] = None,
+        cursor: Optional[str] = None
+    ) -> Tuple[List[ItemResponse], Optional[str]]:
+        docs, next_cursor = await self.find_recent_page(limit, category, cursor)
         listings = []
-        async for doc in cursor:
+        for raw in docs:
+            doc = dict(raw)
             doc["id"] = str(doc["_id"])
             doc["seller_id"] = str(doc["seller_id"])
             
@@ -177,223 +588,249 @@ class ItemRepository:
                 
             listings.append(ItemResponse(**doc))
 
-        return listings
+        return listings, next_cursor
 
-    async def add_reservation_request(self, listing_id: str, buyer_id: str) -> bool:
-        print(f"Adding reservation request: listing={listing_id}, buyer={buyer_id}")
-        now = datetime.now(timezone.utc)
+    async def find_recent_page(
+        self,
+        limit: int = 10,
+        category: Optional[ItemCategory] = None,
+        cursor: Optional[str] = None,
+        projection: dict = ITEM_PROJECTION
+    ) -> Tuple[List[RawBSONDocument], Optional[str]]:
+        """
+        Get a page of the most recent listings as raw documents
 
-        # Check if the user already has a reservation request for this listing
-        listing = await self.collection.find_one({"_id": ObjectId(listing_id)})
-        if not listing:
-            print("Listing not found")
-            return False
-            
-        # Initialize reservation_requests if it doesn't exist
-        reservation_requests = listing.get("reservation_requests", [])
-        
-        # Check for duplicate requests
-        for r in reservation_requests:
-            stored_buyer_id = str(r["buyer_id"]) if isinstance(r["buyer_id"], ObjectId) else r["buyer_id"]
-            if stored_buyer_id == str(buyer_id):
-                print(f"Request already exists for buyer {buyer_id}")
-                return False  # Already exists
-
-        # Create the new reservation entry
-        reservation_entry = {
-            "buyer_id": ObjectId(buyer_id),
-            "requested_at": now.isoformat(),
-            "expires_at": (now + timedelta(days=7)).isoformat(),
-            "status": ReservationStatus.PENDING
-        }
-        
-        # Determine the current count for increment
-        current_count = listing.get("reservation_count", 0)
-        
-        # Update the listing with the new request
-        result = await self.collection.update_one(
-            {"_id": ObjectId(listing_id)},
-            {
-                "$push": {"reservation_requests": reservation_entry},
-                "$set": {"reservation_count": current_count + 1}
-            }
+        Args:
+            limit: Page size
+            category: Filter by category
+            cursor: Continuation token from the previous page
+            projection: Fields to read, see item_projection
+
+        Returns:
+            The listing documents and the cursor for the next page (None on the last page)
+
+        Raises:
+            ValueError: If the cursor is invalid
+        """
+        query = {}
+
+        if category:
+            query["category"] = category
+
+        query = apply_cursor(query, "created_at", DESCENDING, cursor)
+        db_cursor = (
+            self.raw
+            .find(query, {**projection, "created_at": 1})  # the cursor needs created_at
+            .sort(sort_spec("created_at", DESCENDING))  # descending order, _id breaks ties
+            .limit(limit + 1)  # one extra to know whether there is a next page
         )
-        
-        print(f"Added reservation request: modified_count={result.modified_count}")
-        return result.modified_count > 0
 
-    async def confirm_reservation(self, listing_id: str, buyer_id: str) -> bool:
-        print(f"Confirming reservation: listing={listing_id}, buyer={buyer_id}")
-        
-        # Get the current listing
-        listing = await self.collection.find_one({"_id": ObjectId(listing_id)})
-        if not listing:
-            print("Listing not found")
-            return False
+        docs = [doc async for doc in db_cursor]
+        next_cursor = None
+        if len(docs) > limit:
+            docs = docs[:limit]
+            next_cursor = encode_cursor("created_at", DESCENDING, docs[-1])
 
-        updated_requests = []
-        found = False
-        
-        # Convert buyer_id to ObjectId if it's not already
+        return docs, next_cursor
+
+    async def add_reservation_request(self, listing_id: str, buyer_id: str) -> ReservationOutcome:
+        logger.debug(f"Adding reservation request: listing={listing_id}, buyer={buyer_id}")
         try:
-            buyer_obj_id = ObjectId(buyer_id)
-        except:
-            print(f"Invalid buyer_id format: {buyer_id}")
-            return False
+            listing_oid, buyer_oid = ObjectId(listing_id), ObjectId(buyer_id)
+        except InvalidId:
+            return ReservationOutcome.NOT_FOUND
 
-        # Check if we have any reservation requests
-        if not listing.get("reservation_requests"):
-            return False
-        else:
-            # Process existing requests
-            for r in listing.get("reservation_requests", []):
-                # Convert stored buyer_id to string for comparison
-                r_buyer_id = str(r["buyer_id"])
-                if r_buyer_id == buyer_id:
-                    print(f"Found matching request for buyer {buyer_id}")
-                    r["status"] = "confirmed"
-                    found = True
-                updated_requests.append(r)
-
-        if not found:
-            print(f"No matching reservation request found for buyer {buyer_id}")
-            # If we didn't find the buyer return error
-            return False
+        # The unique (listing_id, buyer_id) index rejects duplicates even when they race
+        if not await self.reservations.create(listing_oid, buyer_oid):
+            return ReservationOutcome.DUPLICATE
 
-        # Update the listing with the new status and reservation data
         result = await self.collection.update_one(
-            {"_id": ObjectId(listing_id)},
-            {
-                "$set": {
-                    "status": "reserved",
-                    "buyerId": str(buyer_obj_id),
-                    "reservation_requests": updated_requests,
-                    "reservation_count": len(updated_requests)
-                }
-            }
+            {"_id": listing_oid, "status": {"$ne": ListingStatus.SOLD}},
+            {"$inc": {"reservation_count": 1}}
         )
-        print(f"Updated listing result: modified_count={result.modified_count}")
-        return result.modified_count > 0
+        if result.modified_count > 0:
+            await self.stats.reservations_changed({ReservationStatus.PENDING: 1})
+            return ReservationOutcome.CREATED
+
+        # Listing is missing or sold, take the request back out
+        await self.reservations.delete(listing_oid, buyer_oid)
+        if await self.collection.find_one({"_id": listing_oid}, {"_id": 1}):
+            return ReservationOutcome.CONFLICT
+        return ReservationOutcome.NOT_FOUND
+
+    async def confirm_reservation(self, listing_id: str, buyer_id: str) -> ReservationOutcome:
+        logger.debug(f"Confirming reservation: listing={listing_id}, buyer={buyer_id}")
+        try:
+            listing_oid, buyer_oid = ObjectId(listing_id), ObjectId(buyer_id)
+        except InvalidId:
+            logger.debug(f"Invalid id format: listing={listing_id}, buyer={buyer_id}")
+            return ReservationOutcome.NOT_FOUND
 
-    async def get_reservations(self, listing_id: str, user_repo: UserRepository) -> Optional[List[dict]]:
-        listing = await self.collection.find_one({"_id": ObjectId(listing_id)})
+        confirmed = await self.reservations.set_status(
+            listing_oid, buyer_oid, ReservationStatus.CONFIRMED, ReservationStatus.PENDING
+        )
+        if not confirmed:
+            # An already confirmed request means the listing is taken
+            if await self.reservations.get(listing_oid, buyer_oid):
+                return ReservationOutcome.CONFLICT
+            return ReservationOutcome.NOT_FOUND
+
+        # Only an available listing can be reserved, so two sellers' tabs
+        # confirming different buyers cannot both win
+        before = await self.collection.find_one_and_update(
+            {"_id": listing_oid, "status": ListingStatus.AVAILABLE},
+            {"$set": {"status": ListingStatus.RESERVED, "buyerId": str(buyer_oid)}},
+            projection=LISTING_STATS_FIELDS
+        )
+        if before:
+            await self._listing_changed(before, {**before, "status": ListingStatus.RESERVED})
+            await self.stats.reservations_changed({ReservationStatus.PENDING: -1, ReservationStatus.CONFIRMED: 1})
+            return ReservationOutcome.CONFIRMED
+
+        await self.reservations.set_status(
+            listing_oid, buyer_oid, ReservationStatus.PENDING, ReservationStatus.CONFIRMED
+        )
+        if await self.collection.find_one({"_id": listing_oid}, {"_id": 1}):
+            return ReservationOutcome.CONFLICT
+        return ReservationOutcome.NOT_FOUND
+
+    async def get_reservations(self, listing_id: str, users: "UserLoader") -> Optional[List[dict]]:
+        try:
+            listing_oid = ObjectId(listing_id)
+        except InvalidId:
+            return []
+        listing = await self.collection.find_one({"_id": listing_oid}, {"status": 1, "buyerId": 1})
         if not listing:
-            print("Listing not found")
+            logger.debug(f"Reservations for unknown listing {listing_id}")
             return []  # Return empty list instead of None
 
         now = datetime.now(timezone.utc)
         valid_reservations = []
-        updated_requests = []
 
         # Safely interpret listing status as Enum
         listing_status = listing.get("status")
         if listing_status:
             listing_status = ListingStatus(listing_status)
-        
-        # Debug the listing data
-        print(f"Listing ID: {listing_id}, Status: {listing_status}")
-        print(f"Reservation count: {listing.get('reservation_count', 0)}")
-        print(f"Reservation requests: {listing.get('reservation_requests', [])}")
-        print(f"Buyer ID: {listing.get('buyerId')}")
+
+        logger.debug(f"Listing ID: {listing_id}, Status: {listing_status}, Buyer ID: {listing.get('buyerId')}")
 
         # If listing is reserved and has a confirmed buyer
         if listing_status == ListingStatus.RESERVED and listing.get("buyerId"):
             buyer_id = listing["buyerId"]
-            print(f"Processing confirmed reservation for buyer: {buyer_id}")
+            logger.debug(f"Processing confirmed reservation for buyer: {buyer_id}")
 
-            # Use the UserRepository to get the user instance
-            user = await user_repo.get_user_by_id(str(buyer_id))
+            # Look the buyer up while the reservation is being fetched
+            user, r = await asyncio.gather(
+                users.load(str(buyer_id)),
+                self.reservations.get(listing_oid, ObjectId(str(buyer_id)))
+            )
             buyer_phone = user.phone if user else None
 
-            # Check if there's a reservation request for this buyer
-            found_request = False
-            for r in listing.get("reservation_requests", []):
-                if str(r["buyer_id"]) == str(buyer_id):
-                    found_request = True
-                    valid_reservations.append({
-                        "buyer_id": str(r["buyer_id"]),
-                        "requested_at": datetime.fromisoformat(r["requested_at"]),
-                        "expires_at": datetime.fromisoformat(r["expires_at"]),
-                        "status": "confirmed",
-                        "buyer_phone": buyer_phone
-                    })
-                    break  # Only one confirmed reservation
+            if r:
+                valid_reservations.append({
+                    "buyer_id": str(r["buyer_id"]),
+                    "requested_at": as_utc(r["requested_at"]),
+                    "expires_at": as_utc(r["expires_at"]),
+                    "status": "confirmed",
+                    "buyer_phone": buyer_phone
+                })
         else:
-            # Listing is available — return pending reservations
-            for r in listing.get("reservation_requests", []):
-                expires_at = datetime.fromisoformat(r["expires_at"])
+            # Listing is available — return pending reservations. Expired
+            # ones are filtered out by the query and removed by the sweeper.
+            for r in await self.reservations.for_listing(listing_oid, live_at=now):
+                expires_at = as_utc(r["expires_at"])
                 if now < expires_at:
                     valid_reservations.append({
                         "buyer_id": str(r["buyer_id"]),
-                        "requested_at": datetime.fromisoformat(r["requested_at"]),
+                        "requested_at": as_utc(r["requested_at"]),
                         "expires_at": expires_at,
                         "status": "pending"
                     })
-                    updated_requests.append(r)
-
-            # Clean expired reservations
-            if len(updated_requests) != len(listing.get("reservation_requests", [])):
-                await self.collection.update_one(
-                    {"_id": ObjectId(listing_id)},
-                    {"$set": {"reservation_requests": updated_requests,
-                              "reservation_count": len(updated_requests)}
-                    }
-                )
 
         return valid_reservations
 
-    async def cancel_reservation(self, listing_id: str, buyer_id: str) -> bool:       
-        listing = await self.collection.find_one({"_id": ObjectId(listing_id)})
+    async def cancel_reservation(self, listing_id: str, buyer_id: str) -> ReservationOutcome:
+        """
+        Cancel a buyer's reservation request (initiated by buyer or seller).
+
+        Cancelling the confirmed buyer reopens the listing and gives the
+        remaining requests a fresh 7 day window.
+        """
+        try:
+            listing_oid, buyer_oid = ObjectId(listing_id), ObjectId(buyer_id)
+        except InvalidId:
+            return ReservationOutcome.NOT_FOUND
+
+        reservation = await self.reservations.delete(listing_oid, buyer_oid)
+        if not reservation:
+            return ReservationOutcome.NOT_FOUND
+        await self.stats.reservations_changed({reservation["status"]: -1})
+
+        reopen = {"$in": ["$buyerId", [buyer_oid, str(buyer_oid)]]}
+        listing = await self.collection.find_one_and_update(
+            {"_id": listing_oid},
+            [{
+                "$set": {
+                    "status": {"$cond": [reopen, ListingStatus.AVAILABLE.value, "$status"]},
+                    "buyerId": {"$cond": [reopen, None, "$buyerId"]},
+                    "reservation_count": {"$max": [0, {"$subtract": [{"$ifNull": ["$reservation_count", 1]}, 1]}]}
+                }
+            }],
+            projection={"buyerId": 1, **LISTING_STATS_FIELDS},
+            return_document=ReturnDocument.BEFORE
+        )
         if not listing:
-            return False
+            return ReservationOutcome.NOT_FOUND
 
-        # Safely interpret listing status as Enum
-        listing_status = listing.get("status")
-        if listing_status:
-            listing_status = ListingStatus(listing_status)
+        if str(listing.get("buyerId")) == str(buyer_oid):
+            await self._listing_changed(listing, {**listing, "status": ListingStatus.AVAILABLE})
+            new_expiration = datetime.now(timezone.utc) + timedelta(days=7)
+            await self.reservations.extend_pending(listing_oid, new_expiration)
+        return ReservationOutcome.CANCELLED
 
-        requests = listing.get("reservation_requests", [])
-        
-        # if buyer never requested, fail early
-        if not any(str(r["buyer_id"]) == buyer_id for r in requests):
-            return False
-        
-        # For available listing, just delete the reservation (doesn't matter who initiated the cancellation)
-        if listing_status == ListingStatus.AVAILABLE:
-            result = await self.collection.update_one(
-                {"_id": ObjectId(listing_id)},
-                {
-                "$pull": {"reservation_requests": {"buyer_id": ObjectId(buyer_id)}},
-                "$inc": {"reservation_count": -1}
-                }
-            )
-            return result.modified_count > 0
-        else:
-        # In case of reserved listing (change expiration date of the reservations left)
-            now = datetime.now(timezone.utc)
-            new_expiration = (now + timedelta(days=7)).isoformat()
-
-            updated_requests = []
-            request_exists = False
-            for r in requests:
-                if str(r["buyer_id"]) == buyer_id:
-                    request_exists = True
-                    continue
-                r["expires_at"] = new_expiration
-                updated_requests.append(r)
+    async def expire_reservations(self, batch_size: int = 500, concurrency: int = 10) -> int:
+        """
+        Remove expired pending requests and fix up the listings' counters
 
-            result = await self.collection.update_one(
-                {"_id": ObjectId(listing_id)},
-                {
-                    "$set": {
-                        "status": "available",
-                        "buyerId": None,
-                        "reservation_requests": updated_requests
-                    },
-                    "$inc": {"reservation_count": -1}
-                }
-            )
-            return result.modified_count > 0 and request_exists
+        Works through at most one batch per call; the background sweeper
+        calls it repeatedly.
+
+        Args:
+            batch_size: Requests removed per call
+            concurrency: Listings whose requests are deleted at the same time
+
+        Returns:
+            Number of requests removed
+        """
+        now = datetime.now(timezone.utc)
+        expired = await self.reservations.find_expired(now, batch_size)
+        if not expired:
+            return 0
+
+        by_listing: Dict[ObjectId, List[ObjectId]] = {}
+        for r in expired:
+            by_listing.setdefault(r["listing_id"], []).append(r["_id"])
+
+        # Per listing deletes, so each counter is decremented by exactly what
+        # this sweep removed and not what a concurrent cancel already did.
+        # They run concurrently, bounded so the sweep leaves connections for requests
+        limit = asyncio.Semaphore(concurrency)
+
+        async def delete(listing_oid: ObjectId, reservation_ids: List[ObjectId]) -> int:
+            async with limit:
+                return await self.reservations.delete_expired(listing_oid, reservation_ids, now)
+
+        removed_counts = await asyncio.gather(*(delete(oid, ids) for oid, ids in by_listing.items()))
+        counter_ops = [
+            UpdateOne({"_id": listing_oid}, {"$inc": {"reservation_count": -removed}})
+            for listing_oid, removed in zip(by_listing, removed_counts) if removed
+        ]
+        total = sum(removed_counts)
+
+        if counter_ops:
+            await self.collection.bulk_write(counter_ops, ordered=False)
+            await self.stats.reservations_changed({ReservationStatus.PENDING: -total})
+        return total
 
     async def get_categories(self) -> List[str]:
         """
@@ -402,88 +839,115 @@ class ItemRepository:
         Returns:
             List of category names
         """
-        # Get distinct categories from the listings collection
-        categories = await self.collection.distinct("category")
-        return categories
+        # Served from the facet cache, listing writes invalidate it
+        facets = await facet_cache.get(self.db)
+        return sorted(facets.counts["categories"])
 
     async def mark_item_as_sold(self, listing_id: str) -> bool:
         """
         Mark a listing as sold and remove all reservation requests.
         """
-        result = await self.collection.update_one(
+        before = await self.collection.find_one_and_update(
             {"_id": ObjectId(listing_id)},
             {
                 "$set": {
                     "status": ListingStatus.SOLD,
-                    "reservation_requests": [],
                     "reservation_count": 0
                 }
-            }
+            },
+            projection={"reservation_count": 1, **LISTING_STATS_FIELDS}
         )
-        return result.modified_count > 0
+        if not before:
+            return False
+        await self._listing_changed(before, {**before, "status": ListingStatus.SOLD})
+        await self._delete_reservations(ObjectId(listing_id))
+        return before.get("status") != ListingStatus.SOLD or before.get("reservation_count") != 0
 
-    async def get_items_requested_by_user(self, buyer_id: str, user_repo: "UserRepository") -> List[MyRequestsResponse]:
-        cursor = self.collection.find({
-            "reservation_requests.buyer_id": ObjectId(buyer_id)
-        })
+    async def get_items_requested_by_user(self, buyer_id: str, users: "UserLoader") -> List[MyRequestsResponse]:
+        return [MyRequestsResponse(**entry) for entry in await self.find_items_requested_by_user(buyer_id, users)]
 
-        results = []
-        async for doc in cursor:
-            seller_phone = None
-
-            # Find the reservation that matches
-            for r in doc.get("reservation_requests", []):
-                if str(r["buyer_id"]) == buyer_id:
-                    # Only fetch seller's phone if the reservation is confirmed
-                    if r["status"] == "confirmed":
-                        seller = await user_repo.get_user_by_id(str(doc["seller_id"]))
-                        seller_phone = seller.phone if seller else None
-                        
-                        results.append(MyRequestsResponse(
-                            listing_id=str(doc["_id"]),
-                            title=doc["title"],
-                            seller_id=str(doc["seller_id"]),
-                            requested_at=datetime.fromisoformat(r["requested_at"]),
-                            status=r["status"],
-                            seller_phone=seller_phone
-                        ))
-                    else:
-                        results.append(MyRequestsResponse(
-                            listing_id=str(doc["_id"]),
-                            title=doc["title"],
-                            seller_id=str(doc["seller_id"]),
-                            requested_at=datetime.fromisoformat(r["requested_at"]),
-                            expires_at=datetime.fromisoformat(r["expires_at"]),
-                            status=r["status"]
-                        ))
-                    break  # Only one reservation per listing
+    async def find_items_requested_by_user(self, buyer_id: str, users: "UserLoader") -> List[dict]:
+        """
+        Get a buyer's reservation requests as MyRequestsResponse fields
+        """
+        requests = await self.reservations.for_buyer(ObjectId(buyer_id))
+        if not requests:
+            return []
 
-        return results
+        cursor = self.collection.find(
+            {"_id": {"$in": [r["listing_id"] for r in requests]}},
+            {"title": 1, "seller_id": 1}
+        )
+        listings = {doc["_id"]: doc async for doc in cursor}
 
-    async def get_reservation_request(self, user_id: str, user_repo: "UserRepository", item_id: str) -> List[MyRequestsResponse]:
-        doc = await self.collection.find_one({"_id": ObjectId(item_id)})
-        if not doc:
-            return []
+        # Seller phones are only shown for confirmed reservations; fetch them all at once
+        seller_ids = {
+            str(listings[r["listing_id"]]["seller_id"])
+            for r in requests
+            if r["status"] == "confirmed" and r["listing_id"] in listings
+        }
+        sellers = {user.id: user for user in await users.load_many(seller_ids) if user}
 
-        for r in doc.get("reservation_requests", []):
-            if str(r["buyer_id"]) == user_id:
-                seller_phone = None
-                if r["status"] == "confirmed":
-                    seller = await user_repo.get_user_by_id(str(doc["seller_id"]))
-                    seller_phone = seller.phone if seller else None
+        results = []
+        for r in requests:
+            doc = listings.get(r["listing_id"])
+            if not doc:
+                continue
 
-                response = MyRequestsResponse(
+            if r["status"] == "confirmed":
+                seller = sellers.get(str(doc["seller_id"]))
+                seller_phone = seller.phone if seller else None
+
+                results.append(dict(
                     listing_id=str(doc["_id"]),
                     title=doc["title"],
                     seller_id=str(doc["seller_id"]),
-                    requested_at=datetime.fromisoformat(r["requested_at"]),
+                    requested_at=as_utc(r["requested_at"]),
                     status=r["status"],
                     seller_phone=seller_phone
-                )
+                ))
+            else:
+                results.append(dict(
+                    listing_id=str(doc["_id"]),
+                    title=doc["title"],
+                    seller_id=str(doc["seller_id"]),
+                    requested_at=as_utc(r["requested_at"]),
+                    expires_at=as_utc(r["expires_at"]),
+                    status=r["status"]
+                ))
+
+        return results
 
-                if r["status"] != "confirmed":
-                    response.expires_at = datetime.fromisoformat(r["expires_at"])
+    async def get_reservation_request(self, user_id: str, users: "UserLoader", item_id: str) -> List[MyRequestsResponse]:
+        return [MyRequestsResponse(**entry) for entry in await self.find_reservation_request(user_id, users, item_id)]
+
+    async def find_reservation_request(self, user_id: str, users: "UserLoader", item_id: str) -> List[dict]:
+        """
+        Get one reservation request of a buyer as MyRequestsResponse fields
+        """
+        r = await self.reservations.get(ObjectId(item_id), ObjectId(user_id))
+        if not r:
+            return []
+
+        doc = await self.collection.find_one({"_id": ObjectId(item_id)}, {"title": 1, "seller_id": 1})
+        if not doc:
+            return []
+
+        seller_phone = None
+        if r["status"] == "confirmed":
+            seller = await users.load(str(doc["seller_id"]))
+            seller_phone = seller.phone if seller else None
+
+        response = dict(
+            listing_id=str(doc["_id"]),
+            title=doc["title"],
+            seller_id=str(doc["seller_id"]),
+            requested_at=as_utc(r["requested_at"]),
+            status=r["status"],
+            seller_phone=seller_phone
+        )
 
-                return [response]
+        if r["status"] != "confirmed":
+            response["expires_at"] = as_utc(r["expires_at"])
 
-        return []
\ No newline at end of file
+        return [response]
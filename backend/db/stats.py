@@ -0,0 +1,156 @@
+# backend/db/stats.py
+"""
+Materialized marketplace statistics.
+
+Counters live in a single document of the ``stats`` collection and are kept
+current with ``$inc`` from the repository write paths, so /home/stats is one
+indexed read at any catalog size. ``reconcile`` recomputes everything with
+aggregations to correct drift from failed or concurrent writes; it runs
+periodically in the background.
+
+Active sellers are sellers with at least one available listing. Their
+per-seller count is kept in ``seller_counts`` so the active total can change
+exactly when a seller's count crosses zero.
+"""
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ReturnDocument, ReplaceOne
+
+from backend.utilities.models import ListingStatus
+
+STATS_ID = "marketplace"
+
+# Fields a listing snapshot needs for listing_changed
+LISTING_STATS_FIELDS = {"status": 1, "category": 1, "seller_id": 1}
+
+
+def _key(value) -> str:
+    value = getattr(value, "value", value)
+    return str(value) if value is not None else "unknown"
+
+
+def _is_available(listing: Optional[dict]) -> bool:
+    return bool(listing) and _key(listing.get("status")) == ListingStatus.AVAILABLE.value
+
+
+class MarketplaceStats:
+    def __init__(self, db: AsyncIOMotorDatabase):
+        self.collection = db.stats
+        self.seller_counts = db.seller_counts
+        self.db = db
+
+    async def _inc(self, deltas: Dict[str, int]):
+        deltas = {field: delta for field, delta in deltas.items() if delta}
+        if deltas:
+            await self.collection.update_one(
+                {"_id": STATS_ID},
+                {"$inc": deltas, "$set": {"updated_at": datetime.now(timezone.utc)}},
+                upsert=True
+            )
+
+    async def listing_changed(self, before: Optional[dict], after: Optional[dict]):
+        """
+        Apply a listing write to the counters
+
+        Args:
+            before: The listing before the write, None for a new listing
+            after: The listing after the write, None for a deletion
+        """
+        await self.listings_changed([(before, after)])
+
+    async def listings_changed(self, changes: List[Tuple[Optional[dict], Optional[dict]]]):
+        """
+        Apply many listing writes, as (before, after) pairs, with one $inc
+        and one seller_counts update per seller
+        """
+        deltas: Dict[str, int] = {}
+        available_by_seller: Dict[Any, int] = {}
+        for before, after in changes:
+            for listing, sign in ((before, -1), (after, 1)):
+                if not listing:
+                    continue
+                deltas["listings.total"] = deltas.get("listings.total", 0) + sign
+                for field, group in (("status", "by_status"), ("category", "by_category")):
+                    key = f"listings.{group}.{_key(listing.get(field))}"
+                    deltas[key] = deltas.get(key, 0) + sign
+
+            available_delta = int(_is_available(after)) - int(_is_available(before))
+            if available_delta:
+                seller_id = (after or before)["seller_id"]
+                available_by_seller[seller_id] = available_by_seller.get(seller_id, 0) + available_delta
+        await self._inc(deltas)
+
+        active_delta = 0
+        for seller_id, available_delta in available_by_seller.items():
+            if not available_delta:
+                continue
+            counts = await self.seller_counts.find_one_and_update(
+                {"_id": seller_id},
+                {"$inc": {"available": available_delta}},
+                upsert=True,
+                return_document=ReturnDocument.AFTER
+            )
+            # The seller became active (0 -> n) or inactive (n -> 0)
+            active_delta += int(counts["available"] > 0) - int(counts["available"] - available_delta > 0)
+        await self._inc({"active_sellers": active_delta})
+
+    async def reservations_changed(self, deltas: Dict[str, int]):
+        """
+        Apply reservation writes, as {reservation status: change in count}
+        """
+        await self._inc({f"reservations.{_key(status)}": delta for status, delta in deltas.items()})
+
+    async def get(self) -> dict:
+        stats = await self.collection.find_one({"_id": STATS_ID})
+        if stats is None:
+            stats = await self.reconcile()
+        return stats
+
+    async def reconcile(self) -> dict:
+        """
+        Recompute every counter from the collections and store the result
+
+        Writes landing while the aggregations run may be counted twice or not
+        at all; the next reconciliation corrects that.
+        """
+        listings = await self.db.Listings.aggregate([
+            {"$facet": {
+                "by_status": [{"$group": {"_id": "$status", "count": {"$sum": 1}}}],
+                "by_category": [{"$group": {"_id": "$category", "count": {"$sum": 1}}}],
+                "available_by_seller": [
+                    {"$match": {"status": ListingStatus.AVAILABLE.value}},
+                    {"$group": {"_id": "$seller_id", "count": {"$sum": 1}}},
+                ],
+            }}
+        ]).to_list(length=1)
+        facets = listings[0]
+
+        reservations = await self.db.reservations.aggregate([
+            {"$group": {"_id": "$status", "count": {"$sum": 1}}}
+        ]).to_list(length=None)
+
+        by_status = {_key(group["_id"]): group["count"] for group in facets["by_status"]}
+        sellers = {group["_id"]: group["count"] for group in facets["available_by_seller"]}
+        stats = {
+            "_id": STATS_ID,
+            "listings": {
+                "total": sum(by_status.values()),
+                "by_status": by_status,
+                "by_category": {_key(group["_id"]): group["count"] for group in facets["by_category"]},
+            },
+            "active_sellers": len(sellers),
+            "reservations": {_key(group["_id"]): group["count"] for group in reservations},
+            "reconciled_at": datetime.now(timezone.utc),
+        }
+        stats["updated_at"] = stats["reconciled_at"]
+
+        if sellers:
+            await self.seller_counts.bulk_write(
+                [ReplaceOne({"_id": seller_id}, {"available": count}, upsert=True) for seller_id, count in sellers.items()],
+                ordered=False
+            )
+        await self.seller_counts.delete_many({"_id": {"$nin": list(sellers)}})
+        await self.collection.replace_one({"_id": STATS_ID}, stats, upsert=True)
+        return stats
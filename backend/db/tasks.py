@@ -0,0 +1,220 @@
+# backend/db/tasks.py
+"""
+Periodic background jobs run inside the API process.
+
+Every worker starts the same tasks; a task given a ``LeaderLock`` only does
+its work in the worker currently holding the lock, so cluster-wide jobs run
+once per interval rather than once per worker.
+"""
+import asyncio
+import logging
+import os
+import random
+import socket
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo.errors import DuplicateKeyError
+
+from backend.db.repository import ItemRepository
+from backend.db.stats import MarketplaceStats
+from backend.db.featured import FEATURED_REFRESH_INTERVAL, compute_featured, refresh_featured
+from backend.utilities.oidc_cache import OIDC_REFRESH_INTERVAL, ProviderMetadataCache
+
+logger = logging.getLogger(__name__)
+
+# Identifies this process as a lock owner
+WORKER_ID = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+
+class LeaderLock:
+    """
+    Lease on a document in the ``locks`` collection.
+
+    The holder renews the lease every time it runs; if it dies, another
+    worker takes over once the lease has expired.
+    """
+    def __init__(self, db: AsyncIOMotorDatabase, name: str, ttl: float):
+        self.collection = db.locks
+        self.name = name
+        self.ttl = ttl
+
+    async def acquire(self) -> bool:
+        """
+        Take or renew the lease, False if another worker holds it
+        """
+        now = datetime.now(timezone.utc)
+        try:
+            await self.collection.find_one_and_update(
+                {"_id": self.name, "$or": [{"owner": WORKER_ID}, {"expires_at": {"$lte": now}}]},
+                {"$set": {"owner": WORKER_ID, "expires_at": now + timedelta(seconds=self.ttl)}},
+                upsert=True
+            )
+        except DuplicateKeyError:
+            # The document exists with a live lease held by someone else
+            return False
+        return True
+
+    async def release(self):
+        await self.collection.delete_one({"_id": self.name, "owner": WORKER_ID})
+
+
+class PeriodicTask:
+    """
+    Run a coroutine function every ``interval`` seconds, give or take ``jitter``
+
+    Jitter keeps workers started together from hitting the database in
+    lockstep. Failures are logged and counted, and never stop the loop.
+    """
+    def __init__(
+        self,
+        name: str,
+        func: Callable[[], Awaitable[Any]],
+        interval: float,
+        jitter: float = 0.1,
+        lock: Optional[LeaderLock] = None,
+        initial_delay: Optional[float] = None
+    ):
+        self.name = name
+        self.func = func
+        self.interval = interval
+        self.jitter = jitter
+        self.lock = lock
+        # First run after this many seconds instead of a full interval
+        self.initial_delay = initial_delay
+        self.runs = 0
+        self.failures = 0
+        self.skipped = 0
+        self.last_result: Any = None
+        self.last_duration: Optional[float] = None
+        self.last_run_at: Optional[datetime] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def _next_delay(self) -> float:
+        return self.interval * (1 + random.uniform(-self.jitter, self.jitter))
+
+    async def run_once(self) -> Any:
+        if self.lock:
+            try:
+                acquired = await self.lock.acquire()
+            except Exception as e:
+                # Mongo unreachable (e.g. at boot): try again next round
+                self.failures += 1
+                logger.warning(f"Background task {self.name} could not take its lease: {e}")
+                return None
+            if not acquired:
+                self.skipped += 1
+                return None
+
+        started = time.monotonic()
+        try:
+            self.last_result = await self.func()
+        except Exception as e:
+            self.failures += 1
+            logger.warning(f"Background task {self.name} failed: {e}")
+            return None
+        finally:
+            self.runs += 1
+            self.last_duration = time.monotonic() - started
+            self.last_run_at = datetime.now(timezone.utc)
+        return self.last_result
+
+    async def _loop(self):
+        delay = self._next_delay() if self.initial_delay is None else self.initial_delay
+        while True:
+            await asyncio.sleep(delay)
+            try:
+                await self.run_once()
+            except Exception:
+                # Never let one bad round end the task; cancellation still does
+                self.failures += 1
+                logger.exception(f"Background task {self.name} failed")
+            delay = self._next_delay()
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._loop())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        if self.lock:
+            await self.lock.release()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "runs": self.runs,
+            "failures": self.failures,
+            "skipped": self.skipped,
+            "last_result": self.last_result,
+            "last_duration": self.last_duration,
+            "last_run_at": self.last_run_at,
+        }
+
+
+RESERVATION_SWEEP_INTERVAL = float(os.getenv("RESERVATION_SWEEP_INTERVAL", "60"))
+RESERVATION_SWEEP_BATCH = int(os.getenv("RESERVATION_SWEEP_BATCH", "500"))
+# Listings cleaned up at the same time, each holding a pooled connection
+RESERVATION_SWEEP_CONCURRENCY = int(os.getenv("RESERVATION_SWEEP_CONCURRENCY", "10"))
+
+
+async def sweep_expired_reservations(db: AsyncIOMotorDatabase, batch_size: int = RESERVATION_SWEEP_BATCH) -> int:
+    """
+    Remove expired pending reservations, batch by batch until none are left
+
+    Returns:
+        Number of reservations removed
+    """
+    repo = ItemRepository(db)
+    total = 0
+    while True:
+        removed = await repo.expire_reservations(batch_size, RESERVATION_SWEEP_CONCURRENCY)
+        total += removed
+        if removed < batch_size:
+            break
+    if total:
+        logger.info(f"Expired {total} reservation requests")
+    return total
+
+
+def reservation_sweeper(db: AsyncIOMotorDatabase, interval: float = RESERVATION_SWEEP_INTERVAL) -> PeriodicTask:
+    # The lease outlives a couple of missed rounds before another worker takes over
+    lock = LeaderLock(db, "reservation_sweeper", ttl=interval * 3)
+    return PeriodicTask("reservation_sweeper", lambda: sweep_expired_reservations(db), interval, lock=lock)
+
+
+STATS_RECONCILE_INTERVAL = float(os.getenv("STATS_RECONCILE_INTERVAL", "900"))
+
+
+def stats_reconciler(db: AsyncIOMotorDatabase, interval: float = STATS_RECONCILE_INTERVAL) -> PeriodicTask:
+    lock = LeaderLock(db, "stats_reconciler", ttl=interval * 3)
+    return PeriodicTask("stats_reconciler", lambda: MarketplaceStats(db).reconcile(), interval, lock=lock)
+
+
+async def _rank_featured(db: AsyncIOMotorDatabase) -> int:
+    ranking = await compute_featured(db)
+    await refresh_featured(db)
+    return sum(len(ids) for ids in ranking["categories"].values())
+
+
+def featured_tasks(db: AsyncIOMotorDatabase, interval: float = FEATURED_REFRESH_INTERVAL) -> List[PeriodicTask]:
+    """
+    The leader ranks listings; every worker picks up new rankings
+    """
+    lock = LeaderLock(db, "featured_ranker", ttl=interval * 3)
+    return [
+        PeriodicTask("featured_ranker", lambda: _rank_featured(db), interval, lock=lock, initial_delay=0),
+        PeriodicTask("featured_refresher", lambda: refresh_featured(db), interval / 5, initial_delay=1),
+    ]
+
+
+def oidc_metadata_refresher(cache: ProviderMetadataCache, interval: float = OIDC_REFRESH_INTERVAL) -> PeriodicTask:
+    """
+    Every worker runs it: the cache file is what is shared, and the first
+    run loads it (or fetches it) before the first logins
+    """
+    return PeriodicTask("oidc_metadata", cache.refresh, interval, initial_delay=0)
@@ -0,0 +1,194 @@
+# backend/db/text_search.py
+"""
+Keeps the in-process listing text index in step with the Listings collection.
+
+Writes made through ItemRepository in this process are indexed immediately.
+Writes made by other workers are picked up by ``sync_listing_index``, which
+re-reads listings changed since the last sync and, every few rounds, reconciles
+the full id set to drop deleted listings. The index is saved as a snapshot so a
+restart only has to catch up on what changed since the last save.
+"""
+import asyncio
+import logging
+import os
+import tempfile
+from datetime import datetime, timedelta, timezone
+from typing import TYPE_CHECKING, List, Optional, Tuple
+
+from bson import ObjectId
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo.errors import PyMongoError
+
+from backend.utilities.text_index import TextIndex
+
+if TYPE_CHECKING:
+    from backend.db.tasks import LeaderLock
+
+logger = logging.getLogger(__name__)
+
+# Shared by the workers on a host; only the holder of the snapshot lock writes it
+SNAPSHOT_PATH = os.path.abspath(
+    os.getenv("SEARCH_INDEX_SNAPSHOT", os.path.join(tempfile.gettempdir(), "bazaar_search_index.json.gz"))
+)
+SYNC_INTERVAL = float(os.getenv("SEARCH_INDEX_SYNC_INTERVAL", "30"))
+# Every Nth sync also looks for listings deleted by other workers
+FULL_SYNC_EVERY = int(os.getenv("SEARCH_INDEX_FULL_SYNC_EVERY", "10"))
+# Most keyword matches handed to Mongo in one $in list; /search/ pages through
+# larger match sets in batches rather than truncating them
+MAX_CANDIDATES = int(os.getenv("SEARCH_MAX_CANDIDATES", "1000"))
+
+_BATCH_SIZE = 500
+# Writes commit slightly out of timestamp order across workers, re-read a margin
+_WATERMARK_SKEW = timedelta(seconds=5)
+
+TEXT_FIELDS = {"title": 1, "description": 1, "tags": 1, "created_at": 1, "updated_at": 1}
+
+listing_index = TextIndex({"title": 3.0, "tags": 2.0, "description": 1.0})
+
+
+class _SyncState:
+    # False until the first full sync, /search/ falls back to a regex scan until then
+    ready = False
+    watermark: Optional[datetime] = None
+    rounds = 0
+
+
+sync_state = _SyncState()
+
+
+def _version(doc: dict) -> str:
+    stamp = doc.get("updated_at") or doc.get("created_at") or ""
+    if isinstance(stamp, datetime):
+        # Match what a read back from Mongo gives: naive UTC, millisecond precision
+        if stamp.tzinfo is not None:
+            stamp = stamp.astimezone(timezone.utc).replace(tzinfo=None)
+        stamp = stamp.replace(microsecond=stamp.microsecond // 1000 * 1000).isoformat()
+    return str(stamp)
+
+
+def index_listing(doc: dict):
+    """
+    Add or refresh a listing document (needs _id and the text fields)
+    """
+    listing_index.add(
+        str(doc["_id"]),
+        {
+            "title": doc.get("title"),
+            "description": doc.get("description"),
+            "tags": " ".join(doc.get("tags") or []),
+        },
+        _version(doc),
+    )
+
+
+def unindex_listing(listing_id: str):
+    listing_index.remove(listing_id)
+
+
+def search_listing_ids(q: str) -> List[Tuple[ObjectId, float]]:
+    """
+    Rank listings for a keyword query
+
+    Returns:
+        (listing _id, score) pairs for every match, best first
+    """
+    return [(ObjectId(doc_id), score) for doc_id, score in listing_index.search(q)]
+
+
+async def _index_ids(db: AsyncIOMotorDatabase, ids: List[ObjectId]):
+    for start in range(0, len(ids), _BATCH_SIZE):
+        async for doc in db.Listings.find({"_id": {"$in": ids[start:start + _BATCH_SIZE]}}, TEXT_FIELDS):
+            index_listing(doc)
+
+
+async def sync_listing_index(db: AsyncIOMotorDatabase, full: bool = False) -> Tuple[int, int]:
+    """
+    Bring the index up to date with the Listings collection
+
+    Args:
+        db: Database connection
+        full: Compare every listing instead of only recently changed ones
+
+    Returns:
+        (listings re-indexed, listings removed)
+    """
+    started_at = datetime.now(timezone.utc)
+    full = full or sync_state.watermark is None or sync_state.rounds % FULL_SYNC_EVERY == 0
+    sync_state.rounds += 1
+
+    stale: List[ObjectId] = []
+    removed = 0
+    if full:
+        seen = set()
+        async for doc in db.Listings.find({}, {"created_at": 1, "updated_at": 1}):
+            doc_id = str(doc["_id"])
+            seen.add(doc_id)
+            if doc_id not in listing_index or listing_index.version(doc_id) != _version(doc):
+                stale.append(doc["_id"])
+        for doc_id in listing_index.doc_ids() - seen:
+            unindex_listing(doc_id)
+            removed += 1
+    else:
+        since = sync_state.watermark - _WATERMARK_SKEW
+        changed = {"$or": [{"created_at": {"$gt": since}}, {"updated_at": {"$gt": since}}]}
+        async for doc in db.Listings.find(changed, {"created_at": 1, "updated_at": 1}):
+            if listing_index.version(str(doc["_id"])) != _version(doc):
+                stale.append(doc["_id"])
+
+    await _index_ids(db, stale)
+    sync_state.watermark = started_at
+    sync_state.ready = True
+    return len(stale), removed
+
+
+def save_listing_index(path: str = SNAPSHOT_PATH):
+    try:
+        listing_index.save(path)
+    except OSError as e:
+        logger.warning(f"Could not save search index snapshot to {path}: {e}")
+
+
+async def save_snapshot(lock: Optional["LeaderLock"] = None, path: str = SNAPSHOT_PATH) -> bool:
+    """
+    Save the snapshot if this worker holds ``lock``
+
+    Every worker keeps the same index, so one writer is enough; the others
+    would only rewrite the same file.
+
+    Returns:
+        True if the snapshot was written
+    """
+    if lock is not None:
+        try:
+            if not await lock.acquire():
+                return False
+        except PyMongoError as e:
+            logger.warning(f"Could not take the search index snapshot lock: {e}")
+            return False
+    save_listing_index(path)
+    return True
+
+
+async def run_listing_index(db: AsyncIOMotorDatabase, interval: float = SYNC_INTERVAL, lock: Optional["LeaderLock"] = None):
+    """
+    Load the snapshot, catch up with the database, then keep syncing
+
+    Meant to run as a background task for the lifetime of the app. Changes
+    are saved to the snapshot by the worker holding ``lock``, or by this
+    one if no lock is given.
+    """
+    if listing_index.load(SNAPSHOT_PATH):
+        logger.info(f"Loaded {len(listing_index)} listings from search index snapshot")
+
+    while True:
+        try:
+            indexed, removed = await sync_listing_index(db)
+            if indexed or removed:
+                logger.info(f"Search index sync: {indexed} re-indexed, {removed} removed")
+                await save_snapshot(lock)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            # Keep serving from the index we have, the next round retries
+            logger.warning(f"Search index sync failed: {e}")
+        await asyncio.sleep(interval)
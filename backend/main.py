@@ -2,14 +2,26 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from motor.motor_asyncio import AsyncIOMotorClient
 from starlette.middleware.sessions import SessionMiddleware
+import asyncio
 import os
 
-from backend.app.auth import router as auth_router
+from backend.app.auth import google_metadata, router as auth_router
+from backend.app.export import router as export_router
+from backend.app.health import router as health_router
 from backend.app.home import router as home_router
 from backend.app.listing import router as listing_router
 from backend.app.search import router as search_router
 from backend.app.user import router as user_router
-from backend.db.database import client
+from backend.db.database import close_client, get_db, warm_pool
+from backend.db.indexes import ensure_indexes
+from backend.db.tasks import LeaderLock, featured_tasks, oidc_metadata_refresher, reservation_sweeper, stats_reconciler
+from backend.db.text_search import SYNC_INTERVAL, run_listing_index, save_snapshot
+from backend.utilities.logging_config import configure_logging
+from backend.utilities.pagination import NEXT_CURSOR_HEADER
+from backend.utilities.response_cache import CACHE_STATUS_HEADER, ResponseCacheMiddleware
+
+# Queue-backed logging; a launcher or script that configured it first keeps its setup
+configure_logging()
 
 app = FastAPI(
     title="NYU Marketplace API",
@@ -17,6 +29,10 @@ app = FastAPI(
     version="1.0.0"
 )
 
+# Cache anonymous GET responses. Added first so it sits innermost, behind
+# CORS and sessions, and stores only what the routes produced.
+app.add_middleware(ResponseCacheMiddleware)
+
 # Configure CORS
 app.add_middleware(
     CORSMiddleware,
@@ -24,6 +40,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, CACHE_STATUS_HEADER],  # Let the frontend read pagination cursors
 )
 
 # Add session middleware
@@ -38,8 +55,49 @@ app.include_router(home_router)
 app.include_router(listing_router)
 app.include_router(search_router)
 app.include_router(user_router)  # Router with /user prefix
+app.include_router(export_router)
+app.include_router(health_router)
+
+@app.on_event("startup")
+async def warm_db_pool():
+    # Open the minimum pool now rather than on the first requests
+    await warm_pool(get_db())
+
+@app.on_event("startup")
+async def build_indexes():
+    # Index builds can take a while on a large catalog, so don't hold up startup
+    app.state.index_build = asyncio.create_task(ensure_indexes(get_db()))
+
+@app.on_event("startup")
+async def start_search_index():
+    # /search/ uses a regex scan until the first sync has finished. Every
+    # worker keeps its own index, one of them writes the shared snapshot
+    db = get_db()
+    app.state.snapshot_lock = LeaderLock(db, "search_index_snapshot", ttl=SYNC_INTERVAL * 3)
+    app.state.search_index = asyncio.create_task(run_listing_index(db, lock=app.state.snapshot_lock))
+
+@app.on_event("startup")
+async def start_background_tasks():
+    db = get_db()
+    app.state.background_tasks = [
+        reservation_sweeper(db), stats_reconciler(db), *featured_tasks(db), oidc_metadata_refresher(google_metadata)
+    ]
+    for task in app.state.background_tasks:
+        task.start()
+
+@app.on_event("shutdown")
+async def stop_background_tasks():
+    for task in app.state.background_tasks:
+        await task.stop()
+
+@app.on_event("shutdown")
+async def stop_search_index():
+    app.state.search_index.cancel()
+    if await save_snapshot(app.state.snapshot_lock):
+        # Let another worker take over writing right away
+        await app.state.snapshot_lock.release()
 
 @app.on_event("shutdown")
 async def shutdown_db_client():
-    client.close()
+    close_client()
 
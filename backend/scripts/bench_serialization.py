@@ -0,0 +1,82 @@
+import argparse
+import asyncio
+import logging
+import timeit
+from datetime import datetime, timedelta, timezone
+from typing import List
+
+from bson import ObjectId
+from fastapi.encoders import jsonable_encoder
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+from starlette.responses import JSONResponse
+
+from backend.utilities.models import ItemResponse
+from backend.utilities.logging_config import configure_logging
+from backend.utilities.serialization import ItemJSONResponse
+
+# Usage (from the project root):
+#   python -m backend.scripts.bench_serialization
+#   python -m backend.scripts.bench_serialization --items 100 --repeat 200
+#
+# Compares the per-item cost of rendering a search page the old way
+# (ItemResponse(**doc) per document, then response_model validation and
+# jsonable_encoder) with ItemJSONResponse encoding the documents directly.
+
+logger = logging.getLogger(__name__)
+
+
+def make_docs(count: int) -> List[dict]:
+    now = datetime.now(timezone.utc)
+    return [
+        {
+            "_id": ObjectId(),
+            "title": f"Listing {i}",
+            "description": "Lightly used, pick up on campus. " * 4,
+            "price": 10 + i,
+            "category": "electronics",
+            "condition": "good",
+            "status": "available",
+            "seller_id": ObjectId(),
+            "created_at": now - timedelta(minutes=i),
+            "tags": ["laptop", "charger"],
+            "images": [f"https://example.com/{i}.jpg"],
+            "location": "Campus",
+            "reservation_count": i % 3,
+        }
+        for i in range(count)
+    ]
+
+
+def model_path(docs: List[dict], field) -> bytes:
+    listings = []
+    for doc in docs:
+        doc = dict(doc)
+        doc["id"] = str(doc["_id"])
+        doc["seller_id"] = str(doc["seller_id"])
+        listings.append(ItemResponse(**doc))
+    content = asyncio.run(serialize_response(field=field, response_content=listings))
+    return JSONResponse(jsonable_encoder(content)).body
+
+
+def direct_path(docs: List[dict]) -> bytes:
+    return ItemJSONResponse(docs).body
+
+
+def main(items: int, repeat: int):
+    docs = make_docs(items)
+    field = create_response_field(name="response", type_=List[ItemResponse])
+    assert model_path(docs, field) == direct_path(docs)
+
+    for name, run in (("response_model", lambda: model_path(docs, field)), ("direct encoder", lambda: direct_path(docs))):
+        best = min(timeit.repeat(run, number=repeat, repeat=3)) / repeat
+        logger.info(f"{name:>15}: {best * 1000:.3f} ms per page, {best / items * 1e6:.1f} us per item")
+
+
+if __name__ == "__main__":
+    configure_logging(fmt="plain", stream="stdout")
+    parser = argparse.ArgumentParser(description="Benchmark listing response serialization")
+    parser.add_argument("--items", type=int, default=100, help="Listings per page")
+    parser.add_argument("--repeat", type=int, default=100, help="Pages rendered per timing run")
+    args = parser.parse_args()
+    main(args.items, args.repeat)
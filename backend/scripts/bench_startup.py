@@ -0,0 +1,99 @@
+import argparse
+import asyncio
+import logging
+import os
+import subprocess
+import sys
+import time
+from typing import Dict, List, Tuple
+
+from backend.utilities.logging_config import configure_logging
+
+# Usage (from the project root):
+#   python -m backend.scripts.bench_startup                  import + lifespan timings
+#   python -m backend.scripts.bench_startup --runs 5 --top 30
+#   python -m backend.scripts.bench_startup --no-lifespan    without a reachable Mongo
+#
+# Imports are timed in fresh interpreters with -X importtime, as a new worker
+# would pay them. Lifespan hooks are then timed one by one in this process.
+
+logger = logging.getLogger(__name__)
+
+APP_MODULE = "backend.main"
+
+
+def import_timings(module: str = APP_MODULE, code: str = "") -> Tuple[Dict[str, Tuple[int, int]], str]:
+    """
+    Import ``module`` in a fresh interpreter
+
+    Args:
+        module: Module to import
+        code: Extra statements to run after the import; their stdout is returned
+
+    Returns:
+        {module: (self us, cumulative us)} and the child's stdout
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}\n{code}"],
+        capture_output=True, text=True, env=os.environ.copy(), check=True,
+    )
+    timings = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        if self_us.strip().isdigit():
+            timings[name.strip()] = (int(self_us), int(cumulative_us))
+    return timings, result.stdout
+
+
+async def lifespan_timings() -> List[Tuple[str, float, str]]:
+    """
+    Run the app's startup then shutdown hooks in order, timing each
+
+    A failing hook (e.g. no database) is recorded and the rest still run.
+    """
+    from backend.main import app
+
+    timings = []
+    for phase, handlers in (("startup", app.router.on_startup), ("shutdown", app.router.on_shutdown)):
+        for handler in handlers:
+            error = ""
+            start = time.perf_counter()
+            try:
+                await handler()
+            except Exception as e:
+                error = f"failed: {type(e).__name__}"
+            timings.append((f"{phase}: {handler.__name__}", (time.perf_counter() - start) * 1000, error))
+    return timings
+
+
+def main(runs: int, top: int, lifespan: bool):
+    results = [import_timings()[0] for _ in range(runs)]
+    best = min(results, key=lambda timings: timings[APP_MODULE][1])
+    totals = sorted(timings[APP_MODULE][1] / 1000 for timings in results)
+    logger.info(f"import {APP_MODULE}: best {totals[0]:.1f} ms, median {totals[len(totals) // 2]:.1f} ms over {runs} runs\n")
+
+    logger.info("Slowest modules by cumulative time (best run):")
+    for name, (self_us, cumulative_us) in sorted(best.items(), key=lambda item: -item[1][1])[:top]:
+        logger.info(f"  {cumulative_us / 1000:8.1f} ms  {self_us / 1000:8.1f} ms self  {name}")
+
+    logger.info("\nApplication modules:")
+    for name, (self_us, cumulative_us) in sorted(best.items()):
+        if name.startswith("backend."):
+            logger.info(f"  {cumulative_us / 1000:8.1f} ms  {name}")
+
+    if lifespan:
+        logger.info("\nLifespan hooks:")
+        for name, elapsed, error in asyncio.run(lifespan_timings()):
+            logger.info(f"  {elapsed:8.1f} ms  {name}  {error}".rstrip())
+
+
+if __name__ == "__main__":
+    configure_logging(fmt="plain", stream="stdout")
+    parser = argparse.ArgumentParser(description="Measure application cold start")
+    parser.add_argument("--runs", type=int, default=3, help="Fresh interpreters to time")
+    parser.add_argument("--top", type=int, default=20, help="Slowest modules to list")
+    parser.add_argument("--no-lifespan", action="store_true", help="Skip the startup/shutdown hooks")
+    args = parser.parse_args()
+    main(args.runs, args.top, not args.no_lifespan)
@@ -1,47 +1,50 @@
 import asyncio
 from motor.motor_asyncio import AsyncIOMotorClient
+import logging
 import os
 from dotenv import load_dotenv
+from backend.utilities.logging_config import configure_logging
 
 # Load environment variables
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 async def check_database():
     # Get MongoDB connection string from environment
     MONGODB_URL = os.getenv("MONGO_DETAILS")
     DATABASE_NAME = os.getenv("DATABASE_NAME", "Bazaar")
     
-    print(f"Connecting to database: {DATABASE_NAME}")
+    logger.info(f"Connecting to database: {DATABASE_NAME}")
     
     # Connect to MongoDB
     client = AsyncIOMotorClient(MONGODB_URL)
     db = client[DATABASE_NAME]
     
     # Check listings collection
-    print("\nChecking Listings collection:")
-    cursor = db.Listings.find({})
-    listings = []
-    async for doc in cursor:
-        listings.append(doc)
+    logger.info("\nChecking Listings collection:")
+    count = await db.Listings.count_documents({})
+    listings = await db.Listings.find({}).limit(3).to_list(length=3)
     
-    print(f"Found {len(listings)} listings")
+    logger.info(f"Found {count} listings")
     
     if listings:
-        print("\nSample of listings:")
-        for listing in listings[:3]:  # Show first 3 listings
-            print(f"\nTitle: {listing.get('title')}")
-            print(f"Description: {listing.get('description')}")
-            print(f"Status: {listing.get('status')}")
-            print(f"Category: {listing.get('category')}")
-            print("-" * 50)
+        logger.info("\nSample of listings:")
+        for listing in listings:  # Show first 3 listings
+            logger.info(f"\nTitle: {listing.get('title')}")
+            logger.info(f"Description: {listing.get('description')}")
+            logger.info(f"Status: {listing.get('status')}")
+            logger.info(f"Category: {listing.get('category')}")
+            logger.info("-" * 50)
     
     # Check distinct categories
     categories = await db.Listings.distinct("category")
-    print(f"\nAvailable categories: {categories}")
+    logger.info(f"\nAvailable categories: {categories}")
     
     # Check distinct statuses
     statuses = await db.Listings.distinct("status")
-    print(f"\nAvailable statuses: {statuses}")
+    logger.info(f"\nAvailable statuses: {statuses}")
 
 if __name__ == "__main__":
+    configure_logging(fmt="plain", stream="stdout")
     asyncio.run(check_database()) 
\ No newline at end of file
@@ -0,0 +1,44 @@
+import argparse
+import asyncio
+import logging
+import sys
+
+from backend.db.database import client, db
+from backend.db.indexes import ensure_indexes, index_drift
+from backend.utilities.logging_config import configure_logging
+
+# Usage (from the project root):
+#   python -m backend.scripts.ensure_indexes          build missing indexes
+#   python -m backend.scripts.ensure_indexes --check  only report drift, exit 1 if any
+
+logger = logging.getLogger(__name__)
+
+
+async def main(check_only: bool) -> int:
+    if not check_only:
+        created = await ensure_indexes(db)
+        for collection_name, names in created.items():
+            for name in names:
+                logger.info(f"Created index {collection_name}.{name}")
+
+    drift = await index_drift(db)
+    has_drift = False
+    for collection_name, report in drift.items():
+        for kind in ("missing", "mismatched", "extra"):
+            for name in report[kind]:
+                logger.info(f"{collection_name}.{name}: {kind}")
+                # Extra indexes are reported but do not fail the check
+                has_drift = has_drift or kind != "extra"
+
+    if not has_drift:
+        logger.info("All declared indexes are present")
+    client.close()
+    return 1 if has_drift else 0
+
+
+if __name__ == "__main__":
+    configure_logging(fmt="plain", stream="stdout")
+    parser = argparse.ArgumentParser(description="Build and verify MongoDB indexes")
+    parser.add_argument("--check", action="store_true", help="Report drift without building anything")
+    args = parser.parse_args()
+    sys.exit(asyncio.run(main(args.check)))
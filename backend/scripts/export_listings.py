@@ -0,0 +1,72 @@
+import argparse
+import asyncio
+import logging
+import os
+import sys
+
+from backend.db.database import client, db
+from backend.db.export import EXPORT_BATCH_SIZE, export_filter, export_listings
+from backend.utilities.logging_config import configure_logging
+
+# Usage (from the project root):
+#   python -m backend.scripts.export_listings -o listings.ndjson
+#   python -m backend.scripts.export_listings --format csv --seller <id> -o seller.csv
+#   python -m backend.scripts.export_listings -o listings.ndjson --resume
+#
+# After every batch the last written listing id goes to <output>.checkpoint.
+# --resume appends to the output from that checkpoint; the checkpoint is
+# removed once the export completes.
+
+logger = logging.getLogger(__name__)
+
+
+def read_checkpoint(path: str):
+    try:
+        with open(path) as f:
+            return f.read().strip() or None
+    except FileNotFoundError:
+        return None
+
+
+def write_checkpoint(path: str, listing_id):
+    tmp = f"{path}.tmp"
+    with open(tmp, "w") as f:
+        f.write(str(listing_id))
+    os.replace(tmp, path)
+
+
+async def main(args) -> int:
+    checkpoint_path = f"{args.output}.checkpoint"
+    after = read_checkpoint(checkpoint_path) if args.resume else None
+    if args.resume and after is None and os.path.exists(args.output):
+        logger.error("No checkpoint to resume from")
+        return 1
+
+    query = export_filter(args.seller, args.status, args.category, after)
+    with open(args.output, "a" if after else "w", encoding="utf-8", newline="") as out:
+        async for chunk, last_id in export_listings(db, args.format, query, args.batch_size, header=after is None):
+            out.write(chunk)
+            out.flush()
+            # Only checkpoint what is on disk
+            os.fsync(out.fileno())
+            if last_id is not None:
+                write_checkpoint(checkpoint_path, last_id)
+
+    if os.path.exists(checkpoint_path):
+        os.remove(checkpoint_path)
+    logger.info(f"Exported listings to {args.output}")
+    client.close()
+    return 0
+
+
+if __name__ == "__main__":
+    configure_logging(fmt="plain", stream="stdout")
+    parser = argparse.ArgumentParser(description="Export the listing catalog")
+    parser.add_argument("-o", "--output", required=True, help="Output file")
+    parser.add_argument("--format", choices=["ndjson", "csv"], default="ndjson")
+    parser.add_argument("--seller", help="Only this seller's listings")
+    parser.add_argument("--status", help="Only listings with this status")
+    parser.add_argument("--category", help="Only listings in this category")
+    parser.add_argument("--batch-size", type=int, default=EXPORT_BATCH_SIZE, help="Listings read per query")
+    parser.add_argument("--resume", action="store_true", help="Continue from the checkpoint next to the output")
+    sys.exit(asyncio.run(main(parser.parse_args())))
@@ -0,0 +1,34 @@
+import argparse
+import asyncio
+import logging
+
+from backend.db.database import client, db
+from backend.db.indexes import ensure_indexes
+from backend.db.migrations import migrate_embedded_reservations, migrate_reservation_timestamps
+from backend.utilities.logging_config import configure_logging
+
+# Usage (from the project root):
+#   python -m backend.scripts.migrate_reservations [--batch-size N] [--pause SECONDS]
+#
+# Safe to interrupt and re-run; the timestamp conversion resumes from its checkpoint.
+
+logger = logging.getLogger(__name__)
+
+
+async def main(batch_size: int, pause: float):
+    # The unique (listing_id, buyer_id) index must exist before copying
+    await ensure_indexes(db)
+    migrated = await migrate_embedded_reservations(db, batch_size=batch_size)
+    logger.info(f"Moved reservation requests out of {migrated} listings")
+    converted = await migrate_reservation_timestamps(db, batch_size=batch_size, pause=pause)
+    logger.info(f"Converted timestamps on {converted} reservations")
+    client.close()
+
+
+if __name__ == "__main__":
+    configure_logging(fmt="plain", stream="stdout")
+    parser = argparse.ArgumentParser(description="Move embedded reservation requests into their own collection")
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--pause", type=float, default=0.1, help="Seconds to wait between timestamp batches")
+    args = parser.parse_args()
+    asyncio.run(main(args.batch_size, args.pause))
@@ -0,0 +1,167 @@
+# backend/server.py
+"""
+Production launcher for backend.main:app.
+
+    poetry run start-prod           # gunicorn master + uvicorn workers
+    poetry run start                # single reloading dev server
+
+With gunicorn installed (``poetry install -E prod``) a master process runs
+WEB_CONCURRENCY uvicorn workers, one per available CPU by default. It
+restarts each worker after MAX_REQUESTS requests (with jitter) or once its
+resident memory passes WORKER_MAX_MEMORY_MB, and drains in-flight requests
+for GRACEFUL_TIMEOUT seconds on SIGTERM. uvloop and httptools are used when
+installed.
+
+Each worker runs the app's startup hooks itself, including the Mongo pool
+warm-up. The Mongo client never connects at import, so PRELOAD_APP can load
+the app once in the master without sharing sockets across forks.
+
+Without gunicorn, uvicorn's own process manager runs the workers. It does
+not replace workers that exit, so neither limit is applied there: a worker
+leaving after MAX_REQUESTS would never come back.
+"""
+import logging
+import os
+import signal
+
+logger = logging.getLogger(__name__)
+
+APP = "backend.main:app"
+
+
+def _env_flag(name: str, default: bool = False) -> bool:
+    return os.getenv(name, str(default)).strip().lower() in ("1", "true", "yes", "on")
+
+
+def available_cpus() -> int:
+    """
+    CPUs this process may run on (respects affinity / container cpusets)
+    """
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def _module_available(name: str) -> bool:
+    try:
+        __import__(name)
+        return True
+    except ImportError:
+        return False
+
+
+HOST = os.getenv("HOST", "0.0.0.0")
+PORT = int(os.getenv("PORT", "8000"))
+WEB_CONCURRENCY = int(os.getenv("WEB_CONCURRENCY", str(available_cpus())))
+MAX_REQUESTS = int(os.getenv("MAX_REQUESTS", "10000"))
+MAX_REQUESTS_JITTER = int(os.getenv("MAX_REQUESTS_JITTER", str(MAX_REQUESTS // 10)))
+# 0 disables the memory ceiling
+WORKER_MAX_MEMORY_MB = int(os.getenv("WORKER_MAX_MEMORY_MB", "0"))
+GRACEFUL_TIMEOUT = int(os.getenv("GRACEFUL_TIMEOUT", "30"))
+WORKER_TIMEOUT = int(os.getenv("WORKER_TIMEOUT", "60"))
+KEEPALIVE = int(os.getenv("KEEPALIVE", "5"))
+PRELOAD_APP = _env_flag("PRELOAD_APP")
+
+LOOP = "uvloop" if _module_available("uvloop") else "asyncio"
+HTTP = "httptools" if _module_available("httptools") else "h11"
+
+
+def rss_mb() -> float:
+    """
+    Resident memory of this process in MB (0 where /proc is unavailable)
+    """
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError, IndexError):
+        return 0.0
+
+
+def gunicorn_options() -> dict:
+    return {
+        "bind": f"{HOST}:{PORT}",
+        "workers": WEB_CONCURRENCY,
+        "worker_class": "backend.server.MarketplaceWorker",
+        "max_requests": MAX_REQUESTS,
+        "max_requests_jitter": MAX_REQUESTS_JITTER,
+        "graceful_timeout": GRACEFUL_TIMEOUT,
+        "timeout": WORKER_TIMEOUT,
+        "keepalive": KEEPALIVE,
+        "preload_app": PRELOAD_APP,
+        "accesslog": "-",
+    }
+
+
+try:
+    from gunicorn.app.base import BaseApplication
+    from uvicorn.workers import UvicornWorker
+except ImportError:
+    BaseApplication = UvicornWorker = None
+
+
+if UvicornWorker is not None:
+    class MarketplaceWorker(UvicornWorker):
+        CONFIG_KWARGS = {
+            "loop": LOOP,
+            "http": HTTP,
+            "lifespan": "on",
+            # Stop waiting on open connections before the master's SIGKILL
+            "timeout_graceful_shutdown": max(GRACEFUL_TIMEOUT - 1, 1),
+        }
+
+        async def callback_notify(self):
+            # Called by uvicorn every few seconds as the worker heartbeat
+            await super().callback_notify()
+            if WORKER_MAX_MEMORY_MB and rss_mb() > WORKER_MAX_MEMORY_MB:
+                self.log.info(f"Worker {self.pid} above {WORKER_MAX_MEMORY_MB} MB, restarting")
+                # Same path as a deploy: drain, exit, and the master forks a replacement
+                os.kill(self.pid, signal.SIGTERM)
+
+    class MarketplaceApplication(BaseApplication):
+        def __init__(self, app_uri: str, options: dict):
+            self.app_uri = app_uri
+            self.options = options
+            super().__init__()
+
+        def load_config(self):
+            for key, value in self.options.items():
+                self.cfg.set(key, value)
+
+        def load(self):
+            from backend.main import app
+            return app
+
+
+def main():
+    """
+    Production entry point (poetry script start-prod)
+    """
+    if BaseApplication is not None:
+        MarketplaceApplication(APP, gunicorn_options()).run()
+        return
+
+    import uvicorn
+    logger.warning("gunicorn is not installed; running uvicorn workers without recycling")
+    uvicorn.run(
+        APP,
+        host=HOST,
+        port=PORT,
+        workers=WEB_CONCURRENCY,
+        loop=LOOP,
+        http=HTTP,
+        timeout_keep_alive=KEEPALIVE,
+        timeout_graceful_shutdown=GRACEFUL_TIMEOUT,
+    )
+
+
+def dev():
+    """
+    Single reloading server for development (poetry script start)
+    """
+    import uvicorn
+    uvicorn.run(APP, host=os.getenv("HOST", "127.0.0.1"), port=PORT, reload=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,19 @@
+# backend/utilities/dates.py
+from datetime import datetime, timezone
+from typing import Optional, Union
+
+
+def as_utc(value: Optional[Union[datetime, str]]) -> Optional[datetime]:
+    """
+    Normalize a stored timestamp to an aware UTC datetime
+
+    Mongo hands datetimes back naive (they are stored as UTC); documents
+    written before timestamps were native still hold ISO strings.
+    """
+    if value is None:
+        return None
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
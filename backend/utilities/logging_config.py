@@ -0,0 +1,283 @@
+# backend/utilities/logging_config.py
+"""
+Process-wide logging setup: records are queued by the calling thread and
+formatted and written by a background listener thread.
+
+The event loop only pays for the filters and a queue put. Formatting (JSON
+encoding, tracebacks) and stream I/O happen on the listener, so a slow
+stdout or a burst of log volume no longer stalls request handling. When the
+queue is full, records are dropped and counted rather than blocking.
+
+Settings:
+    LOG_LEVEL              root level (INFO)
+    LOG_LEVELS             per-logger levels, "backend.db=DEBUG,pymongo=WARNING"
+    LOG_FORMAT             json, text or plain (json)
+    LOG_QUEUE_SIZE         records held for the listener before dropping (10000)
+    LOG_RATE_LIMIT         records per second per logger, 0 for no limit (50)
+    LOG_RATE_BURST         records a logger may emit at once before being limited (100)
+    LOG_RATE_LIMIT_LEVEL   highest level that is rate limited, DEBUG or INFO (DEBUG)
+    LOG_DEBUG_SAMPLE_RATE  fraction of DEBUG records kept (1.0)
+
+INFO records (startup, task progress) are kept unless LOG_RATE_LIMIT_LEVEL
+says otherwise; WARNING and above are never rate limited or sampled.
+"""
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from typing import IO, Dict, Optional, Union
+
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+LOG_LEVELS = os.getenv("LOG_LEVELS", "")
+LOG_FORMAT = os.getenv("LOG_FORMAT", "json")
+LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+LOG_RATE_LIMIT = float(os.getenv("LOG_RATE_LIMIT", "50"))
+LOG_RATE_BURST = float(os.getenv("LOG_RATE_BURST", "100"))
+LOG_RATE_LIMIT_LEVEL = os.getenv("LOG_RATE_LIMIT_LEVEL", "DEBUG")
+LOG_DEBUG_SAMPLE_RATE = float(os.getenv("LOG_DEBUG_SAMPLE_RATE", "1.0"))
+
+TEXT_FORMAT = "%(asctime)s %(levelname)s %(name)s: %(message)s"
+
+# Attributes every LogRecord has; anything else came in through ``extra=``
+_RECORD_ATTRS = frozenset(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime"}
+
+
+def parse_level(level: Union[str, int]) -> int:
+    """
+    Level number for a name such as "debug" or "INFO"
+
+    Raises:
+        ValueError: For an unknown level
+    """
+    if isinstance(level, int):
+        return level
+    number = logging.getLevelName(level.strip().upper())
+    if not isinstance(number, int):
+        raise ValueError(f"Unknown log level: {level}")
+    return number
+
+
+def parse_levels(value: str) -> Dict[str, int]:
+    """
+    Parse "logger=LEVEL,other=LEVEL"
+
+    Raises:
+        ValueError: For entries without "=" or with an unknown level
+    """
+    levels = {}
+    for entry in filter(None, (part.strip() for part in value.split(","))):
+        name, sep, level = entry.partition("=")
+        if not sep or not name.strip():
+            raise ValueError(f"Invalid log level entry: {entry}")
+        levels[name.strip()] = parse_level(level)
+    return levels
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    One JSON object per line: time, level, logger, message, any ``extra``
+    fields, and the traceback if there is one
+    """
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRS and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["exc"] = record.exc_text
+        return json.dumps(entry, default=str)
+
+
+class SampleFilter(logging.Filter):
+    """
+    Keep only a ``rate`` fraction of DEBUG records
+    """
+    def __init__(self, rate: float):
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        return record.levelno > logging.DEBUG or self.rate >= 1 or random.random() < self.rate
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    Token bucket per logger for records up to ``max_level``
+
+    The first record let through after some were dropped carries the
+    count in ``dropped``. WARNING and above always pass.
+    """
+    def __init__(self, per_second: float, burst: float, max_level: int = logging.DEBUG):
+        super().__init__()
+        self.per_second = per_second
+        self.burst = burst
+        self.max_level = min(max_level, logging.INFO)
+        self._lock = threading.Lock()
+        # logger name -> [tokens, last refill, dropped since last record]
+        self._buckets: Dict[str, list] = {}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > self.max_level or self.per_second <= 0:
+            return True
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.setdefault(record.name, [self.burst, now, 0])
+            bucket[0] = min(self.burst, bucket[0] + (now - bucket[1]) * self.per_second)
+            bucket[1] = now
+            if bucket[0] < 1:
+                bucket[2] += 1
+                return False
+            bucket[0] -= 1
+            dropped, bucket[2] = bucket[2], 0
+        if dropped:
+            record.dropped = dropped
+        return True
+
+
+class NonBlockingQueueHandler(logging.handlers.QueueHandler):
+    """
+    Enqueue records without formatting them, and drop them when the queue is full
+
+    The message is resolved here, since its arguments may change after the
+    call returns; everything else is left for the listener thread.
+    """
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class _StandardStreamHandler(logging.StreamHandler):
+    """
+    Writes to sys.stdout / sys.stderr as they are when the record is written,
+    so swapped streams (test capture) are followed
+    """
+    def __init__(self, name: str):
+        logging.Handler.__init__(self)
+        self._name = name
+
+    @property
+    def stream(self):
+        return getattr(sys, self._name)
+
+
+_queue_handler: Optional[NonBlockingQueueHandler] = None
+_listener: Optional[logging.handlers.QueueListener] = None
+_output: Optional[logging.Handler] = None
+
+
+def _start_listener():
+    global _listener
+    _listener = logging.handlers.QueueListener(_queue_handler.queue, _output, respect_handler_level=False)
+    _listener.start()
+
+
+def _restart_after_fork():
+    # The listener thread does not survive fork (gunicorn with PRELOAD_APP);
+    # the child gets a fresh queue, since the parent's may be mid-put
+    if _queue_handler is not None:
+        _queue_handler.queue = queue.Queue(_queue_handler.queue.maxsize)
+        _start_listener()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_restart_after_fork)
+
+
+def configure_logging(
+    level: Union[str, int] = LOG_LEVEL,
+    levels: Union[str, Dict[str, int]] = LOG_LEVELS,
+    fmt: str = LOG_FORMAT,
+    stream: Union[str, IO] = "stderr",
+    force: bool = False
+) -> NonBlockingQueueHandler:
+    """
+    Route the root logger through the queue to a single output handler
+
+    The first call wins, so a script can pick its format before importing
+    the app; ``force`` replaces an earlier configuration.
+
+    Args:
+        level: Root level
+        levels: Per-logger levels, as a LOG_LEVELS string or a dict
+        fmt: "json", "text" or "plain" (message only)
+        stream: "stdout", "stderr" or a file object
+        force: Reconfigure even if already configured
+
+    Returns:
+        The queue handler installed on the root logger
+
+    Raises:
+        ValueError: For an unknown format or level
+    """
+    global _queue_handler, _output
+    if _queue_handler is not None and not force:
+        return _queue_handler
+    if fmt not in ("json", "text", "plain"):
+        raise ValueError(f"Unknown log format: {fmt}")
+    if isinstance(levels, str):
+        levels = parse_levels(levels)
+    rate_limit_level = parse_level(LOG_RATE_LIMIT_LEVEL)
+    stop_logging()
+
+    _output = _StandardStreamHandler(stream) if isinstance(stream, str) else logging.StreamHandler(stream)
+    if fmt == "json":
+        _output.setFormatter(JsonFormatter())
+    else:
+        _output.setFormatter(logging.Formatter(TEXT_FORMAT if fmt == "text" else "%(message)s"))
+
+    _queue_handler = NonBlockingQueueHandler(queue.Queue(LOG_QUEUE_SIZE))
+    _queue_handler.addFilter(SampleFilter(LOG_DEBUG_SAMPLE_RATE))
+    _queue_handler.addFilter(RateLimitFilter(LOG_RATE_LIMIT, LOG_RATE_BURST, rate_limit_level))
+
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+    root.addHandler(_queue_handler)
+    root.setLevel(level.upper() if isinstance(level, str) else level)
+    for name, logger_level in levels.items():
+        logging.getLogger(name).setLevel(logger_level)
+
+    _start_listener()
+    return _queue_handler
+
+
+def stop_logging():
+    """
+    Write out queued records and stop the listener thread
+    """
+    global _listener
+    if _listener is not None:
+        try:
+            _listener.stop()
+        except queue.Full:
+            # No room for the stop sentinel; the daemon thread dies with the process
+            pass
+        _listener = None
+
+
+atexit.register(stop_logging)
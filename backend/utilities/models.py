@@ -1,7 +1,7 @@
 from pydantic import BaseModel, Field, EmailStr, field_validator, ConfigDict
 from typing import Optional, List, Dict, Any
 from datetime import datetime
-from enum import Enum
+from enum import Enum, IntEnum
 
 class ItemCondition(str, Enum):
     """Enum for possible item conditions as specified in requirements [R-104]"""
@@ -30,6 +30,19 @@ class ReservationStatus(str, Enum):
     PENDING = "pending"
     CONFIRMED = "confirmed"
 
+class ReservationOutcome(str, Enum):
+    """Result of a reservation state transition in ItemRepository"""
+    CREATED = "created"
+    CONFIRMED = "confirmed"
+    CANCELLED = "cancelled"
+    DUPLICATE = "duplicate"
+    NOT_FOUND = "not_found"
+    CONFLICT = "conflict"
+
+class SortOrder(IntEnum):
+    ASCENDING = 1
+    DESCENDING = -1
+
 class ImageModel(BaseModel):
     """Model for item images"""
     url: str
@@ -70,6 +83,23 @@ class ItemUpdate(BaseModel):
     images: Optional[List[str]] = None
     status: Optional[ListingStatus] = None
 
+class ListingBulkUpdate(BaseModel):
+    """One row of a bulk status/price update"""
+    id: str
+    status: Optional[ListingStatus] = None
+    price: Optional[int] = Field(None, ge=0)
+
+class BulkRowResult(BaseModel):
+    """Outcome of one row of a bulk request, by its position in the request"""
+    index: int
+    id: Optional[str] = None
+    error: Optional[str] = None
+
+class BulkResponse(BaseModel):
+    succeeded: int
+    failed: int
+    results: List[BulkRowResult]
+
 class ItemResponse(BaseModel):
     id: str
     title: str
@@ -214,4 +244,20 @@ class UserResponse(BaseModel):
     phone: Optional[str] = None
 
     model_config = ConfigDict(
-        from_attributes=True)
\ No newline at end of file
+        from_attributes=True)
+
+class ListingStats(BaseModel):
+    total: int = 0
+    by_status: Dict[str, int] = {}
+    by_category: Dict[str, int] = {}
+
+class FacetsResponse(BaseModel):
+    categories: Dict[str, int]
+    conditions: Dict[str, int]
+    statuses: Dict[str, int]
+
+class MarketplaceStatsResponse(BaseModel):
+    listings: ListingStats = ListingStats()
+    active_sellers: int = 0
+    reservations: Dict[str, int] = {}
+    updated_at: Optional[datetime] = None
\ No newline at end of file
@@ -0,0 +1,199 @@
+# backend/utilities/oidc_cache.py
+"""
+File-backed cache of an OpenID provider's discovery document and signing keys.
+
+authlib fetches both lazily, so without a cache the first logins after every
+worker start wait on the provider. Here they are fetched once and stored in a
+JSON file that every worker on the host reads. A background task refreshes
+the file before it expires; workers serialize refreshes on a lock file, and
+the ones that waited find the file fresh and just load it.
+
+If the provider cannot be reached the stale copy keeps being served. Keys
+rotated since then are still picked up: authlib refetches the key set when a
+token is signed with an unknown key.
+"""
+import asyncio
+import json
+import logging
+import os
+import re
+import tempfile
+import time
+from contextlib import asynccontextmanager
+from typing import Any, Dict, List, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows: no cross-process lock, each worker refreshes
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+# Overridable to point logins at a stub provider
+GOOGLE_METADATA_URL = os.getenv("GOOGLE_METADATA_URL", "https://accounts.google.com/.well-known/openid-configuration")
+
+OIDC_CACHE_PATH = os.getenv("OIDC_CACHE_PATH", os.path.join(tempfile.gettempdir(), "bazaar_oidc_metadata.json"))
+# Upper bound on the cache lifetime; a shorter Cache-Control max-age from the provider wins
+OIDC_CACHE_TTL = float(os.getenv("OIDC_CACHE_TTL", "86400"))
+# Refresh once less than this is left before expiry, at most half the entry's lifetime
+OIDC_REFRESH_MARGIN = float(os.getenv("OIDC_REFRESH_MARGIN", "3600"))
+OIDC_REFRESH_INTERVAL = float(os.getenv("OIDC_REFRESH_INTERVAL", "300"))
+OIDC_FETCH_TIMEOUT = float(os.getenv("OIDC_FETCH_TIMEOUT", "5"))
+
+_MAX_AGE = re.compile(r"max-age=(\d+)")
+
+
+def _max_age(cache_control: Optional[str]) -> Optional[float]:
+    match = _MAX_AGE.search(cache_control or "")
+    return float(match.group(1)) if match else None
+
+
+class ProviderMetadataCache:
+    """
+    Discovery document plus ``jwks`` for one provider, shared through a file
+
+    Clients passed to ``attach`` (authlib OAuth apps) get the metadata
+    written into their ``server_metadata`` with ``_loaded_at`` set, which is
+    what stops authlib from fetching it again.
+    """
+    def __init__(
+        self,
+        url: str,
+        path: str = OIDC_CACHE_PATH,
+        ttl: float = OIDC_CACHE_TTL,
+        refresh_margin: float = OIDC_REFRESH_MARGIN,
+        timeout: float = OIDC_FETCH_TIMEOUT
+    ):
+        self.url = url
+        self.path = path
+        self.ttl = ttl
+        self.refresh_margin = refresh_margin
+        self.timeout = timeout
+        self.metadata: Dict[str, Any] = {}
+        self.fetched_at = 0.0
+        self.expires_at = 0.0
+        self._clients: List[Any] = []
+        self._refreshing: Optional[asyncio.Task] = None
+
+    @property
+    def stale(self) -> bool:
+        # A margin as long as the provider's max-age would make every entry
+        # stale as soon as it is written, and every worker refetch each round
+        margin = min(self.refresh_margin, (self.expires_at - self.fetched_at) / 2)
+        return time.time() > self.expires_at - margin
+
+    def attach(self, client):
+        """
+        Keep ``client.server_metadata`` filled from this cache
+        """
+        self._clients.append(client)
+        if not self.metadata:
+            self.load()
+        self._apply(client)
+
+    def _apply(self, client):
+        if self.metadata:
+            client.server_metadata.update(self.metadata, _loaded_at=self.fetched_at)
+
+    def _set(self, entry: dict):
+        self.metadata = entry["metadata"]
+        self.fetched_at = entry["fetched_at"]
+        self.expires_at = entry["expires_at"]
+        for client in self._clients:
+            self._apply(client)
+
+    def load(self) -> bool:
+        """
+        Read the cache file if it is newer than what we hold
+
+        Expired entries are loaded too: a stale copy beats none when the
+        provider is down.
+
+        Returns:
+            True if the file was read
+        """
+        try:
+            with open(self.path) as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return False
+        if entry.get("url") != self.url or entry.get("fetched_at", 0) <= self.fetched_at:
+            return False
+        self._set(entry)
+        return True
+
+    async def _fetch(self) -> dict:
+        # httpx comes with authlib; imported here to keep it out of app import
+        import httpx
+
+        async with httpx.AsyncClient(timeout=self.timeout) as client:
+            resp = await client.get(self.url)
+            resp.raise_for_status()
+            metadata = resp.json()
+            ttls = [self.ttl, _max_age(resp.headers.get("cache-control"))]
+            if metadata.get("jwks_uri"):
+                resp = await client.get(metadata["jwks_uri"])
+                resp.raise_for_status()
+                metadata["jwks"] = resp.json()
+                ttls.append(_max_age(resp.headers.get("cache-control")))
+        now = time.time()
+        return {
+            "url": self.url,
+            "fetched_at": now,
+            "expires_at": now + min(ttl for ttl in ttls if ttl is not None),
+            "metadata": metadata,
+        }
+
+    def _write(self, entry: dict):
+        # Write then rename, so readers never see a partial file
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".oidc-")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(entry, f)
+            os.replace(tmp_path, self.path)
+        except OSError:
+            os.unlink(tmp_path)
+            raise
+
+    @asynccontextmanager
+    async def _file_lock(self):
+        if fcntl is None:
+            yield
+            return
+        with open(self.path + ".lock", "a") as lock_file:
+            # Blocking flock off the event loop; the holder is at most one fetch away
+            await asyncio.get_running_loop().run_in_executor(None, fcntl.flock, lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    async def _refresh(self):
+        async with self._file_lock():
+            # Another worker may have refreshed while we waited on the lock
+            self.load()
+            if not self.stale:
+                return
+            entry = await self._fetch()
+            self._write(entry)
+            self._set(entry)
+            logger.info(f"Refreshed OpenID metadata from {self.url}")
+
+    async def refresh(self) -> bool:
+        """
+        Load the shared file and fetch from the provider if it is stale
+
+        Concurrent calls share one refresh. On failure the current metadata
+        is kept and the error propagates.
+
+        Returns:
+            True if metadata is available
+        """
+        self.load()
+        if self.stale:
+            if self._refreshing is None or self._refreshing.done():
+                self._refreshing = asyncio.create_task(self._refresh())
+            await asyncio.shield(self._refreshing)
+        return bool(self.metadata)
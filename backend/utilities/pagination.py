@@ -0,0 +1,92 @@
+"""
+Keyset (cursor) pagination helpers.
+
+A cursor is an opaque, URL-safe token holding the sort field, the sort
+direction and the last document's sort value plus ``_id``. The next page is
+fetched with a range query on ``(sort field, _id)`` instead of ``skip``, so
+every page costs the same regardless of how deep it is.
+"""
+import base64
+from typing import Any, List, Optional, Tuple
+
+from bson import ObjectId, json_util
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(sort_by: str, sort_order: int, doc: dict) -> str:
+    """
+    Build the continuation token pointing just past ``doc``
+    """
+    payload = {"s": sort_by, "o": sort_order, "v": doc.get(sort_by), "i": doc["_id"]}
+    raw = json_util.dumps(payload).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort_by: str, sort_order: int) -> Tuple[Any, ObjectId]:
+    """
+    Decode a continuation token into the last sort value and ``_id``
+
+    Raises:
+        ValueError: If the token is malformed or was issued for another sort
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json_util.loads(base64.urlsafe_b64decode(padded.encode()))
+        value, last_id = payload["v"], payload["i"]
+        issued_for = (payload["s"], payload["o"])
+    except Exception:
+        raise ValueError("Malformed cursor")
+    if not isinstance(last_id, ObjectId):
+        raise ValueError("Malformed cursor")
+    if issued_for != (sort_by, sort_order):
+        raise ValueError("Cursor was issued for a different sort order")
+    return value, last_id
+
+
+def sort_spec(sort_by: str, sort_order: int) -> List[Tuple[str, int]]:
+    """
+    Sort specification with ``_id`` as the tiebreaker, so the order is total
+    """
+    if sort_by == "_id":
+        return [("_id", sort_order)]
+    return [(sort_by, sort_order), ("_id", sort_order)]
+
+
+def keyset_filter(sort_by: str, sort_order: int, value: Any, last_id: ObjectId) -> dict:
+    """
+    Query matching the documents that sort strictly after (value, last_id)
+
+    Missing and null sort values sort before everything else in MongoDB, so
+    they come first in ascending order and last in descending order.
+    """
+    op = "$gt" if sort_order == 1 else "$lt"
+    if sort_by == "_id":
+        return {"_id": {op: last_id}}
+
+    same_value_after = {sort_by: value, "_id": {op: last_id}}
+    if value is None:
+        if sort_order == 1:
+            return {"$or": [same_value_after, {sort_by: {"$ne": None}}]}
+        return same_value_after
+
+    branches = [{sort_by: {op: value}}, same_value_after]
+    if sort_order == -1:
+        branches.append({sort_by: None})
+    return {"$or": branches}
+
+
+def apply_cursor(query: dict, sort_by: str, sort_order: int, cursor: Optional[str]) -> dict:
+    """
+    Restrict ``query`` to the page following ``cursor``, if one was given
+
+    Raises:
+        ValueError: If the cursor is invalid for this sort
+    """
+    if not cursor:
+        return query
+    value, last_id = decode_cursor(cursor, sort_by, sort_order)
+    after = keyset_filter(sort_by, sort_order, value, last_id)
+    if not query:
+        return after
+    return {"$and": [query, after]}
@@ -0,0 +1,237 @@
+# backend/utilities/response_cache.py
+"""
+ASGI middleware caching serialized responses of anonymous GET endpoints.
+
+Responses are stored as raw bytes under a total memory budget with LRU
+eviction, keyed on the path plus the sorted query string, and expire after a
+per-route TTL. Successful writes under /listings drop the affected entries by
+tag. Invalidation only reaches the worker that handled the write; other
+workers serve their copy until its TTL runs out, which is why the TTLs are
+short.
+
+Every response passing through a cached route carries ``X-Cache`` with
+``HIT``, ``MISS`` or ``BYPASS``.
+"""
+import os
+import re
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, FrozenSet, List, Optional, Pattern, Set, Tuple
+from urllib.parse import parse_qsl, urlencode
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+CACHE_STATUS_HEADER = "X-Cache"
+
+RESPONSE_CACHE_BYTES = int(os.getenv("RESPONSE_CACHE_BYTES", str(64 * 1024 * 1024)))
+# Larger responses are not worth evicting many small ones for
+RESPONSE_CACHE_MAX_ENTRY_BYTES = int(os.getenv("RESPONSE_CACHE_MAX_ENTRY_BYTES", str(1024 * 1024)))
+
+_LISTING_ID = re.compile(r"^/listings/([0-9a-fA-F]{24})(?:/|$)")
+
+# Tags: "listings" for anything built from many listings, "listing:<id>" for a
+# single listing and "listing-details" for every single listing entry
+CacheRule = Tuple[Pattern, float, Callable[[re.Match], FrozenSet[str]]]
+
+CACHE_RULES: List[CacheRule] = [
+    (re.compile(r"^/home/recent$"), 10, lambda m: frozenset({"listings"})),
+    (re.compile(r"^/search/$"), 10, lambda m: frozenset({"listings"})),
+    (re.compile(r"^/search/categories$"), 60, lambda m: frozenset({"listings"})),
+    (re.compile(r"^/listings/([0-9a-fA-F]{24})$"), 30,
+     lambda m: frozenset({f"listing:{m.group(1).lower()}", "listing-details"})),
+]
+
+
+class _Entry:
+    __slots__ = ("status", "headers", "body", "expires_at", "tags", "size", "stored_at")
+
+    def __init__(self, status: int, headers: List[Tuple[bytes, bytes]], body: bytes, ttl: float, tags: FrozenSet[str]):
+        self.status = status
+        self.headers = headers
+        self.body = body
+        self.stored_at = time.monotonic()
+        self.expires_at = self.stored_at + ttl
+        self.tags = tags
+        self.size = len(body) + sum(len(k) + len(v) for k, v in headers)
+
+
+class ResponseStore:
+    """
+    LRU store bounded by the total size of the stored responses
+    """
+    def __init__(self, max_bytes: int = RESPONSE_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._tags: Dict[str, Set[str]] = {}
+        # Bumped by every invalidation; a response rendered before one is not stored
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[_Entry]:
+        entry = self._entries.get(key)
+        if entry is None or entry.expires_at <= time.monotonic():
+            if entry is not None:
+                self._remove(key)
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry
+
+    def set(self, key: str, entry: _Entry):
+        if entry.size > self.max_bytes:
+            return
+        self._remove(key)
+        self._entries[key] = entry
+        self.bytes += entry.size
+        for tag in entry.tags:
+            self._tags.setdefault(tag, set()).add(key)
+        while self.bytes > self.max_bytes:
+            self._remove(next(iter(self._entries)))
+
+    def _remove(self, key: str):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        self.bytes -= entry.size
+        for tag in entry.tags:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+    def invalidate(self, *tags: str):
+        self.generation += 1
+        for tag in tags:
+            for key in list(self._tags.get(tag, ())):
+                self._remove(key)
+
+    def clear(self):
+        self._entries.clear()
+        self._tags.clear()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "entries": len(self._entries), "bytes": self.bytes, "max_bytes": self.max_bytes}
+
+
+response_store = ResponseStore()
+
+
+def cache_key(scope: Scope) -> str:
+    query = parse_qsl(scope.get("query_string", b"").decode("latin-1"), keep_blank_values=True)
+    return f"{scope['path']}?{urlencode(sorted(query))}"
+
+
+def _header(scope: Scope, name: bytes) -> Optional[bytes]:
+    for key, value in scope.get("headers", []):
+        if key == name:
+            return value
+    return None
+
+
+class ResponseCacheMiddleware:
+    def __init__(self, app: ASGIApp, store: ResponseStore = response_store, rules: List[CacheRule] = CACHE_RULES):
+        self.app = app
+        self.store = store
+        self.rules = rules
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        if scope["method"] in ("GET", "HEAD"):
+            await self._cached(scope, receive, send)
+        elif scope["path"].startswith("/listings"):
+            await self._invalidating(scope, receive, send)
+        else:
+            await self.app(scope, receive, send)
+
+    def _match(self, path: str) -> Optional[Tuple[float, FrozenSet[str]]]:
+        for pattern, ttl, tags in self.rules:
+            match = pattern.match(path)
+            if match:
+                return ttl, tags(match)
+        return None
+
+    async def _cached(self, scope: Scope, receive: Receive, send: Send):
+        rule = self._match(scope["path"])
+        if rule is None:
+            await self.app(scope, receive, send)
+            return
+
+        # Conditional and no-cache requests go to the route, which knows its validators
+        cache_control = _header(scope, b"cache-control") or b""
+        if _header(scope, b"if-none-match") is not None or b"no-cache" in cache_control:
+            await self.app(scope, receive, self._with_status(send, b"BYPASS"))
+            return
+
+        key = cache_key(scope)
+        entry = self.store.get(key)
+        if entry is not None:
+            age = str(int(time.monotonic() - entry.stored_at)).encode()
+            await send({
+                "type": "http.response.start",
+                "status": entry.status,
+                "headers": entry.headers + [(b"age", age), (CACHE_STATUS_HEADER.lower().encode(), b"HIT")],
+            })
+            await send({"type": "http.response.body", "body": b"" if scope["method"] == "HEAD" else entry.body})
+            return
+
+        ttl, tags = rule
+        start: Optional[Message] = None
+        chunks: List[bytes] = []
+        size = 0
+        cacheable = scope["method"] == "GET"
+        generation = self.store.generation
+
+        async def capture(message: Message):
+            nonlocal start, cacheable, size
+            if message["type"] == "http.response.start":
+                start = message
+                headers = list(message.get("headers", []))
+                if message["status"] != 200 or any(k.lower() == b"set-cookie" for k, _ in headers):
+                    cacheable = False
+                message = {**message, "headers": headers + [(CACHE_STATUS_HEADER.lower().encode(), b"MISS")]}
+            elif message["type"] == "http.response.body" and cacheable:
+                chunks.append(message.get("body", b""))
+                size += len(chunks[-1])
+                if size > RESPONSE_CACHE_MAX_ENTRY_BYTES:
+                    cacheable = False
+                    chunks.clear()
+                elif not message.get("more_body", False) and generation == self.store.generation:
+                    self.store.set(key, _Entry(start["status"], list(start.get("headers", [])), b"".join(chunks), ttl, tags))
+            await send(message)
+
+        await self.app(scope, receive, capture)
+
+    async def _invalidating(self, scope: Scope, receive: Receive, send: Send):
+        match = _LISTING_ID.match(scope["path"])
+
+        async def capture(message: Message):
+            if message["type"] == "http.response.start" and 200 <= message["status"] < 300:
+                if match:
+                    self.store.invalidate("listings", f"listing:{match.group(1).lower()}")
+                elif scope["path"].rstrip("/") == "/listings":
+                    # A new listing only shows up in lists
+                    self.store.invalidate("listings")
+                else:
+                    # Bulk and create routes: the ids are in the body, drop every listing
+                    self.store.invalidate("listings", "listing-details")
+            await send(message)
+
+        await self.app(scope, receive, capture)
+
+    @staticmethod
+    def _with_status(send: Send, status: bytes) -> Send:
+        async def wrapped(message: Message):
+            if message["type"] == "http.response.start":
+                message = {**message, "headers": list(message.get("headers", [])) + [(CACHE_STATUS_HEADER.lower().encode(), status)]}
+            await send(message)
+        return wrapped
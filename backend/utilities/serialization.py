@@ -0,0 +1,188 @@
+# backend/utilities/serialization.py
+"""
+Direct document -> JSON encoding for response models.
+
+Returning pydantic models from a route costs a validation in the repository
+(``ItemResponse(**doc)``) and another one in FastAPI's ``response_model``
+handling before the JSON is written. For trusted documents read back from
+Mongo, ``ModelEncoder`` does neither; it also accepts ``RawBSONDocument``. It precomputes one converter per model
+field from the field's annotation, then turns each document into a dict of
+JSON-ready values with the same output pydantic would produce.
+
+Routes keep their ``response_model`` for the OpenAPI schema and return a
+``ModelJSONResponse`` instance, which FastAPI sends as is.
+
+Clients can ask for a sparse fieldset (``?fields=title,price``): the same
+field list narrows the Mongo projection and selects the encoder used for the
+response.
+"""
+import json
+import typing
+from datetime import datetime
+from enum import Enum
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple, Type, Union
+
+from pydantic import BaseModel
+from pydantic_core import PydanticUndefined
+from starlette.responses import JSONResponse
+
+from backend.utilities.models import ItemResponse, MyRequestsResponse
+
+Converter = Callable[[Any], Any]
+
+
+def _str(value):
+    if value is None or isinstance(value, str):
+        return value
+    if isinstance(value, Enum):
+        return value.value
+    return str(value)
+
+
+def _float(value):
+    return None if value is None else float(value)
+
+
+def _int(value):
+    return None if value is None else int(value)
+
+
+def _datetime(value):
+    if value is None:
+        return None
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    text = value.isoformat()
+    # pydantic writes UTC as "Z"
+    if value.utcoffset() is not None and value.utcoffset().total_seconds() == 0:
+        text = text[:-6] + "Z"
+    return text
+
+
+def _list_of(convert: Converter) -> Converter:
+    def converter(values):
+        return None if values is None else [convert(v) for v in values]
+    return converter
+
+
+def _identity(value):
+    return value
+
+
+_SCALARS = {str: _str, float: _float, int: _int, datetime: _datetime}
+
+
+def _converter_for(annotation) -> Converter:
+    origin = typing.get_origin(annotation)
+    if origin is Union:
+        # Optional[X]: every converter passes None through
+        args = [arg for arg in typing.get_args(annotation) if arg is not type(None)]
+        return _converter_for(args[0]) if len(args) == 1 else _identity
+    if origin in (list, List):
+        return _list_of(_converter_for(typing.get_args(annotation)[0]))
+    if isinstance(annotation, type) and issubclass(annotation, Enum):
+        return _str
+    return _SCALARS.get(annotation, _identity)
+
+
+def parse_fields(model: Type[BaseModel], value: Optional[str]) -> Optional[Tuple[str, ...]]:
+    """
+    Parse a comma-separated sparse fieldset
+
+    Args:
+        model: The response model the fields belong to
+        value: The ``fields`` query parameter, None or empty for every field
+
+    Returns:
+        The field names in model order, always including ``id``, or None for every field
+
+    Raises:
+        ValueError: If a name is not a field of the model
+    """
+    if not value:
+        return None
+    requested = {name.strip() for name in value.split(",") if name.strip()}
+    unknown = requested - set(model.model_fields)
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}")
+    if "id" in model.model_fields:
+        requested.add("id")
+    return tuple(name for name in model.model_fields if name in requested)
+
+
+def model_projection(model: Type[BaseModel], fields: Optional[Sequence[str]] = None) -> Dict[str, Any]:
+    """
+    Mongo projection reading only the fields ``model`` is built from
+
+    ``id`` comes from ``_id``, which Mongo always returns.
+    """
+    return {name: 1 for name in model.model_fields if name != "id" and (fields is None or name in fields)}
+
+
+class ModelEncoder:
+    """
+    Encoder for one response model, built once at import
+    """
+    def __init__(self, model: Type[BaseModel], fields: Optional[Sequence[str]] = None):
+        self.model = model
+        self._plan: List[Tuple[str, Converter, Any]] = []
+        self._subsets: Dict[Tuple[str, ...], "ModelEncoder"] = {}
+        for name, field in model.model_fields.items():
+            if fields is not None and name not in fields:
+                continue
+            default = None if field.default is PydanticUndefined else field.default
+            self._plan.append((name, _converter_for(field.annotation), default))
+
+    def select(self, fields: Optional[Tuple[str, ...]]) -> "ModelEncoder":
+        """
+        Encoder writing only ``fields`` (as returned by parse_fields), built once per fieldset
+        """
+        if fields is None:
+            return self
+        encoder = self._subsets.get(fields)
+        if encoder is None:
+            encoder = self._subsets[fields] = ModelEncoder(self.model, fields)
+        return encoder
+
+    def to_dict(self, doc: Mapping) -> dict:
+        if "id" in self.model.model_fields and "id" not in doc and "_id" in doc:
+            doc = {**doc, "id": doc["_id"]}
+        return {
+            name: convert(doc[name]) if name in doc else (list(default) if isinstance(default, list) else default)
+            for name, convert, default in self._plan
+        }
+
+    def encode(self, content: Union[Mapping, Iterable[Mapping]]) -> bytes:
+        if isinstance(content, Mapping):
+            data = self.to_dict(content)
+        else:
+            data = [self.to_dict(doc) for doc in content]
+        # Same settings as starlette's JSONResponse
+        return json.dumps(data, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode("utf-8")
+
+
+class ModelJSONResponse(JSONResponse):
+    encoder: ModelEncoder
+
+    def __init__(self, content: Any, *args, encoder: Optional[ModelEncoder] = None, **kwargs):
+        # Set before JSONResponse renders the body
+        if encoder is not None:
+            self.encoder = encoder
+        super().__init__(content, *args, **kwargs)
+
+    def render(self, content: Any) -> bytes:
+        return self.encoder.encode(content)
+
+
+item_encoder = ModelEncoder(ItemResponse)
+my_requests_encoder = ModelEncoder(MyRequestsResponse)
+
+
+class ItemJSONResponse(ModelJSONResponse):
+    """Listing documents (or a single one) rendered as ItemResponse JSON"""
+    encoder = item_encoder
+
+
+class MyRequestsJSONResponse(ModelJSONResponse):
+    """Reservation request entries rendered as MyRequestsResponse JSON"""
+    encoder = my_requests_encoder
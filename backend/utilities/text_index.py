@@ -0,0 +1,209 @@
+"""
+In-memory inverted index with BM25 ranking.
+
+Documents are made of named text fields; each field's terms are weighted so
+a match in the title counts for more than one in the description. Queries
+are conjunctive (every term must match) and the last query term also matches
+as a prefix, so partially typed words still find results.
+"""
+import bisect
+import gzip
+import json
+import math
+import os
+import re
+import tempfile
+import unicodedata
+from collections import defaultdict
+from typing import Dict, List, Optional, Set, Tuple
+
+# Letters and digits in any script; underscores separate words
+_TOKEN_RE = re.compile(r"[^\W_]+")
+
+STOPWORDS = frozenset(
+    "a an and are as at be by for from in is it of on or the to with".split()
+)
+
+# Bumped whenever tokenize changes, so older snapshots are rebuilt
+SNAPSHOT_FORMAT = 2
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """
+    Lowercase, strip accents, split on non-alphanumerics and drop stopwords
+
+    Only combining marks are removed ("café" -> "cafe"); letters from
+    non-Latin scripts are kept as they are.
+    """
+    if not text:
+        return []
+    text = "".join(c for c in unicodedata.normalize("NFKD", text) if not unicodedata.combining(c)).lower()
+    # "student's" -> "students", which plural folding then maps to "student"
+    text = text.replace("'", "")
+    tokens = []
+    for token in _TOKEN_RE.findall(text):
+        if token in STOPWORDS:
+            continue
+        # Cheap plural folding: "bikes" and "bike" share a term
+        if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+            token = token[:-1]
+        tokens.append(token)
+    return tokens
+
+
+class TextIndex:
+    def __init__(self, field_weights: Dict[str, float], k1: float = 1.2, b: float = 0.75):
+        self.field_weights = field_weights
+        self.k1 = k1
+        self.b = b
+        self._postings: Dict[str, Dict[str, float]] = defaultdict(dict)
+        self._doc_terms: Dict[str, Dict[str, float]] = {}
+        self._doc_len: Dict[str, float] = {}
+        self._versions: Dict[str, Optional[str]] = {}
+        self._total_len = 0.0
+        self._vocabulary: Optional[List[str]] = None
+
+    def __len__(self) -> int:
+        return len(self._doc_terms)
+
+    def __contains__(self, doc_id: str) -> bool:
+        return doc_id in self._doc_terms
+
+    def doc_ids(self) -> Set[str]:
+        return set(self._doc_terms)
+
+    def version(self, doc_id: str) -> Optional[str]:
+        return self._versions.get(doc_id)
+
+    def add(self, doc_id: str, fields: Dict[str, Optional[str]], version: Optional[str] = None):
+        """
+        Index (or re-index) a document
+
+        Args:
+            doc_id: Document identifier
+            fields: Text per field name, fields without a weight are ignored
+            version: Opaque change stamp, used to detect stale entries
+        """
+        terms: Dict[str, float] = defaultdict(float)
+        for field, weight in self.field_weights.items():
+            for token in tokenize(fields.get(field)):
+                terms[token] += weight
+        self._store(doc_id, dict(terms), version)
+
+    def remove(self, doc_id: str):
+        terms = self._doc_terms.pop(doc_id, None)
+        if terms is None:
+            return
+        for term in terms:
+            postings = self._postings[term]
+            postings.pop(doc_id, None)
+            if not postings:
+                del self._postings[term]
+                self._vocabulary = None
+        self._total_len -= self._doc_len.pop(doc_id)
+        self._versions.pop(doc_id, None)
+
+    def _store(self, doc_id: str, terms: Dict[str, float], version: Optional[str]):
+        self.remove(doc_id)
+        for term, weight in terms.items():
+            if term not in self._postings:
+                self._vocabulary = None
+            self._postings[term][doc_id] = weight
+        length = sum(terms.values())
+        self._doc_terms[doc_id] = terms
+        self._doc_len[doc_id] = length
+        self._versions[doc_id] = version
+        self._total_len += length
+
+    def _expand_prefix(self, prefix: str) -> List[str]:
+        if self._vocabulary is None:
+            self._vocabulary = sorted(self._postings)
+        start = bisect.bisect_left(self._vocabulary, prefix)
+        end = bisect.bisect_left(self._vocabulary, prefix + "\U0010ffff")
+        return self._vocabulary[start:end]
+
+    def search(self, query: str, limit: Optional[int] = None) -> List[Tuple[str, float]]:
+        """
+        Rank the documents matching every query term
+
+        Returns:
+            (doc_id, score) pairs, best first
+        """
+        tokens = tokenize(query)
+        if not tokens or not self._doc_terms:
+            return []
+
+        # Each query position may match several index terms (prefix on the last one)
+        alternatives = [[token] for token in tokens[:-1]]
+        alternatives.append(self._expand_prefix(tokens[-1]))
+
+        doc_count = len(self._doc_terms)
+        avg_len = self._total_len / doc_count or 1.0
+        scores: Optional[Dict[str, float]] = None
+        for terms in alternatives:
+            position_scores: Dict[str, float] = defaultdict(float)
+            for term in terms:
+                postings = self._postings.get(term)
+                if not postings:
+                    continue
+                idf = math.log(1 + (doc_count - len(postings) + 0.5) / (len(postings) + 0.5))
+                for doc_id, tf in postings.items():
+                    norm = self.k1 * (1 - self.b + self.b * self._doc_len[doc_id] / avg_len)
+                    position_scores[doc_id] += idf * tf * (self.k1 + 1) / (tf + norm)
+            if scores is None:
+                scores = position_scores
+            else:
+                scores = {doc_id: score + position_scores[doc_id]
+                          for doc_id, score in scores.items() if doc_id in position_scores}
+            if not scores:
+                return []
+
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+        return ranked[:limit] if limit else ranked
+
+    def save(self, path: str):
+        """
+        Write a snapshot atomically, so a crash never leaves a truncated file
+
+        Each save writes its own temporary file before renaming it into
+        place, so concurrent writers cannot interleave.
+        """
+        payload = {
+            "format": SNAPSHOT_FORMAT,
+            "docs": {doc_id: [terms, self._versions.get(doc_id)] for doc_id, terms in self._doc_terms.items()},
+        }
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".search-index-")
+        try:
+            with os.fdopen(fd, "wb") as raw, gzip.open(raw, "wt", encoding="utf-8") as f:
+                json.dump(payload, f, separators=(",", ":"))
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    def load(self, path: str) -> bool:
+        """
+        Replace the contents with a snapshot, False if it is missing or unusable
+        """
+        try:
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                payload = json.load(f)
+        except (OSError, ValueError):
+            return False
+        if payload.get("format") != SNAPSHOT_FORMAT:
+            return False
+
+        self.clear()
+        for doc_id, (terms, version) in payload["docs"].items():
+            self._store(doc_id, terms, version)
+        return True
+
+    def clear(self):
+        self._postings = defaultdict(dict)
+        self._doc_terms = {}
+        self._doc_len = {}
+        self._versions = {}
+        self._total_len = 0.0
+        self._vocabulary = None
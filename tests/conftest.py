@@ -32,6 +32,10 @@ def test_db_setup(event_loop):
     client = AsyncIOMotorClient(mongo_uri)
     test_db = client["nyu_marketplace_test"]
 
+    # Build the declared indexes, as app startup does
+    from backend.db.indexes import ensure_indexes
+    event_loop.run_until_complete(ensure_indexes(test_db))
+
     # 2) Override get_database -> nyu_marketplace_test
     import backend.db.database
     async def override_get_database():
@@ -65,14 +69,37 @@ async def clear_listings_db():
 
     # clear before
     await db.Listings.delete_many({})
+    await db.reservations.delete_many({})
+    await db.stats.delete_many({})
+    await db.seller_counts.delete_many({})
 
     yield
 
     # clear after
     await db.Listings.delete_many({})
+    await db.reservations.delete_many({})
+    await db.stats.delete_many({})
+    await db.seller_counts.delete_many({})
     
     client.close()
 
+# ─── 3b) Start each test with empty in-process caches ─────────────────────────
+# Tests write to the database directly, behind the caches' back
+@pytest.fixture(autouse=True)
+def clear_caches():
+    from backend.db.cache import user_cache
+    from backend.db.text_search import listing_index, sync_state
+    from backend.db.featured import FeaturedSnapshot, featured
+    from backend.db.facets import facet_cache
+    from backend.utilities.response_cache import response_store
+    user_cache.clear()
+    response_store.clear()
+    facet_cache.clear()
+    featured.current = FeaturedSnapshot()
+    listing_index.clear()
+    sync_state.ready, sync_state.watermark, sync_state.rounds = False, None, 0
+    yield
+
 # ─── 4) Override authentication for all tests) Override authentication for all tests ────────────────────────────────
 @pytest.fixture(autouse=True)
 def override_get_current_user():
@@ -121,3 +121,58 @@ async def test_get_current_user_success_and_fail(monkeypatch):
     with pytest.raises(HTTPException) as exc3:
         await get_current_user(dummy3, db=None)
     assert exc3.value.status_code == status.HTTP_404_NOT_FOUND
+
+@pytest.mark.asyncio
+async def test_get_current_user_from_session_claims(monkeypatch):
+    from backend.app.auth import session_claims, revoke_session_claims
+    from backend.utilities.models import UserResponse
+
+    user = UserResponse(id='claims-uid', email='claims@nyu.edu', name='Claims', phone='050')
+    sess = {'user': session_claims(user)}
+
+    class NoDbRepo:
+        def __init__(self, db): pass
+        async def get_user_by_id(self, uid): raise AssertionError("database should not be used")
+    monkeypatch.setattr('backend.app.auth.UserRepository', NoDbRepo)
+
+    # fresh claims are served without touching the database
+    result = await get_current_user(DummyRequest({"type": "http"}, session=sess), db=None)
+    assert result.id == 'claims-uid' and result.phone == '050'
+
+    # after a profile change the claims are refreshed from the database
+    revoke_session_claims('claims-uid')
+    class UpdatedRepo:
+        def __init__(self, db): pass
+        async def get_user_by_id(self, uid): return UserResponse(id=uid, email='claims@nyu.edu', name='Claims', phone='051')
+    monkeypatch.setattr('backend.app.auth.UserRepository', UpdatedRepo)
+    result = await get_current_user(DummyRequest({"type": "http"}, session=sess), db=None)
+    assert result.phone == '051'
+    assert sess['user']['phone'] == '051'
+
+    # and the re-signed claims are trusted again
+    monkeypatch.setattr('backend.app.auth.UserRepository', NoDbRepo)
+    result = await get_current_user(DummyRequest({"type": "http"}, session=sess), db=None)
+    assert result.phone == '051'
+
+@pytest.mark.asyncio
+async def test_concurrent_first_logins_create_one_user(monkeypatch):
+    import os
+    from motor.motor_asyncio import AsyncIOMotorClient
+    from backend.db.cache import user_cache
+
+    email = "burst@nyu.edu"
+    user_cache.clear()
+    monkeypatch.setattr(
+        "backend.app.auth.oauth.google.authorize_access_token",
+        AsyncMock(return_value={"userinfo": {"email": email, "email_verified": True, "name": "Burst"}})
+    )
+
+    async with AsyncClient(app=app, base_url="http://test") as ac:
+        responses = await asyncio.gather(*(ac.get("/auth/callback") for _ in range(5)))
+    assert all(r.headers["location"].endswith("/auth/callback") for r in responses)
+
+    client = AsyncIOMotorClient(os.getenv("MONGO_DETAILS"))
+    users = await client["nyu_marketplace_test"].users.find({"email": email}).to_list(None)
+    client.close()
+    assert len(users) == 1
+    assert users[0]["name"] == "Burst" and users[0]["listings"] == []
@@ -0,0 +1,61 @@
+import os
+import time
+import pytest
+from bson import ObjectId
+from motor.motor_asyncio import AsyncIOMotorClient
+
+from backend.db.cache import MISSING, TTLCache
+from backend.db.repository import UserRepository
+from backend.utilities.models import UserCreate
+
+MONGO_URI = os.getenv("MONGO_DETAILS")
+TEST_DB_NAME = "nyu_marketplace_test"
+
+
+def test_ttl_cache_evicts_least_recently_used():
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1  # "b" is now the oldest
+    cache.set("c", 3)
+
+    assert cache.get("b") is MISSING
+    assert cache.get("a") == 1 and cache.get("c") == 3
+    assert cache.stats()["size"] == 2
+
+
+def test_ttl_cache_expires_entries():
+    cache = TTLCache(maxsize=10, ttl=60, negative_ttl=0.01)
+    cache.set("known", "user")
+    cache.set("unknown", None)
+    assert cache.get("unknown") is None
+    time.sleep(0.02)
+    assert cache.get("unknown") is MISSING
+    assert cache.get("known") == "user"
+
+
+@pytest.mark.asyncio
+async def test_user_repository_cache_and_invalidation():
+    client = AsyncIOMotorClient(MONGO_URI)
+    db = client[TEST_DB_NAME]
+    cache = TTLCache(maxsize=100, ttl=60)
+    repo = UserRepository(db, cache=cache)
+
+    user = await repo.create_user(UserCreate(email="cached@nyu.edu", name="Cached User"))
+    assert (await repo.get_user_by_id(user.id)).email == "cached@nyu.edu"
+    assert (await repo.get_user_by_email("cached@nyu.edu")).id == user.id
+    assert cache.misses == 0
+
+    # a write through the repository drops the stale entry
+    await repo.update_phone(user.id, "0501234567")
+    assert (await repo.get_user_by_id(user.id)).phone == "0501234567"
+
+    # unknown ids are negatively cached
+    unknown = str(ObjectId())
+    assert await repo.get_user_by_id(unknown) is None
+    hits = cache.hits
+    assert await repo.get_user_by_id(unknown) is None
+    assert cache.hits == hits + 1
+
+    await db.users.delete_one({"_id": ObjectId(user.id)})
+    client.close()
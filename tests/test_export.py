@@ -0,0 +1,79 @@
+import csv
+import io
+import json
+import os
+from datetime import datetime, timezone
+
+import pytest
+from bson import ObjectId
+from motor.motor_asyncio import AsyncIOMotorClient
+
+from backend.app import auth
+from backend.db.export import EXPORT_FIELDS, export_filter, export_listings
+
+MONGO_URI = os.getenv("MONGO_DETAILS")
+TEST_DB_NAME = "nyu_marketplace_test"
+TEST_USER_ID = "6812ab34fc012c5355f44c0e"
+OTHER_SELLER_ID = "6812ab34fc012c5355f44c0f"
+
+
+async def insert_listings(db):
+    now = datetime.now(timezone.utc)
+    docs = [
+        {"title": f"Item {i}", "description": "Line one\nline two", "price": 10 + i, "category": "books",
+         "status": "available", "created_at": now, "tags": ["a", "b"], "location": "Dorm",
+         "seller_id": ObjectId(TEST_USER_ID if i < 3 else OTHER_SELLER_ID)}
+        for i in range(5)
+    ]
+    result = await db.Listings.insert_many(docs)
+    return [str(i) for i in result.inserted_ids]
+
+
+@pytest.mark.asyncio
+async def test_export_reads_in_batches_and_resumes():
+    client = AsyncIOMotorClient(MONGO_URI)
+    db = client[TEST_DB_NAME]
+    ids = await insert_listings(db)
+
+    chunks = [chunk async for chunk in export_listings(db, "ndjson", export_filter(), batch_size=2)]
+    assert [str(last_id) for _, last_id in chunks] == [ids[1], ids[3], ids[4]]
+    rows = [json.loads(line) for text, _ in chunks for line in text.splitlines()]
+    assert [row["id"] for row in rows] == ids
+    assert list(rows[0]) == EXPORT_FIELDS
+    assert rows[0]["seller_id"] == TEST_USER_ID and rows[0]["tags"] == ["a", "b"]
+
+    # Resume after the first batch's checkpoint, seller filter applied on the server
+    query = export_filter(seller_id=TEST_USER_ID, after=ids[1])
+    resumed = [chunk async for chunk in export_listings(db, "ndjson", query, batch_size=2)]
+    assert [json.loads(line)["id"] for text, _ in resumed for line in text.splitlines()] == [ids[2]]
+
+    with pytest.raises(ValueError):
+        export_filter(after="not-an-id")
+    client.close()
+
+
+@pytest.mark.asyncio
+async def test_export_endpoint_streams_csv_for_admins(ac, monkeypatch):
+    client = AsyncIOMotorClient(MONGO_URI)
+    db = client[TEST_DB_NAME]
+    ids = await insert_listings(db)
+    client.close()
+
+    resp = await ac.get("/admin/export/listings")
+    assert resp.status_code == 403
+
+    monkeypatch.setattr(auth, "ADMIN_EMAILS", {"test@example.com"})
+    resp = await ac.get("/admin/export/listings", params={"format": "csv", "seller_id": TEST_USER_ID})
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("text/csv")
+    rows = list(csv.DictReader(io.StringIO(resp.text)))
+    assert [row["id"] for row in rows] == ids[:3]
+    assert rows[0]["description"] == "Line one\nline two"
+    assert rows[0]["tags"] == "a|b"
+
+    # Resuming sends no header, only the rest
+    resp = await ac.get("/admin/export/listings", params={"after": ids[3]})
+    assert [json.loads(line)["id"] for line in resp.text.splitlines()] == [ids[4]]
+
+    resp = await ac.get("/admin/export/listings", params={"format": "xml"})
+    assert resp.status_code == 422
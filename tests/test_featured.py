@@ -0,0 +1,64 @@
+import os
+import pytest
+from datetime import datetime, timedelta, timezone
+from bson import ObjectId
+from httpx import AsyncClient
+from motor.motor_asyncio import AsyncIOMotorClient
+
+from backend.db.featured import compute_featured, featured, refresh_featured, score_listing
+
+MONGO_URI = os.getenv("MONGO_DETAILS")
+TEST_DB_NAME = "nyu_marketplace_test"
+TEST_USER_ID = "6812ab34fc012c5355f44c0e"
+
+
+def test_score_prefers_recent_popular_and_typically_priced():
+    now = datetime.now(timezone.utc)
+    base = {"created_at": now, "price": 50, "reservation_count": 0}
+    assert score_listing(base, 50, now) > score_listing({**base, "created_at": now - timedelta(days=14)}, 50, now)
+    assert score_listing({**base, "reservation_count": 3}, 50, now) > score_listing(base, 50, now)
+    assert score_listing(base, 50, now) > score_listing({**base, "price": 5000}, 50, now)
+
+
+@pytest.mark.asyncio
+async def test_featured_served_from_snapshot(ac: AsyncClient):
+    client = AsyncIOMotorClient(MONGO_URI)
+    db = client[TEST_DB_NAME]
+    now = datetime.now(timezone.utc)
+    base = {
+        "description": "Featured listing test",
+        "condition": "good",
+        "location": "Dorm",
+        "images": ["https://example.com/img1.jpg", "https://example.com/img1.jpg"],
+        "seller_id": ObjectId(TEST_USER_ID),
+        "status": "available",
+        "price": 40,
+        "reservation_count": 0,
+    }
+    await db.Listings.insert_many([
+        {**base, "title": "New lamp", "category": "furniture", "created_at": now},
+        {**base, "title": "Old lamp", "category": "furniture", "created_at": now - timedelta(days=30)},
+        {**base, "title": "Popular phone", "category": "electronics_gadgets", "created_at": now, "reservation_count": 5},
+        {**base, "title": "Sold chair", "category": "furniture", "created_at": now, "status": "sold"},
+    ])
+
+    # nothing is served before the first ranking is loaded
+    assert (await ac.get("/home/featured")).json() == []
+
+    await compute_featured(db)
+    assert await refresh_featured(db)
+    assert not await refresh_featured(db)  # same generation, nothing to reload
+    await db.featured.delete_many({})
+    client.close()
+
+    resp = await ac.get("/home/featured", params={"limit": 3})
+    assert resp.status_code == 200
+    assert [item["title"] for item in resp.json()] == ["Popular phone", "New lamp", "Old lamp"]
+
+    resp = await ac.get("/home/featured", params={"category": "furniture"})
+    assert [item["title"] for item in resp.json()] == ["New lamp", "Old lamp"]
+
+    # a listing that gets sold leaves the snapshot right away
+    lamp_id = resp.json()[0]["id"]
+    await ac.post(f"/listings/{lamp_id}/sold")
+    assert "New lamp" not in [item["title"] for item in (await ac.get("/home/featured")).json()]
@@ -126,4 +126,44 @@ async def test_get_recent_with_category_filter_endpoint():
         assert len(data2) == 1
         item2 = ItemResponse(**data2[0])
         assert item2.id == str(apparel_doc["_id"])
-        assert item2.category == ItemCategory.APPAREL
\ No newline at end of file
+        assert item2.category == ItemCategory.APPAREL
+
+@pytest.mark.asyncio
+async def test_get_recent_cursor_pagination():
+    client = AsyncIOMotorClient(MONGO_URI)
+    db = client[TEST_DB_NAME]
+    now = datetime.now(timezone.utc)
+
+    # two listings share each timestamp, so _id has to break the ties
+    docs = [{
+        "_id": ObjectId(),
+        "title": f"paged {i}",
+        "description": "cursor test",
+        "seller_id": ObjectId(),
+        "price": i,
+        "status": "available",
+        "created_at": now - timedelta(minutes=i // 2),
+        "category": ItemCategory.BOOKS,
+    } for i in range(7)]
+    await db.Listings.insert_many(docs)
+    client.close()
+
+    async with AsyncClient(app=app, base_url="http://test") as ac:
+        seen = []
+        cursor = None
+        while True:
+            params = {"limit": 3}
+            if cursor:
+                params["cursor"] = cursor
+            resp = await ac.get("/home/recent", params=params)
+            assert resp.status_code == 200
+            seen += [d["id"] for d in resp.json()]
+            cursor = resp.headers.get("x-next-cursor")
+            if not cursor:
+                break
+
+        expected = sorted(docs, key=lambda d: (d["created_at"], d["_id"]), reverse=True)
+        assert seen == [str(d["_id"]) for d in expected]
+
+        resp = await ac.get("/home/recent", params={"cursor": "not-a-cursor"})
+        assert resp.status_code == 400
@@ -0,0 +1,72 @@
+import pytest
+from pymongo import monitoring
+
+from backend.db.database import PoolMonitor
+
+ADDRESS = ("localhost", 27017)
+
+
+def test_pool_monitor_tracks_checkouts_and_waits():
+    monitor = PoolMonitor()
+    monitor.pool_created(monitoring.PoolCreatedEvent(ADDRESS, {}))
+    for connection_id in (1, 2):
+        monitor.connection_created(monitoring.ConnectionCreatedEvent(ADDRESS, connection_id))
+
+    monitor.connection_check_out_started(monitoring.ConnectionCheckOutStartedEvent(ADDRESS))
+    monitor.connection_checked_out(monitoring.ConnectionCheckedOutEvent(ADDRESS, 1, 0.004))
+    monitor.connection_check_out_started(monitoring.ConnectionCheckOutStartedEvent(ADDRESS))
+
+    pool = monitor.snapshot()["localhost:27017"]
+    assert (pool["open"], pool["checked_out"], pool["available"], pool["waiting"]) == (2, 1, 1, 1)
+    assert pool["avg_wait_ms"] == 4.0
+
+    monitor.connection_check_out_failed(monitoring.ConnectionCheckOutFailedEvent(ADDRESS, "timeout", 0.5))
+    monitor.connection_checked_in(monitoring.ConnectionCheckedInEvent(ADDRESS, 1))
+    monitor.connection_closed(monitoring.ConnectionClosedEvent(ADDRESS, 2, "idle"))
+    pool = monitor.snapshot()["localhost:27017"]
+    assert (pool["open"], pool["checked_out"], pool["waiting"], pool["checkout_failures"]) == (1, 0, 0, 1)
+
+
+@pytest.mark.asyncio
+async def test_readiness_reports_ping_and_pool(ac):
+    resp = await ac.get("/health/ready")
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["status"] == "ready"
+    assert body["ping_ms"] >= 0
+    assert isinstance(body["pools"], dict)
+
+    resp = await ac.get("/health/live")
+    assert resp.json() == {"status": "ok"}
+
+
+@pytest.mark.asyncio
+async def test_stats_reports_background_tasks(ac):
+    from backend.main import app
+    from backend.db.tasks import PeriodicTask
+
+    async def work():
+        return 3
+
+    task = PeriodicTask("test_task", work, interval=60)
+    await task.run_once()
+    previous = getattr(app.state, "background_tasks", None)
+    app.state.background_tasks = [task]
+    try:
+        resp = await ac.get("/health/stats")
+    finally:
+        app.state.background_tasks = previous or []
+    assert resp.status_code == 200
+    stats = resp.json()["tasks"]["test_task"]
+    assert (stats["runs"], stats["failures"], stats["skipped"], stats["last_result"]) == (1, 0, 0, 3)
+    assert stats["last_run_at"]
+
+
+@pytest.mark.asyncio
+async def test_stats_reports_cache_counters(ac):
+    from backend.db.cache import user_cache
+
+    user_cache.get(("id", "not-cached"))
+    caches = (await ac.get("/health/stats")).json()["caches"]
+    assert caches["users"]["misses"] >= 1
+    assert {"hits", "misses", "entries", "bytes", "max_bytes"} <= set(caches["responses"])
@@ -0,0 +1,44 @@
+import os
+import pytest
+from motor.motor_asyncio import AsyncIOMotorClient
+
+from backend.db.indexes import INDEXES, ensure_indexes, index_drift
+
+MONGO_URI = os.getenv("MONGO_DETAILS")
+TEST_DB_NAME = "nyu_marketplace_test"
+
+
+@pytest.mark.asyncio
+async def test_ensure_indexes_builds_declared_indexes():
+    client = AsyncIOMotorClient(MONGO_URI)
+    db = client[TEST_DB_NAME]
+
+    await ensure_indexes(db)
+    drift = await index_drift(db)
+
+    for collection_name in INDEXES:
+        assert drift[collection_name]["missing"] == []
+        assert drift[collection_name]["mismatched"] == []
+
+    # a second run has nothing left to build
+    created = await ensure_indexes(db)
+    assert all(names == [] for names in created.values())
+    client.close()
+
+
+@pytest.mark.asyncio
+async def test_index_drift_reports_missing_and_extra():
+    client = AsyncIOMotorClient(MONGO_URI)
+    db = client[TEST_DB_NAME]
+
+    await ensure_indexes(db)
+    await db.Listings.drop_index("created")
+    await db.Listings.create_index("location", name="location_adhoc")
+
+    drift = await index_drift(db)
+    assert "created" in drift["Listings"]["missing"]
+    assert "location_adhoc" in drift["Listings"]["extra"]
+
+    await db.Listings.drop_index("location_adhoc")
+    await ensure_indexes(db)
+    client.close()
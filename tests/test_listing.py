@@ -7,6 +7,7 @@ from motor.motor_asyncio import AsyncIOMotorClient
 from types import AsyncGeneratorType
 from httpx import AsyncClient
 import datetime
+import json
 
 from backend.main import app
 from backend.db import database
@@ -78,3 +79,61 @@ async def test_delete_listing(ac):
     r2 = await ac.get(f"/listings/{listing_id}")
     assert r2.status_code == 404
 
+
+# ─── 8) Bulk import and update ──────────────────────────────────────────────
+def bulk_row(i: int) -> dict:
+    return {
+        "title":       f"Move-out item {i}",
+        "description": "Left over from move-out",
+        "price":       10 + i,
+        "condition":   "good",
+        "category":    "furniture",
+        "images":      ["https://example.com/a.jpg", "https://example.com/b.jpg"],
+    }
+
+@pytest.mark.asyncio
+async def test_bulk_create_json_and_ndjson(ac):
+    rows = [bulk_row(0), {**bulk_row(1), "price": -5}, bulk_row(2)]
+    r = await ac.post("/listings/bulk", json=rows)
+    assert r.status_code == 200
+    body = r.json()
+    assert (body["succeeded"], body["failed"]) == (2, 1)
+    assert body["results"][1]["id"] is None and "price" in body["results"][1]["error"]
+    r = await ac.get(f"/listings/{body['results'][2]['id']}")
+    assert r.json()["title"] == "Move-out item 2"
+
+    ndjson = "\n".join([json.dumps(bulk_row(3)), "{not json", json.dumps(bulk_row(4))])
+    r = await ac.post("/listings/bulk", content=ndjson, headers={"Content-Type": "application/x-ndjson"})
+    body = r.json()
+    assert [result["error"] is None for result in body["results"]] == [True, False, True]
+
+    r = await ac.get("/home/stats")
+    assert r.json()["listings"]["total"] == 4
+
+    r = await ac.post("/listings/bulk", json={"title": "not a list"})
+    assert r.status_code == 400
+
+@pytest.mark.asyncio
+async def test_bulk_update_status_and_price(ac):
+    r = await ac.post("/listings/bulk", json=[bulk_row(0), bulk_row(1)])
+    first, second = [result["id"] for result in r.json()["results"]]
+
+    updates = [
+        {"id": first, "status": "sold"},
+        {"id": second, "price": 99},
+        {"id": "6812ab34fc012c5355f44c99", "price": 1},
+        {"id": second},
+    ]
+    r = await ac.patch("/listings/bulk", json=updates)
+    assert r.status_code == 200
+    body = r.json()
+    assert (body["succeeded"], body["failed"]) == (2, 2)
+    assert body["results"][2]["error"] == "Listing not found"
+
+    assert (await ac.get(f"/listings/{first}")).json()["status"] == "sold"
+    assert (await ac.get(f"/listings/{second}")).json()["price"] == 99
+    stats = (await ac.get("/home/stats")).json()
+    assert stats["listings"]["by_status"] == {"available": 1, "sold": 1}
+
+    r = await ac.patch("/listings/bulk", json=[{"id": first, "status": "lost"}])
+    assert r.status_code == 422
@@ -0,0 +1,83 @@
+import os
+import asyncio
+import pytest
+from bson import ObjectId
+from motor.motor_asyncio import AsyncIOMotorClient
+
+from backend.db.loaders import UserLoader
+from backend.db.repository import UserRepository
+
+MONGO_URI = os.getenv("MONGO_DETAILS")
+TEST_DB_NAME = "nyu_marketplace_test"
+
+
+class CountingUserRepository(UserRepository):
+    def __init__(self, db):
+        super().__init__(db)
+        self.queries = 0
+
+    async def get_user_by_id(self, user_id):
+        self.queries += 1
+        return await super().get_user_by_id(user_id)
+
+    async def get_users_by_ids(self, user_ids):
+        self.queries += 1
+        return await super().get_users_by_ids(user_ids)
+
+
+@pytest.mark.asyncio
+async def test_user_loader_batches_and_memoizes():
+    client = AsyncIOMotorClient(MONGO_URI)
+    db = client[TEST_DB_NAME]
+    ids = [ObjectId() for _ in range(3)]
+    await db.users.insert_many([
+        {"_id": user_id, "email": f"loader{i}@nyu.edu", "name": f"Loader {i}", "phone": str(i)}
+        for i, user_id in enumerate(ids)
+    ])
+
+    repo = CountingUserRepository(db)
+    loader = UserLoader(repo)
+
+    # lookups issued in the same tick share one query; unknown ids resolve to None
+    users = await asyncio.gather(*(loader.load(str(user_id)) for user_id in ids), loader.load(str(ObjectId())))
+    assert [u.phone for u in users[:3]] == ["0", "1", "2"]
+    assert users[3] is None
+    assert repo.queries == 1
+
+    # repeated lookups in the same request are served from memory
+    again = await loader.load_many([str(user_id) for user_id in ids])
+    assert [u.id for u in again] == [str(user_id) for user_id in ids]
+    assert repo.queries == 1
+
+    await db.users.delete_many({"_id": {"$in": ids}})
+    client.close()
+
+
+class FailingUserRepository:
+    def __init__(self):
+        self.queries = 0
+
+    async def get_user_by_id(self, user_id):
+        self.queries += 1
+        raise RuntimeError("database unavailable")
+
+    async def get_users_by_ids(self, user_ids):
+        self.queries += 1
+        raise RuntimeError("database unavailable")
+
+
+@pytest.mark.asyncio
+async def test_user_loader_failure_reaches_every_caller_and_is_retried():
+    repo = FailingUserRepository()
+    loader = UserLoader(repo)
+
+    results = await asyncio.gather(loader.load("a"), loader.load("b"), loader.load("a"), return_exceptions=True)
+    assert all(isinstance(r, RuntimeError) for r in results)
+    assert repo.queries == 1
+    # The batch task was kept and has finished
+    assert loader._pending_task.done()
+
+    # Failed lookups are not memoized
+    with pytest.raises(RuntimeError):
+        await loader.load("a")
+    assert repo.queries == 2
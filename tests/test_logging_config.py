@@ -0,0 +1,107 @@
+import io
+import json
+import logging
+import queue
+import sys
+
+import pytest
+
+from backend.utilities import logging_config
+from backend.utilities.logging_config import (
+    JsonFormatter, RateLimitFilter, SampleFilter, configure_logging, parse_level, parse_levels, stop_logging
+)
+
+
+def make_record(level=logging.DEBUG, name="backend.test", msg="hello %s", args=("world",), **extra):
+    record = logging.LogRecord(name, level, __file__, 1, msg, args, None)
+    record.__dict__.update(extra)
+    return record
+
+
+def test_json_formatter_includes_extra_fields_and_traceback():
+    try:
+        raise RuntimeError("boom")
+    except RuntimeError:
+        record = logging.LogRecord("backend.test", logging.ERROR, __file__, 1, "failed %d", (3,), sys.exc_info())
+    record.listing_id = "abc"
+
+    entry = json.loads(JsonFormatter().format(record))
+    assert entry["level"] == "ERROR" and entry["logger"] == "backend.test"
+    assert entry["msg"] == "failed 3"
+    assert entry["listing_id"] == "abc"
+    assert "RuntimeError: boom" in entry["exc"]
+
+
+def test_rate_limit_drops_and_reports_debug():
+    limiter = RateLimitFilter(per_second=0.001, burst=2)
+    assert [limiter.filter(make_record()) for _ in range(5)] == [True, True, False, False, False]
+    # INFO and warnings pass by default and do not use tokens
+    assert limiter.filter(make_record(level=logging.INFO))
+    assert limiter.filter(make_record(level=logging.WARNING))
+    # Another logger has its own bucket
+    assert limiter.filter(make_record(name="backend.other"))
+
+    limiter._buckets["backend.test"][0] = 1
+    record = make_record()
+    assert limiter.filter(record)
+    assert record.dropped == 3
+
+
+def test_rate_limit_can_cover_info_but_never_warnings():
+    limiter = RateLimitFilter(per_second=0.001, burst=1, max_level=logging.ERROR)
+    assert [limiter.filter(make_record(level=logging.INFO)) for _ in range(2)] == [True, False]
+    assert limiter.filter(make_record(level=logging.WARNING))
+
+
+def test_sampling_only_applies_to_debug():
+    sampler = SampleFilter(0)
+    assert not sampler.filter(make_record())
+    assert sampler.filter(make_record(level=logging.INFO))
+
+
+def test_parse_levels():
+    assert parse_levels("backend.db=debug, pymongo=WARNING") == {"backend.db": logging.DEBUG, "pymongo": logging.WARNING}
+    assert parse_levels("") == {}
+    assert parse_level("info") == logging.INFO
+    with pytest.raises(ValueError):
+        parse_levels("backend.db")
+    with pytest.raises(ValueError):
+        parse_levels("backend.db=LOUD")
+
+
+def raise_full(record):
+    raise queue.Full()
+
+
+def test_records_are_written_by_the_listener(monkeypatch):
+    root = logging.getLogger()
+    previous = logging_config._queue_handler, logging_config._output, root.handlers[:], root.level
+    out = io.StringIO()
+    try:
+        handler = configure_logging(level="INFO", levels={"backend.quiet": logging.ERROR}, fmt="json", stream=out, force=True)
+        # The first configuration wins unless forced
+        assert configure_logging(fmt="text") is handler
+
+        logging.getLogger("backend.loud").info("kept %s", "value", extra={"request_id": 7})
+        logging.getLogger("backend.quiet").warning("filtered by the per-logger level")
+        logging.getLogger("backend.loud").debug("below the root level")
+
+        # Full queue: records are dropped, the caller never blocks
+        monkeypatch.setattr(handler.queue, "put_nowait", raise_full)
+        logging.getLogger("backend.loud").warning("dropped")
+        assert handler.dropped == 1
+        monkeypatch.undo()
+
+        stop_logging()
+        lines = [json.loads(line) for line in out.getvalue().splitlines()]
+        assert [line["msg"] for line in lines] == ["kept value"]
+        assert lines[0]["request_id"] == 7
+    finally:
+        # Put back whatever the app configured on import
+        stop_logging()
+        root.handlers[:] = previous[2]
+        root.setLevel(previous[3])
+        logging.getLogger("backend.quiet").setLevel(logging.NOTSET)
+        logging_config._queue_handler, logging_config._output = previous[:2]
+        if logging_config._queue_handler is not None:
+            logging_config._start_listener()
@@ -0,0 +1,117 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from authlib.integrations.starlette_client import OAuth
+
+from backend.utilities.oidc_cache import OIDC_REFRESH_MARGIN, ProviderMetadataCache
+
+JWKS = {"keys": [{"kty": "RSA", "kid": "stub-key", "n": "sXch", "e": "AQAB"}]}
+
+
+@pytest.fixture
+def provider():
+    """
+    Stub OpenID provider serving discovery and keys, counting requests
+    """
+    hits = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            base = f"http://127.0.0.1:{self.server.server_port}"
+            if self.path == "/.well-known/openid-configuration":
+                body = {
+                    "issuer": base,
+                    "authorization_endpoint": f"{base}/authorize",
+                    "token_endpoint": f"{base}/token",
+                    "jwks_uri": f"{base}/certs",
+                }
+                max_age = 3600
+            elif self.path == "/certs":
+                body, max_age = JWKS, 600
+            else:
+                self.send_error(404)
+                return
+            hits.append(self.path)
+            data = json.dumps(body).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Cache-Control", f"public, max-age={max_age}")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    server.url = f"http://127.0.0.1:{server.server_port}/.well-known/openid-configuration"
+    server.hits = hits
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.mark.asyncio
+async def test_metadata_fetched_once_and_shared_through_file(provider, tmp_path):
+    path = str(tmp_path / "oidc.json")
+    worker = ProviderMetadataCache(provider.url, path=path, refresh_margin=60)
+    assert await worker.refresh()
+    assert provider.hits == ["/.well-known/openid-configuration", "/certs"]
+    assert worker.metadata["jwks"] == JWKS
+    # The shorter max-age (keys) bounds the lifetime
+    assert 530 < worker.expires_at - worker.fetched_at <= 600
+
+    # A second worker loads the file instead of asking the provider
+    other = ProviderMetadataCache(provider.url, path=path, refresh_margin=60)
+    assert await other.refresh()
+    assert len(provider.hits) == 2
+
+    # authlib uses the attached metadata and keys without fetching them
+    oauth = OAuth()
+    oauth.register(name="stub", client_id="id", client_secret="secret", server_metadata_url=provider.url)
+    other.attach(oauth.stub)
+    metadata = await oauth.stub.load_server_metadata()
+    assert metadata["token_endpoint"].endswith("/token")
+    assert await oauth.stub.fetch_jwk_set() == JWKS
+    assert len(provider.hits) == 2
+
+
+@pytest.mark.asyncio
+async def test_stale_metadata_refreshed_and_kept_when_provider_is_down(provider, tmp_path):
+    path = str(tmp_path / "oidc.json")
+    # A zero TTL makes every entry stale right away
+    worker = ProviderMetadataCache(provider.url, path=path, ttl=0)
+    oauth = OAuth()
+    oauth.register(name="stub", client_id="id", client_secret="secret", server_metadata_url=provider.url)
+    worker.attach(oauth.stub)
+
+    await worker.refresh()
+    first_fetch = worker.fetched_at
+    await worker.refresh()
+    assert len(provider.hits) == 4
+    assert worker.fetched_at > first_fetch
+    assert oauth.stub.server_metadata["_loaded_at"] == worker.fetched_at
+
+    provider.shutdown()
+    provider.server_close()
+    restarted = ProviderMetadataCache(provider.url, path=path, ttl=0, timeout=1)
+    with pytest.raises(Exception):
+        await restarted.refresh()
+    # Offline: the stale copy from the file is still served
+    assert restarted.metadata["jwks"] == JWKS
+
+
+@pytest.mark.asyncio
+async def test_default_margin_longer_than_max_age_keeps_entries_fresh(provider, tmp_path):
+    # The stub's max-ages (3600s, 600s) are at most the default margin
+    assert OIDC_REFRESH_MARGIN >= 600
+    worker = ProviderMetadataCache(provider.url, path=str(tmp_path / "oidc.json"))
+    await worker.refresh()
+    assert not worker.stale
+    await worker.refresh()
+    await ProviderMetadataCache(provider.url, path=str(tmp_path / "oidc.json")).refresh()
+    assert len(provider.hits) == 2
@@ -159,4 +159,145 @@ async def test_get_reservations_reserved_branch(ac):
     assert rv["buyer_id"] == TEST_USER_ID
     assert rv["status"] == "confirmed"
     # ensure the timestamp fields were parsed back to ISO strings by the endpoint
-    assert "requested_at" in rv and "expires_at" in rv
\ No newline at end of file
+    assert "requested_at" in rv and "expires_at" in rv
+
+@pytest.mark.asyncio
+async def test_confirm_conflict_and_cancel_reopens_listing(ac):
+    resp = await ac.post("/listings/", json={
+        "title": "Contended Item",
+        "description": "Two buyers, one confirmation",
+        "price": 90,
+        "condition": "good",
+        "category": "electronics_gadgets",
+        "tags": ["contended"],
+        "location": "Dorm",
+        "images": ["https://example.com/img1.jpg", "https://example.com/img1.jpg"]
+    })
+    item_id = resp.json()["id"]
+
+    await ac.post(f"/listings/{item_id}/request/{TEST_USER_ID}")
+    await ac.post(f"/listings/{item_id}/request/{OTHER_USER_ID}")
+
+    resp = await ac.post(f"/listings/{item_id}/confirm", json={"buyer_id": TEST_USER_ID})
+    assert resp.status_code == 200
+
+    # a second confirmation for a different buyer loses the race
+    resp = await ac.post(f"/listings/{item_id}/confirm", json={"buyer_id": OTHER_USER_ID})
+    assert resp.status_code == 409
+
+    # cancelling the confirmed buyer puts the listing back on the market
+    resp = await ac.delete(f"/listings/{item_id}/cancel_reservation", params={"buyer_id": TEST_USER_ID})
+    assert resp.status_code == 200
+
+    listing = (await ac.get(f"/listings/{item_id}")).json()
+    assert listing["status"] == "available"
+    assert listing["buyerId"] is None
+    assert listing["reservation_count"] == 1
+
+@pytest.mark.asyncio
+async def test_expired_requests_filtered_and_timestamps_migrated(ac):
+    from datetime import datetime, timedelta, timezone
+    from backend.db.database import client
+    from backend.db.migrations import migrate_reservation_timestamps
+
+    resp = await ac.post("/listings/", json={
+        "title": "Timestamp Item",
+        "description": "Legacy and expired requests",
+        "price": 30,
+        "condition": "good",
+        "category": "electronics_gadgets",
+        "tags": ["timestamps"],
+        "location": "Dorm",
+        "images": ["https://example.com/img1.jpg", "https://example.com/img1.jpg"]
+    })
+    item_id = resp.json()["id"]
+    await ac.post(f"/listings/{item_id}/request/{TEST_USER_ID}")
+
+    # one request written before timestamps were native, one already expired
+    test_db = client["nyu_marketplace_test"]
+    now = datetime.now(timezone.utc)
+    await test_db.reservations.insert_many([
+        {"listing_id": ObjectId(item_id), "buyer_id": ObjectId(OTHER_USER_ID), "status": "pending",
+         "requested_at": now.isoformat(), "expires_at": (now + timedelta(days=7)).isoformat()},
+        {"listing_id": ObjectId(item_id), "buyer_id": ObjectId(), "status": "pending",
+         "requested_at": now - timedelta(days=8), "expires_at": now - timedelta(days=1)},
+    ])
+    await test_db.Listings.update_one({"_id": ObjectId(item_id)}, {"$set": {"reservation_count": 3}})
+
+    data = (await ac.get(f"/listings/{item_id}/reservations")).json()
+    assert {r["buyer_id"] for r in data} == {TEST_USER_ID, OTHER_USER_ID}
+
+    assert await migrate_reservation_timestamps(test_db, pause=0) == 1
+    legacy = await test_db.reservations.find_one({"buyer_id": ObjectId(OTHER_USER_ID)})
+    assert isinstance(legacy["requested_at"], datetime)
+    assert isinstance(legacy["expires_at"], datetime)
+
+    # a second run has nothing left to convert
+    assert await migrate_reservation_timestamps(test_db, pause=0) == 0
+    await test_db.migrations.delete_many({})
+
+
+class RacingReservations:
+    """
+    Reservations collection whose bulk writes report errors, as if another
+    request inserted the same (listing_id, buyer_id) pairs first
+    """
+    def __init__(self, collection, code):
+        self.collection = collection
+        self.code = code
+
+    async def bulk_write(self, ops, ordered=True):
+        from pymongo.errors import BulkWriteError
+
+        await self.collection.bulk_write(ops, ordered=ordered)
+        raise BulkWriteError({"writeErrors": [{"index": 0, "code": self.code, "errmsg": "write failed"}]})
+
+
+@pytest.mark.asyncio
+async def test_embedded_reservations_migrated(ac):
+    from types import SimpleNamespace
+    from pymongo.errors import BulkWriteError
+    from backend.db.database import client
+    from backend.db.migrations import migrate_embedded_reservations
+
+    resp = await ac.post("/listings/", json={
+        "title": "Embedded Item",
+        "description": "Requests stored on the listing",
+        "price": 40,
+        "condition": "good",
+        "category": "electronics_gadgets",
+        "tags": ["embedded"],
+        "location": "Dorm",
+        "images": ["https://example.com/img1.jpg", "https://example.com/img1.jpg"]
+    })
+    item_id = ObjectId(resp.json()["id"])
+    # The new code path already wrote this user's request
+    await ac.post(f"/listings/{item_id}/request/{TEST_USER_ID}")
+
+    test_db = client["nyu_marketplace_test"]
+    existing = await test_db.reservations.find_one({"listing_id": item_id, "buyer_id": ObjectId(TEST_USER_ID)})
+    embedded = [
+        {"buyer_id": TEST_USER_ID, "status": "pending", "requested_at": "2024-01-01T00:00:00+00:00"},
+        {"buyer_id": OTHER_USER_ID, "status": "pending", "requested_at": "2024-01-02T00:00:00+00:00"},
+    ]
+    await test_db.Listings.update_one({"_id": item_id}, {"$set": {"reservation_requests": embedded}})
+
+    # Any other write error stops the run with the embedded array left in place
+    failing = SimpleNamespace(Listings=test_db.Listings, reservations=RacingReservations(test_db.reservations, 121))
+    with pytest.raises(BulkWriteError):
+        await migrate_embedded_reservations(failing)
+    assert "reservation_requests" in await test_db.Listings.find_one({"_id": item_id})
+
+    # Duplicate keys from a concurrent request count as already migrated
+    racing = SimpleNamespace(Listings=test_db.Listings, reservations=RacingReservations(test_db.reservations, 11000))
+    assert await migrate_embedded_reservations(racing) == 1
+    assert "reservation_requests" not in await test_db.Listings.find_one({"_id": item_id})
+
+    reservations = await test_db.reservations.find({"listing_id": item_id}).to_list(length=None)
+    assert {r["buyer_id"] for r in reservations} == {ObjectId(TEST_USER_ID), ObjectId(OTHER_USER_ID)}
+    # The request written by the application was not overwritten
+    kept = next(r for r in reservations if r["buyer_id"] == ObjectId(TEST_USER_ID))
+    assert kept["requested_at"] == existing["requested_at"]
+
+    # Nothing left to move on a second run
+    assert await migrate_embedded_reservations(test_db) == 0
@@ -0,0 +1,62 @@
+import pytest
+from httpx import AsyncClient
+
+from backend.utilities.response_cache import ResponseStore, _Entry
+
+
+def entry(body: bytes, tags=frozenset()):
+    return _Entry(200, [], body, ttl=60, tags=frozenset(tags))
+
+
+def test_store_evicts_least_recently_used_within_budget():
+    store = ResponseStore(max_bytes=25)
+    store.set("a", entry(b"x" * 10))
+    store.set("b", entry(b"x" * 10))
+    assert store.get("a") is not None  # "b" is now the oldest
+    store.set("c", entry(b"x" * 10))
+
+    assert store.get("b") is None
+    assert store.get("a") is not None and store.get("c") is not None
+    assert store.bytes == 20
+
+
+def test_store_invalidates_by_tag():
+    store = ResponseStore()
+    store.set("/search/?q=lamp", entry(b"[]", {"listings"}))
+    store.set("/listings/1", entry(b"{}", {"listing:1"}))
+    store.invalidate("listings")
+    assert store.get("/search/?q=lamp") is None
+    assert store.get("/listings/1") is not None
+
+
+@pytest.mark.asyncio
+async def test_listing_detail_cached_until_written(ac: AsyncClient):
+    resp = await ac.post("/listings/", json={
+        "title": "Cached Item",
+        "description": "Served from the response cache",
+        "price": 10,
+        "condition": "good",
+        "category": "electronics_gadgets",
+        "tags": ["cache"],
+        "location": "Library",
+        "images": ["https://example.com/img.jpg", "https://example.com/img.jpg"]
+    })
+    item_id = resp.json()["id"]
+
+    first = await ac.get(f"/listings/{item_id}")
+    assert first.headers["x-cache"] == "MISS"
+    second = await ac.get(f"/listings/{item_id}")
+    assert second.headers["x-cache"] == "HIT"
+    assert second.json() == first.json()
+
+    # query parameter order does not matter
+    await ac.get("/search/", params=[("q", "cached"), ("limit", "5")])
+    assert (await ac.get("/search/", params=[("limit", "5"), ("q", "cached")])).headers["x-cache"] == "HIT"
+
+    resp = await ac.put(f"/listings/{item_id}", json={"price": 12})
+    assert resp.status_code == 200
+
+    updated = await ac.get(f"/listings/{item_id}")
+    assert updated.headers["x-cache"] == "MISS"
+    assert updated.json()["price"] == 12
+    assert (await ac.get("/search/", params=[("q", "cached"), ("limit", "5")])).headers["x-cache"] == "MISS"
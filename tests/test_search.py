@@ -165,3 +165,188 @@ async def test_search_by_status_and_buyer():
         assert item.status == ListingStatus.RESERVED.value
         assert item.buyerId == "buyer123"
 
+
+@pytest.mark.asyncio
+async def test_search_cursor_pagination_by_price():
+    client = AsyncIOMotorClient(MONGO_URI)
+    db = client[TEST_DB_NAME]
+    now = datetime.now(timezone.utc)
+    docs = [
+        {"title": f"P{i}", "description": "", "price": price, "condition": "good", "category": ItemCategory.MISC.value, "status": "available", "created_at": now, "seller_id": TEST_USER_ID}
+        for i, price in enumerate([30, 10, 20, 10, 40])
+    ]
+    await db.Listings.insert_many(docs)
+    client.close()
+
+    async with AsyncClient(app=app, base_url="http://test") as ac:
+        prices = []
+        params = {"sort_by": "price", "sort_order": 1, "limit": 2}
+        while True:
+            resp = await ac.get("/search/", params=params)
+            assert resp.status_code == 200
+            prices += [item["price"] for item in resp.json()]
+            cursor = resp.headers.get("x-next-cursor")
+            if not cursor:
+                break
+            params["cursor"] = cursor
+        assert prices == [10, 10, 20, 30, 40]
+
+        # a cursor only continues the sort it was issued for
+        resp = await ac.get("/search/", params={"sort_by": "created_at", "cursor": params["cursor"]})
+        assert resp.status_code == 400
+
+@pytest.mark.asyncio
+async def test_search_sparse_fieldset_and_images_limit():
+    client = AsyncIOMotorClient(MONGO_URI)
+    db = client[TEST_DB_NAME]
+    now = datetime.now(timezone.utc)
+    docs = [
+        {"title": f"Desk {i}", "description": "Long description " * 20, "price": 10 * (i + 1), "condition": "good", "category": ItemCategory.FURNITURE.value,
+         "status": "available", "created_at": now, "seller_id": TEST_USER_ID, "images": [f"{i}-a.jpg", f"{i}-b.jpg", f"{i}-c.jpg"]}
+        for i in range(3)
+    ]
+    await db.Listings.insert_many(docs)
+    client.close()
+
+    async with AsyncClient(app=app, base_url="http://test") as ac:
+        params = {"fields": "title,price,images", "images_limit": 1, "sort_by": "price", "sort_order": 1, "limit": 2}
+        resp = await ac.get("/search/", params=params)
+        assert resp.status_code == 200
+        items = resp.json()
+        assert [set(item) for item in items] == [{"id", "title", "price", "images"}] * 2
+        assert [item["images"] for item in items] == [["0-a.jpg"], ["1-a.jpg"]]
+
+        # the cursor still works when the sort field is not returned
+        resp = await ac.get("/search/", params={**params, "cursor": resp.headers["x-next-cursor"]})
+        assert [item["title"] for item in resp.json()] == ["Desk 2"]
+
+        resp = await ac.get("/home/recent", params={"fields": "status", "images_limit": 0})
+        assert resp.status_code == 200
+        assert all(set(item) == {"id", "status"} for item in resp.json())
+
+        resp = await ac.get("/search/", params={"fields": "title,reservation_requests"})
+        assert resp.status_code == 400
+        assert "reservation_requests" in resp.json()["detail"]
+
+@pytest.mark.asyncio
+async def test_search_uses_text_index_when_ready():
+    from backend.db.text_search import listing_index, sync_listing_index
+
+    client = AsyncIOMotorClient(MONGO_URI)
+    db = client[TEST_DB_NAME]
+    now = datetime.now(timezone.utc)
+    base = {
+        "condition": "good",
+        "category": ItemCategory.FURNITURE.value,
+        "location": "Dorm",
+        "status": "available",
+        "created_at": now,
+        "seller_id": TEST_USER_ID,
+    }
+    await db.Listings.insert_many([
+        {**base, "title": "Wooden desk", "description": "Solid oak", "price": 80},
+        {**base, "title": "Desk lamp", "description": "Bright light for any desk", "price": 15},
+        {**base, "title": "Bookshelf", "description": "Fits next to a desk", "price": 40, "status": "sold"},
+        {**base, "title": "Regex (test)", "description": "Parentheses in the title", "price": 5},
+        {**base, "title": "كتاب جديد", "description": "رواية عربية", "price": 12},
+    ])
+    await sync_listing_index(db)
+    assert len(listing_index) == 5
+    client.close()
+
+    async with AsyncClient(app=app, base_url="http://test") as ac:
+        # structured filters still apply to the keyword matches
+        resp = await ac.get("/search/", params={"q": "desk", "status": "available", "sort_by": "price", "sort_order": 1})
+        assert [item["title"] for item in resp.json()] == ["Desk lamp", "Wooden desk"]
+
+        resp = await ac.get("/search/", params={"q": "desk", "sort_by": "relevance"})
+        assert resp.status_code == 200
+        assert resp.json()[0]["title"] in ("Wooden desk", "Desk lamp")
+        assert len(resp.json()) == 3
+
+        # user input is never interpreted as a pattern
+        resp = await ac.get("/search/", params={"q": "regex (test"})
+        assert [item["title"] for item in resp.json()] == ["Regex (test)"]
+
+        # non-Latin titles are indexed, prefixes included (relevance needs the index)
+        for q in ("كتاب", "كت"):
+            resp = await ac.get("/search/", params={"q": q, "sort_by": "relevance"})
+            assert [item["title"] for item in resp.json()] == ["كتاب جديد"]
+
+        # a query of stopwords has no terms to look up and falls back to substring matching
+        resp = await ac.get("/search/", params={"q": "the"})
+        assert "Regex (test)" in [item["title"] for item in resp.json()]
+
+        resp = await ac.get("/search/", params={"sort_by": "relevance"})
+        assert resp.status_code == 400
+
+        # only indexed sort fields and directions are accepted
+        for params in ({"sort_by": "title"}, {"sort_by": "$where"}, {"sort_order": 0}, {"sort_order": "up"}):
+            resp = await ac.get("/search/", params=params)
+            assert resp.status_code == 422
+
+@pytest.mark.asyncio
+async def test_search_keeps_every_match_beyond_the_candidate_cap(monkeypatch):
+    from backend.app import search
+    from backend.db.text_search import sync_listing_index
+
+    client = AsyncIOMotorClient(MONGO_URI)
+    db = client[TEST_DB_NAME]
+    now = datetime.now(timezone.utc)
+    await db.Listings.insert_many([
+        {"title": f"Desk {i}", "description": "Study desk", "price": 10 * i, "condition": "good",
+         "category": ItemCategory.BOOKS.value if i % 2 else ItemCategory.FURNITURE.value,
+         "status": "available", "created_at": now, "seller_id": TEST_USER_ID}
+        for i in range(1, 8)
+    ])
+    await sync_listing_index(db, full=True)
+    client.close()
+
+    # Seven matches, handed to Mongo two at a time
+    monkeypatch.setattr(search, "MAX_CANDIDATES", 2)
+    params = {"q": "desk", "category": ItemCategory.FURNITURE.value, "sort_by": "price", "sort_order": 1, "limit": 2}
+    async with AsyncClient(app=app, base_url="http://test") as ac:
+        resp = await ac.get("/search/", params=params)
+        assert [item["price"] for item in resp.json()] == [20, 40]
+        resp = await ac.get("/search/", params={**params, "cursor": resp.headers["X-Next-Cursor"]})
+        assert [item["price"] for item in resp.json()] == [60]
+        assert "X-Next-Cursor" not in resp.headers
+
+        resp = await ac.get("/search/", params={"q": "desk", "category": ItemCategory.FURNITURE.value, "sort_by": "relevance", "limit": 10})
+        assert sorted(item["price"] for item in resp.json()) == [20, 40, 60]
+
+@pytest.mark.asyncio
+async def test_facets_cached_with_etag_and_invalidated_on_write(ac):
+    client = AsyncIOMotorClient(MONGO_URI)
+    db = client[TEST_DB_NAME]
+    now = datetime.now(timezone.utc)
+    await db.Listings.insert_many([
+        {"title": "Book", "price": 5, "condition": "good", "category": ItemCategory.BOOKS.value, "status": "available", "created_at": now, "seller_id": TEST_USER_ID},
+        {"title": "Lamp", "price": 9, "condition": "used", "category": ItemCategory.FURNITURE.value, "status": "sold", "created_at": now, "seller_id": TEST_USER_ID},
+    ])
+
+    resp = await ac.get("/search/facets")
+    assert resp.status_code == 200
+    facets = resp.json()
+    assert facets["categories"][ItemCategory.BOOKS.value] == 1
+    assert facets["categories"][ItemCategory.APPAREL.value] == 0
+    assert facets["statuses"] == {"available": 1, "reserved": 0, "sold": 1}
+    etag = resp.headers["etag"]
+
+    resp = await ac.get("/search/facets", headers={"If-None-Match": etag})
+    assert resp.status_code == 304
+
+    # writes behind the repository's back are only seen after the TTL...
+    await db.Listings.insert_one({"title": "Shirt", "price": 3, "condition": "good", "category": ItemCategory.APPAREL.value, "status": "available", "created_at": now, "seller_id": TEST_USER_ID})
+    assert (await ac.get("/search/facets", headers={"If-None-Match": etag})).status_code == 304
+    client.close()
+
+    # ...while a write through the repository invalidates right away
+    await ac.post("/listings/", json={
+        "title": "Desk", "description": "Invalidates the facets", "price": 40, "condition": "good",
+        "category": ItemCategory.FURNITURE.value, "tags": [], "location": "Dorm",
+        "images": ["https://example.com/img.jpg", "https://example.com/img.jpg"]
+    })
+    resp = await ac.get("/search/categories", headers={"If-None-Match": etag})
+    assert resp.status_code == 200
+    assert resp.json() == sorted([ItemCategory.APPAREL.value, ItemCategory.BOOKS.value, ItemCategory.FURNITURE.value])
@@ -0,0 +1,108 @@
+from datetime import datetime, timedelta, timezone
+
+import bson
+from bson import ObjectId
+from bson.raw_bson import RawBSONDocument
+from fastapi.encoders import jsonable_encoder
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+from starlette.responses import JSONResponse
+from typing import List
+
+import pytest
+
+from backend.utilities.models import ItemCategory, ItemResponse, MyRequestsResponse
+from backend.utilities.serialization import (
+    ItemJSONResponse, MyRequestsJSONResponse, item_encoder, model_projection, parse_fields
+)
+
+
+async def fastapi_body(model, content):
+    """
+    What FastAPI sends today: the repository builds models, response_model serializes them
+    """
+    if isinstance(content, list):
+        field = create_response_field(name="response", type_=List[model])
+    else:
+        field = create_response_field(name="response", type_=model)
+    return JSONResponse(jsonable_encoder(await serialize_response(field=field, response_content=content))).body
+
+
+def item_docs():
+    now = datetime.now(timezone.utc)
+    return [
+        {
+            "_id": ObjectId(), "title": "Lämp", "description": "Desk lamp", "price": 150,
+            "category": ItemCategory.FURNITURE, "status": "available", "seller_id": ObjectId(),
+            "created_at": now, "tags": ["light"], "location": "Dorm",
+        },
+        {
+            "_id": ObjectId(), "title": "Book", "description": "Used", "price": 9.99,
+            "category": "books", "status": "sold", "seller_id": ObjectId(),
+            "created_at": now.isoformat(), "updated_at": datetime(2026, 1, 1, 3, 4, 5),
+            "images": ["a.jpg"], "reservation_count": 2, "buyerId": ObjectId(), "condition": "good",
+        },
+        {
+            "_id": ObjectId(), "title": "Chair", "description": "", "price": 0,
+            "category": "furniture", "status": "reserved", "seller_id": ObjectId(),
+            "created_at": datetime(2026, 1, 1, tzinfo=timezone(timedelta(hours=5))),
+        },
+    ]
+
+
+def as_models(docs):
+    models = []
+    for doc in docs:
+        doc = {**doc, "id": str(doc["_id"]), "seller_id": str(doc["seller_id"])}
+        if doc.get("buyerId") is not None:
+            doc["buyerId"] = str(doc["buyerId"])
+        models.append(ItemResponse(**doc))
+    return models
+
+
+@pytest.mark.asyncio
+async def test_item_encoder_matches_response_model_output():
+    docs = item_docs()
+    assert ItemJSONResponse(docs).body == await fastapi_body(ItemResponse, as_models(docs))
+    assert ItemJSONResponse(docs[1]).body == await fastapi_body(ItemResponse, as_models(docs)[1])
+    assert ItemJSONResponse([]).body == b"[]"
+
+
+@pytest.mark.asyncio
+async def test_my_requests_encoder_matches_response_model_output():
+    now = datetime.now(timezone.utc)
+    entries = [
+        {"listing_id": "a", "title": "Lamp", "seller_id": "s", "requested_at": now, "status": "confirmed", "seller_phone": "123"},
+        {"listing_id": "b", "title": "Desk", "seller_id": "s", "requested_at": now, "expires_at": now, "status": "pending"},
+    ]
+    models = [MyRequestsResponse(**entry) for entry in entries]
+    assert MyRequestsJSONResponse(entries).body == await fastapi_body(MyRequestsResponse, models)
+
+
+def test_raw_bson_documents_encode_like_dicts():
+    docs = [{**doc, "created_at": datetime(2026, 1, 1, 12, 30)} for doc in item_docs()]
+    raw = [RawBSONDocument(bson.encode(doc)) for doc in docs]
+    assert ItemJSONResponse(raw).body == ItemJSONResponse(docs).body
+    assert ItemJSONResponse(raw[0]).body == ItemJSONResponse(docs[0]).body
+
+
+def test_model_projection_reads_only_response_fields():
+    projection = model_projection(ItemResponse)
+    assert "id" not in projection
+    assert {"title", "price", "seller_id", "buyerId"} <= set(projection)
+    assert "tags" not in projection and "reservation_requests" not in projection
+
+
+def test_sparse_fieldset_selects_encoder_and_projection():
+    fields = parse_fields(ItemResponse, "price, title,,price")
+    assert fields == ("id", "title", "price")
+    assert parse_fields(ItemResponse, None) is None
+    with pytest.raises(ValueError):
+        parse_fields(ItemResponse, "title,tags")
+
+    doc = item_docs()[0]
+    assert ItemJSONResponse(doc, encoder=item_encoder.select(fields)).body == (
+        f'{{"id":"{doc["_id"]}","title":"Lämp","price":150.0}}'.encode()
+    )
+    assert item_encoder.select(fields) is item_encoder.select(fields)
+    assert model_projection(ItemResponse, fields) == {"title": 1, "price": 1}
@@ -0,0 +1,14 @@
+from backend import server
+
+
+def test_gunicorn_options_use_marketplace_worker(monkeypatch):
+    monkeypatch.setattr(server, "WEB_CONCURRENCY", 4)
+    options = server.gunicorn_options()
+    assert options["workers"] == 4
+    assert options["worker_class"] == "backend.server.MarketplaceWorker"
+    assert options["max_requests"] == server.MAX_REQUESTS
+    assert server.available_cpus() >= 1
+
+
+def test_rss_mb_reads_current_process():
+    assert server.rss_mb() > 0
@@ -0,0 +1,23 @@
+import os
+
+from backend.scripts.bench_startup import APP_MODULE, import_timings
+
+# Generous default so slow CI machines pass; set lower locally to catch regressions
+STARTUP_IMPORT_BUDGET_MS = float(os.getenv("STARTUP_IMPORT_BUDGET_MS", "3000"))
+
+
+def test_app_import_is_lazy_and_within_budget():
+    timings, out = import_timings(code="\n".join([
+        "import sys",
+        "from backend.db import database",
+        "print('authlib.integrations.starlette_client' in sys.modules)",
+        "print('httpx' in sys.modules)",
+        "print(database._client is None)",
+    ]))
+    oauth_client_loaded, httpx_loaded, no_mongo_client = out.split()
+
+    # OAuth client and Mongo client are built on first use, not at import
+    assert oauth_client_loaded == "False"
+    assert httpx_loaded == "False"
+    assert no_mongo_client == "True"
+    assert timings[APP_MODULE][1] / 1000 < STARTUP_IMPORT_BUDGET_MS
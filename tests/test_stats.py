@@ -0,0 +1,62 @@
+import pytest
+from httpx import AsyncClient
+from motor.motor_asyncio import AsyncIOMotorClient
+import os
+
+from backend.db.stats import MarketplaceStats
+
+MONGO_URI = os.getenv("MONGO_DETAILS")
+TEST_DB_NAME = "nyu_marketplace_test"
+TEST_USER_ID = "6812ab34fc012c5355f44c0e"
+OTHER_USER_ID = "56adfdb34fc012c5355f44c0"
+
+
+def listing(title, category):
+    return {
+        "title": title,
+        "description": "Listing used for the stats test",
+        "price": 20,
+        "condition": "good",
+        "category": category,
+        "tags": ["stats"],
+        "location": "Dorm",
+        "images": ["https://example.com/img1.jpg", "https://example.com/img1.jpg"]
+    }
+
+
+@pytest.mark.asyncio
+async def test_stats_follow_writes_and_match_reconciliation(ac: AsyncClient):
+    ids = []
+    for title, category in (("Lamp", "furniture"), ("Desk", "furniture"), ("Phone", "electronics_gadgets")):
+        resp = await ac.post("/listings/", json=listing(title, category))
+        ids.append(resp.json()["id"])
+
+    await ac.post(f"/listings/{ids[0]}/request/{OTHER_USER_ID}")
+    await ac.post(f"/listings/{ids[1]}/request/{OTHER_USER_ID}")
+    await ac.post(f"/listings/{ids[0]}/confirm", json={"buyer_id": OTHER_USER_ID})
+    await ac.delete(f"/listings/{ids[2]}")
+
+    resp = await ac.get("/home/stats")
+    assert resp.status_code == 200
+    stats = resp.json()
+    assert stats["listings"]["total"] == 2
+    assert stats["listings"]["by_status"]["available"] == 1
+    assert stats["listings"]["by_status"]["reserved"] == 1
+    assert stats["listings"]["by_category"]["furniture"] == 2
+    assert stats["listings"]["by_category"]["electronics_gadgets"] == 0
+    assert stats["active_sellers"] == 1
+    assert stats["reservations"] == {"pending": 1, "confirmed": 1}
+
+    # the incremental counters agree with a full recount
+    client = AsyncIOMotorClient(MONGO_URI)
+    reconciled = await MarketplaceStats(client[TEST_DB_NAME]).reconcile()
+    client.close()
+    assert reconciled["listings"]["by_status"] == {"available": 1, "reserved": 1}
+    assert reconciled["reservations"] == stats["reservations"]
+    assert reconciled["active_sellers"] == 1
+
+    # marking the last available listing sold leaves no active seller
+    await ac.post(f"/listings/{ids[1]}/sold")
+    stats = (await ac.get("/home/stats")).json()
+    assert stats["active_sellers"] == 0
+    assert stats["reservations"]["pending"] == 0
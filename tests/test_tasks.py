@@ -0,0 +1,131 @@
+import os
+import pytest
+from datetime import datetime, timedelta, timezone
+from bson import ObjectId
+from motor.motor_asyncio import AsyncIOMotorClient
+
+from backend.db import tasks
+from backend.db.tasks import LeaderLock, PeriodicTask, sweep_expired_reservations
+
+MONGO_URI = os.getenv("MONGO_DETAILS")
+TEST_DB_NAME = "nyu_marketplace_test"
+
+
+@pytest.mark.asyncio
+async def test_sweeper_removes_only_expired_pending_requests():
+    client = AsyncIOMotorClient(MONGO_URI)
+    db = client[TEST_DB_NAME]
+    now = datetime.now(timezone.utc)
+    listing_id = (await db.Listings.insert_one({"title": "Sweep", "status": "available", "reservation_count": 4})).inserted_id
+
+    def reservation(status, expires_at):
+        return {"listing_id": listing_id, "buyer_id": ObjectId(), "status": status,
+                "requested_at": now - timedelta(days=8), "expires_at": expires_at}
+
+    await db.reservations.insert_many([
+        reservation("pending", now - timedelta(days=1)),
+        reservation("pending", now - timedelta(minutes=1)),
+        reservation("pending", now + timedelta(days=1)),
+        reservation("confirmed", now - timedelta(days=1)),
+    ])
+
+    assert await sweep_expired_reservations(db, batch_size=1) == 2
+    assert await db.reservations.count_documents({"listing_id": listing_id}) == 2
+    assert (await db.Listings.find_one({"_id": listing_id}))["reservation_count"] == 2
+    client.close()
+
+
+@pytest.mark.asyncio
+async def test_sweeper_fixes_counters_across_listings():
+    client = AsyncIOMotorClient(MONGO_URI)
+    db = client[TEST_DB_NAME]
+    now = datetime.now(timezone.utc)
+    listing_ids = (await db.Listings.insert_many([
+        {"title": f"Sweep {i}", "status": "available", "reservation_count": i + 1} for i in range(3)
+    ])).inserted_ids
+    # listing i has i + 1 expired requests
+    await db.reservations.insert_many([
+        {"listing_id": listing_id, "buyer_id": ObjectId(), "status": "pending",
+         "requested_at": now - timedelta(days=8), "expires_at": now - timedelta(hours=1)}
+        for i, listing_id in enumerate(listing_ids) for _ in range(i + 1)
+    ])
+
+    assert await sweep_expired_reservations(db) == 6
+    listings = await db.Listings.find({"_id": {"$in": listing_ids}}).to_list(length=None)
+    assert [listing["reservation_count"] for listing in listings] == [0, 0, 0]
+    assert await db.reservations.count_documents({"listing_id": {"$in": listing_ids}}) == 0
+    client.close()
+
+
+@pytest.mark.asyncio
+async def test_leader_lock_excludes_other_workers(monkeypatch):
+    client = AsyncIOMotorClient(MONGO_URI)
+    db = client[TEST_DB_NAME]
+    await db.locks.delete_many({})
+
+    lock = LeaderLock(db, "test_job", ttl=60)
+    assert await lock.acquire()
+    assert await lock.acquire()  # renewing our own lease
+
+    monkeypatch.setattr(tasks, "WORKER_ID", "another-worker")
+    calls = []
+
+    async def job():
+        calls.append(1)
+        return len(calls)
+
+    task = PeriodicTask("test_job", job, interval=60, lock=LeaderLock(db, "test_job", ttl=60))
+    assert await task.run_once() is None
+    assert task.stats()["skipped"] == 1 and calls == []
+
+    # once the lease has lapsed the other worker takes over
+    await db.locks.update_one({"_id": "test_job"}, {"$set": {"expires_at": datetime.now(timezone.utc)}})
+    assert await task.run_once() == 1
+    assert task.stats()["runs"] == 1
+
+    await db.locks.delete_many({})
+    client.close()
+
+
+class UnreachableLock:
+    """
+    Lease that cannot be taken for the first ``failures`` attempts
+    """
+    def __init__(self, failures):
+        self.failures = failures
+
+    async def acquire(self):
+        if self.failures:
+            self.failures -= 1
+            from pymongo.errors import ServerSelectionTimeoutError
+            raise ServerSelectionTimeoutError("no servers")
+        return True
+
+    async def release(self):
+        pass
+
+
+@pytest.mark.asyncio
+async def test_task_survives_lease_errors():
+    import asyncio
+
+    calls = []
+
+    async def job():
+        calls.append(1)
+        return len(calls)
+
+    task = PeriodicTask("test_job", job, interval=0.01, jitter=0, lock=UnreachableLock(2), initial_delay=0)
+    assert await task.run_once() is None
+    assert (task.stats()["runs"], task.stats()["failures"]) == (0, 1)
+
+    # The loop keeps going past the second error and runs once Mongo answers
+    task.start()
+    for _ in range(100):
+        if calls:
+            break
+        await asyncio.sleep(0.01)
+    assert calls and not task._task.done()
+    await task.stop()
+    assert task.stats()["failures"] == 2
+    assert task.stats()["runs"] >= 1
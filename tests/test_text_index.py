@@ -0,0 +1,102 @@
+import pytest
+
+from backend.utilities.text_index import TextIndex, tokenize
+
+
+def make_index():
+    index = TextIndex({"title": 3.0, "description": 1.0})
+    index.add("desk", {"title": "Standing desk", "description": "Adjustable height desk with drawers"})
+    index.add("lamp", {"title": "Desk lamp", "description": "Warm light, great for a study desk"})
+    index.add("chair", {"title": "Office chair", "description": "Ergonomic chair"})
+    return index
+
+
+def test_tokenize_normalizes_text():
+    assert tokenize("The Café's BIKES, (used)!") == ["cafe", "bike", "used"]
+    assert tokenize(".*[regex") == ["regex"]
+    assert tokenize(None) == []
+    # Only accents are stripped, other scripts are kept
+    assert tokenize("كتاب جديد") == ["كتاب", "جديد"]
+    assert tokenize("二手 自行车") == ["二手", "自行车"]
+    assert tokenize("the and of") == []
+
+
+def test_search_matches_non_latin_terms_and_prefixes():
+    index = make_index()
+    index.add("book", {"title": "كتاب جديد", "description": "رواية"})
+    assert [doc_id for doc_id, _ in index.search("كتاب")] == ["book"]
+    assert [doc_id for doc_id, _ in index.search("كت")] == ["book"]
+
+
+def test_search_ranks_title_matches_first_and_requires_all_terms():
+    index = make_index()
+
+    assert [doc_id for doc_id, _ in index.search("desk")] == ["desk", "lamp"]
+    assert [doc_id for doc_id, _ in index.search("desk lamp")] == ["lamp"]
+    assert index.search("desk sofa") == []
+
+
+def test_search_matches_last_term_as_prefix():
+    index = make_index()
+    assert [doc_id for doc_id, _ in index.search("ergo")] == ["chair"]
+    assert [doc_id for doc_id, _ in index.search("offi chair")] == []
+
+
+def test_update_and_remove_are_incremental():
+    index = make_index()
+    index.add("chair", {"title": "Desk chair", "description": "Ergonomic chair"})
+    assert "chair" in {doc_id for doc_id, _ in index.search("desk")}
+    assert index.search("office") == []
+
+    index.remove("desk")
+    assert len(index) == 2
+    assert "desk" not in {doc_id for doc_id, _ in index.search("desk")}
+
+
+def test_snapshot_round_trip(tmp_path):
+    index = make_index()
+    index.add("chair", {"title": "Office chair"}, version="v2")
+    path = str(tmp_path / "index.json.gz")
+    index.save(path)
+
+    restored = TextIndex({"title": 3.0, "description": 1.0})
+    assert restored.load(path)
+    assert restored.search("desk") == index.search("desk")
+    assert restored.version("chair") == "v2"
+    assert not restored.load(str(tmp_path / "missing.json.gz"))
+
+
+def test_concurrent_saves_do_not_clobber_each_other(tmp_path):
+    import threading
+
+    index = make_index()
+    path = str(tmp_path / "index.json.gz")
+    threads = [threading.Thread(target=index.save, args=(path,)) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    restored = TextIndex({"title": 3.0, "description": 1.0})
+    assert restored.load(path)
+    assert len(restored) == 3
+    # No temporary files left behind
+    assert [p.name for p in tmp_path.iterdir()] == ["index.json.gz"]
+
+
+@pytest.mark.asyncio
+async def test_snapshot_written_only_by_the_lock_holder(tmp_path):
+    from backend.db.text_search import save_snapshot
+
+    class Lock:
+        def __init__(self, held):
+            self.held = held
+
+        async def acquire(self):
+            return self.held
+
+    path = str(tmp_path / "index.json.gz")
+    assert not await save_snapshot(Lock(False), path)
+    assert not (tmp_path / "index.json.gz").exists()
+    assert await save_snapshot(Lock(True), path)
+    assert (tmp_path / "index.json.gz").exists()